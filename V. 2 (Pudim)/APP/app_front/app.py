@@ -30,6 +30,7 @@ from views import home as view_home  # noqa: E402
 from views import processo as view_processo  # noqa: E402
 from app_front.views import cadastros  # noqa: E402
 from app_front.views import estoque  # noqa: E402
+from services.aquecimento import iniciar_aquecimento  # noqa: E402
 
 
 def _load_css() -> None:
@@ -38,6 +39,9 @@ def _load_css() -> None:
         st.markdown(f"<style>{css_path.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
 
 
+# Motor, autotestes, tiktoken e Chromium aquecem em segundo plano, uma vez por
+# processo: a primeira pontuação e a primeira exportação não esperam.
+iniciar_aquecimento()
 _load_css()
 inject_global_css()
 ensure_defaults()
@@ -48,6 +52,8 @@ if pending_target:
     nav.force(pending_target)
 
 _nav_warning = st.session_state.pop("_nav_block_message", None)
+# Pontuação em segundo plano iniciada antes de uma recarga da página.
+view_lancamentos.retomar_tarefa_da_url()
 
 
 def _enforce_flow() -> None:
@@ -1,14 +1,61 @@
 """API reutilizável do motor FinScore Pudim."""
 
+from .cenarios import (
+    BaseCenarios,
+    avaliar_cenarios,
+    grade_padrao,
+    pivotar_grade,
+    preparar_base_cenarios,
+    resolver_estresse_reverso,
+    simular_what_if,
+    varrer_grade_cenarios,
+)
 from .contracts import CONTRACT_VERSION, ContractError, FinScoreOutput, validar_contrato
-from .engine import executar_finscore, executar_autotestes, preparar_dados_contabeis
+from .engine import (
+    BLOCO_SIMULACOES,
+    ExecucaoCancelada,
+    aquecer,
+    executar_autotestes,
+    executar_finscore,
+    executar_finscore_incremental,
+    executar_finscore_lote,
+    preparar_dados_contabeis,
+)
+from .hashing import dataframe_sha256, limpar_cache_hashes
+from .serializacao import (
+    FORMATO_VERSAO,
+    carregar_saida,
+    desserializar_saida,
+    gravar_saida,
+    serializar_saida,
+)
 
 __all__ = [
+    "BLOCO_SIMULACOES",
+    "BaseCenarios",
     "CONTRACT_VERSION",
     "ContractError",
+    "ExecucaoCancelada",
+    "FORMATO_VERSAO",
     "FinScoreOutput",
+    "aquecer",
+    "avaliar_cenarios",
+    "carregar_saida",
+    "dataframe_sha256",
+    "desserializar_saida",
     "executar_finscore",
+    "executar_finscore_incremental",
+    "executar_finscore_lote",
     "executar_autotestes",
+    "grade_padrao",
+    "gravar_saida",
+    "limpar_cache_hashes",
+    "pivotar_grade",
+    "preparar_base_cenarios",
     "preparar_dados_contabeis",
+    "resolver_estresse_reverso",
+    "serializar_saida",
+    "simular_what_if",
     "validar_contrato",
+    "varrer_grade_cenarios",
 ]
@@ -0,0 +1,804 @@
+"""Avaliação vetorizada de cenários determinísticos com perfis PCA fixos.
+
+Reproduz ``core.apply_deterministic_scenario`` seguido de
+``core.score_prepared_base(..., profiles_override=...)`` sobre lotes de choques,
+com arrays NumPy de forma ``(cenários, exercícios)``. O que depende apenas da
+base (taxa de juros efetiva, margem EBIT, alíquota observada, pesos dos
+núcleos) é calculado uma única vez em ``preparar_base_cenarios``; cada
+avaliação executa somente aritmética vetorizada e não gera diagnósticos
+(contribuições, motivos de NaN, PCA). Um cenário isolado leva poucos
+milissegundos, o que permite recalcular o score a cada movimento de um
+controle na interface, e ``resolver_estresse_reverso`` busca por bisseção
+vetorizada o menor choque que rompe limiares de score ou aciona caps.
+
+Os choques seguem ``core.SCENARIO_DEFINITIONS``: variações relativas aplicadas
+com intensidade crescente de 50% a 100% ao longo dos exercícios. Só a regra de
+excesso de fontes ``ATIVO_RESIDUAL_NAO_LIQUIDO`` aplica os choques em lote;
+com outra ``core.EXCESS_SOURCE_RULE`` eles passam pelo core cenário a cenário.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import numpy as np
+import pandas as pd
+
+from . import core
+
+
+CHOQUES = tuple(key for key in core.SCENARIO_DEFINITIONS["BASE"] if key != "descricao")
+METODOS = ("estrutural", "adaptativo")
+
+LIMIARES_ESTRESSE_PADRAO = (250.0, 500.0)
+# Maior choque relativo testado por direção adversa (sinal do cenário SEVERO).
+# Receita, margem e caixa param em -100%; as demais contas podem triplicar,
+# os juros sextuplicar e o PL inverter de sinal.
+INTENSIDADE_MAXIMA_ESTRESSE = {
+    "receita": 1.0,
+    "margem_ebit": 1.0,
+    "contas_receber": 3.0,
+    "estoques": 3.0,
+    "caixa": 1.0,
+    "juros": 5.0,
+    "divida": 3.0,
+    "pl": 2.0,
+    "pc_total": 3.0,
+    "pnc_total": 3.0,
+}
+
+_ATIVO_CIRCULANTE = ["p_Caixa_Equivalentes", "p_Contas_Receber_Clientes", "p_Estoques"]
+_PASSIVO_CIRCULANTE = [
+    "p_Fornecedores",
+    "p_Obrigacoes_Tributarias_CP",
+    "p_Obrigacoes_Trabalhistas_CP",
+    "p_Emprestimos_Financiamentos_CP",
+]
+_FLAGS = (
+    "conta_nao_negativa_negativa",
+    "ativo_total_nao_positivo",
+    "AC_menor_componentes",
+    "AT_menor_AC_Imobilizado",
+    "PC_menor_componentes",
+    "PNC_menor_emprestimos_LP",
+    "balanco_nao_fecha",
+    "lucro_liquido_nao_reconciliado",
+)
+_CAPS = (
+    ("CAP-PL-NEG", core.PRUDENTIAL_CAPS["pl_negativo"]),
+    ("CAP-PL-2", core.PRUDENTIAL_CAPS["pl_ativo_abaixo_2pct"]),
+    ("CAP-PL-5", core.PRUDENTIAL_CAPS["pl_ativo_abaixo_5pct"]),
+    ("CAP-END-100", core.PRUDENTIAL_CAPS["endividamento_maior_igual_100pct"]),
+    ("CAP-END-95", core.PRUDENTIAL_CAPS["endividamento_maior_igual_95pct"]),
+    ("CAP-JUROS-1", core.PRUDENTIAL_CAPS["cobertura_juros_abaixo_1x"]),
+)
+
+
+@dataclass(frozen=True)
+class BaseCenarios:
+    """Estado pré-calculado de uma base analítica e seus perfis PCA."""
+
+    anos: tuple[int, ...]
+    contas: dict[str, np.ndarray]
+    intensidade: np.ndarray
+    taxa_juros_base: np.ndarray
+    divida_media_base: np.ndarray
+    margem_ebit_base: np.ndarray
+    aliquota_observada: np.ndarray
+    receita_denominador: np.ndarray
+    outros_efeitos: np.ndarray
+    pesos: dict[tuple[str, str], np.ndarray]
+    pesos_fixos: dict[str, np.ndarray]
+    analise: pd.DataFrame
+
+
+def preparar_base_cenarios(
+    contas: pd.DataFrame,
+    perfis: Mapping[str, core.PCAProfile],
+) -> BaseCenarios:
+    """Pré-calcula o estado usado por ``avaliar_cenarios``.
+
+    ``contas`` é a base analítica (``df_contas_analise``) e ``perfis`` os
+    perfis PCA observados (``pca_observado``), mantidos fixos nos cenários.
+    """
+    missing = [nucleus for nucleus in core.NUCLEI if nucleus not in perfis]
+    if missing:
+        raise ValueError(
+            f"Perfis PCA ausentes para {missing}; a base precisa estar apta ao cálculo."
+        )
+    base = contas.reset_index(drop=True)
+    base_derived = core.derive(base)
+    pretax = base["r_Resultado_Antes_IR_CSLL"]
+    revenue = base["r_Receita_Liquida"].astype(float)
+    scale = max(float(revenue.abs().median(skipna=True) or 0.0), 1.0)
+    weights: dict[tuple[str, str], np.ndarray] = {}
+    fixed_weights: dict[str, np.ndarray] = {}
+    for nucleus, columns in core.NUCLEI.items():
+        fixed = core._normalized_fixed_weights(columns)
+        fixed_weights[nucleus] = fixed.to_numpy(float)
+        weights[("estrutural", nucleus)] = fixed.to_numpy(float)
+        weights[("adaptativo", nucleus)] = perfis[nucleus].weights.loc[columns].to_numpy(float)
+    return BaseCenarios(
+        anos=tuple(int(year) for year in base["ano"]),
+        contas={account: base[account].to_numpy(float) for account in core.PRIMARY},
+        intensidade=np.linspace(0.5, 1.0, len(base)),
+        taxa_juros_base=core._base_effective_interest_rate(base).to_numpy(float),
+        divida_media_base=core._average_gross_debt(base).to_numpy(float),
+        margem_ebit_base=core.safe_div(base_derived["d_EBIT"], revenue).to_numpy(float),
+        aliquota_observada=core.safe_div(
+            base["r_Despesa_IR_CSLL"], pretax.where(pretax > 1e-09)
+        ).clip(lower=0.0, upper=0.5).to_numpy(float),
+        receita_denominador=revenue.where(revenue.abs() > 1e-09 * scale).to_numpy(float),
+        outros_efeitos=base_derived["d_Outros_Efeitos_Pos_Tributacao"].to_numpy(float),
+        pesos=weights,
+        pesos_fixos=fixed_weights,
+        analise=base,
+    )
+
+
+def _normalizar_choques(
+    choques: pd.DataFrame | Mapping[str, Any],
+) -> dict[str, np.ndarray]:
+    source = choques.to_dict(orient="list") if isinstance(choques, pd.DataFrame) else dict(choques)
+    unknown = sorted(set(source) - set(CHOQUES))
+    if unknown:
+        raise ValueError(f"Choques desconhecidos: {unknown}. Use {list(CHOQUES)}.")
+    arrays = [np.atleast_1d(np.asarray(value, dtype=float)) for value in source.values()]
+    size = np.broadcast_shapes(*(array.shape for array in arrays)) if arrays else (1,)
+    if len(size) != 1:
+        raise ValueError("Cada choque deve ser um número ou uma sequência 1-D.")
+    # Choque ausente (chave omitida ou célula vazia) equivale a zero.
+    return {
+        key: np.nan_to_num(
+            np.broadcast_to(np.asarray(source.get(key, 0.0), dtype=float), size), nan=0.0
+        )
+        for key in CHOQUES
+    }
+
+
+def _nansoma(*values: np.ndarray) -> np.ndarray:
+    total = np.where(np.isnan(values[0]), 0.0, values[0])
+    for value in values[1:]:
+        total = total + np.where(np.isnan(value), 0.0, value)
+    return total
+
+
+def _reconstruir_total(
+    contas: dict[str, np.ndarray],
+    base: BaseCenarios,
+    total: str,
+    partes: list[str],
+    choque_fallback: np.ndarray,
+) -> None:
+    known = [~np.isnan(base.contas[part]) for part in partes]
+    base_total = base.contas[total]
+    rebuild = np.logical_or.reduce(known) & ~np.isnan(base_total)
+    residual = np.clip(
+        base_total - _nansoma(*(base.contas[part] for part in partes)), 0.0, None
+    )
+    known_sum = _nansoma(
+        *(np.where(mask, contas[part], np.nan) for part, mask in zip(partes, known))
+    )
+    fallback = ~np.isnan(base_total) & ~rebuild
+    contas[total] = np.where(
+        rebuild,
+        known_sum + residual,
+        np.where(fallback, base_total * (1.0 + choque_fallback * base.intensidade), contas[total]),
+    )
+
+
+def _aplicar_choques_core(base: BaseCenarios, choques: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Choques aplicados cenário a cenário por ``core.apply_deterministic_scenario``."""
+    size = len(choques[CHOQUES[0]])
+    frames = [
+        core.apply_deterministic_scenario(
+            base.analise, {key: float(values[position]) for key, values in choques.items()}
+        )
+        for position in range(size)
+    ]
+    return {
+        account: np.vstack([frame[account].to_numpy(float) for frame in frames])
+        for account in core.PRIMARY
+    }
+
+
+def _aplicar_choques(base: BaseCenarios, choques: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Versão em lote de ``core.apply_deterministic_scenario``."""
+    if core.EXCESS_SOURCE_RULE != "ATIVO_RESIDUAL_NAO_LIQUIDO":
+        # Só a regra padrão de excesso de fontes tem versão em lote; as demais
+        # usam o caminho do core, mais lento, e a pontuação segue vetorizada.
+        return _aplicar_choques_core(base, choques)
+    size = len(choques[CHOQUES[0]])
+    shock = {key: value[:, None] for key, value in choques.items()}
+    intensity = base.intensidade
+    contas = {
+        account: np.broadcast_to(values, (size, len(values))).copy()
+        for account, values in base.contas.items()
+    }
+    for account, key in (
+        ("p_Caixa_Equivalentes", "caixa"),
+        ("p_Contas_Receber_Clientes", "contas_receber"),
+        ("p_Estoques", "estoques"),
+        ("p_Emprestimos_Financiamentos_CP", "divida"),
+        ("p_Emprestimos_Financiamentos_LP", "divida"),
+    ):
+        contas[account] = base.contas[account] * (1.0 + shock[key] * intensity)
+    _reconstruir_total(contas, base, "p_Ativo_Circulante", _ATIVO_CIRCULANTE, np.zeros((1, 1)))
+    _reconstruir_total(contas, base, "p_Passivo_Circulante", _PASSIVO_CIRCULANTE, shock["pc_total"])
+    _reconstruir_total(
+        contas, base, "p_Passivo_Nao_Circulante", ["p_Emprestimos_Financiamentos_LP"], shock["pnc_total"]
+    )
+    contas["p_Patrimonio_Liquido"] = base.contas["p_Patrimonio_Liquido"] * (1.0 + shock["pl"] * intensity)
+
+    # ``core.reconcile_funding_balance`` com a regra ATIVO_RESIDUAL_NAO_LIQUIDO:
+    # o déficit vira dívida nova (70% CP) e o excesso de fontes fica como ativo
+    # residual, sem alterar caixa.
+    complete = np.logical_and.reduce(
+        [
+            ~np.isnan(contas[account])
+            for account in (
+                "p_Ativo_Circulante",
+                "p_Imobilizado_Liquido",
+                "p_Passivo_Circulante",
+                "p_Passivo_Nao_Circulante",
+                "p_Patrimonio_Liquido",
+            )
+        ]
+    )
+    other_assets = np.clip(
+        base.contas["p_Ativo_Total"] - base.contas["p_Ativo_Circulante"] - base.contas["p_Imobilizado_Liquido"],
+        0.0,
+        None,
+    )
+    required = contas["p_Ativo_Circulante"] + contas["p_Imobilizado_Liquido"] + other_assets
+    sources = contas["p_Passivo_Circulante"] + contas["p_Passivo_Nao_Circulante"] + contas["p_Patrimonio_Liquido"]
+    balance = np.where(complete, required - sources, np.nan)
+    gap = np.nan_to_num(np.clip(balance, 0.0, None), nan=0.0)
+    cp_add = core.FUNDING_CP_SHARE * gap
+    lp_add = (1.0 - core.FUNDING_CP_SHARE) * gap
+    for account, addition in (
+        ("p_Emprestimos_Financiamentos_CP", cp_add),
+        ("p_Emprestimos_Financiamentos_LP", lp_add),
+    ):
+        observed = contas[account]
+        contas[account] = np.where(
+            ~np.isnan(observed) | (addition > 0.0),
+            np.where(np.isnan(observed), 0.0, observed) + addition,
+            np.nan,
+        )
+    contas["p_Passivo_Circulante"] = contas["p_Passivo_Circulante"] + cp_add
+    contas["p_Passivo_Nao_Circulante"] = contas["p_Passivo_Nao_Circulante"] + lp_add
+    contas["p_Ativo_Total"] = np.where(
+        complete,
+        contas["p_Passivo_Circulante"] + contas["p_Passivo_Nao_Circulante"] + contas["p_Patrimonio_Liquido"],
+        np.nan,
+    )
+
+    contas["r_Receita_Liquida"] = base.contas["r_Receita_Liquida"] * (1.0 + shock["receita"] * intensity)
+    multiplier = np.clip(1.0 + shock["juros"] * intensity, 0.0, None)
+    rate = np.clip(base.taxa_juros_base * multiplier, 0.0, core.MAX_EFFECTIVE_INTEREST_RATE)
+    debt = contas["p_Emprestimos_Financiamentos_CP"], contas["p_Emprestimos_Financiamentos_LP"]
+    gross_debt = np.where(np.isnan(debt[0]) & np.isnan(debt[1]), np.nan, _nansoma(*debt))
+    average_debt = gross_debt.copy()
+    average_debt[:, 1:] = (gross_debt[:, 1:] + gross_debt[:, :-1]) / 2.0
+    can_link = (
+        ~np.isnan(base.divida_media_base)
+        & (base.divida_media_base > 1e-12)
+        & ~np.isnan(average_debt)
+    )
+    contas["r_Despesas_Financeiras"] = np.where(
+        can_link,
+        np.clip(average_debt * rate, 0.0, None),
+        np.clip(base.contas["r_Despesas_Financeiras"] * multiplier, 0.0, None),
+    )
+    ebit = (
+        contas["r_Receita_Liquida"]
+        * base.margem_ebit_base
+        * (1.0 + shock["margem_ebit"] * intensity)
+    )
+    contas["r_Resultado_Antes_IR_CSLL"] = (
+        ebit - contas["r_Despesas_Financeiras"] + contas["r_Receitas_Financeiras"]
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        revenue_factor = contas["r_Receita_Liquida"] / base.receita_denominador
+    revenue_factor = np.where(np.isfinite(revenue_factor), revenue_factor, 1.0)
+    contas["r_Despesa_IR_CSLL"] = np.where(
+        ~np.isnan(base.aliquota_observada),
+        np.clip(contas["r_Resultado_Antes_IR_CSLL"], 0.0, None) * base.aliquota_observada,
+        np.clip(base.contas["r_Despesa_IR_CSLL"], 0.0, None) * revenue_factor,
+    )
+    contas["r_Lucro_Liquido"] = (
+        contas["r_Resultado_Antes_IR_CSLL"] - contas["r_Despesa_IR_CSLL"] + base.outros_efeitos
+    )
+
+    # Choques todos nulos reproduzem a base observada sem reconstrução.
+    neutral = np.logical_and.reduce([np.abs(value) <= 1e-15 for value in choques.values()])
+    if neutral.any():
+        for account, values in contas.items():
+            values[neutral] = base.contas[account]
+    return contas
+
+
+def _mediana_linhas(values: np.ndarray) -> np.ndarray:
+    """Mediana por linha ignorando NaN, sem o caminho lento de ``np.nanmedian``."""
+    ordered = np.sort(values, axis=1)  # NaN vai para o fim de cada linha.
+    count = np.sum(~np.isnan(values), axis=1)
+    rows = np.arange(len(values))
+    lower = ordered[rows, np.clip((count - 1) // 2, 0, None)]
+    upper = ordered[rows, np.clip(count // 2, 0, values.shape[1] - 1)]
+    return np.where(count > 0, (lower + upper) / 2.0, np.nan)[:, None]
+
+
+def _divisao_segura(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """``core.safe_div`` por linha: a escala é a mediana de ``|b|`` no cenário."""
+    median = _mediana_linhas(np.abs(b))
+    scale = np.where(median == 0.0, 1.0, np.maximum(median, 1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = np.where(np.abs(b) > 1e-09 * scale, b, np.nan)
+        result = a / denominator
+    return np.where(np.isinf(result), np.nan, result)
+
+
+def _media_movel(values: np.ndarray) -> np.ndarray:
+    average = np.full_like(values, np.nan)
+    average[:, 1:] = (values[:, 1:] + values[:, :-1]) / 2
+    return average
+
+
+def _indices(contas: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Versão em lote de ``core.indices(core.derive(...))``."""
+    x = contas
+    sd = _divisao_segura
+    liabilities = x["p_Passivo_Circulante"] + x["p_Passivo_Nao_Circulante"]
+    gross_debt = x["p_Emprestimos_Financiamentos_CP"] + x["p_Emprestimos_Financiamentos_LP"]
+    ebit = x["r_Resultado_Antes_IR_CSLL"] + x["r_Despesas_Financeiras"] - x["r_Receitas_Financeiras"]
+    revenue = x["r_Receita_Liquida"]
+    cogs = x["r_CMV_CPV_CSV"]
+    total_assets = x["p_Ativo_Total"]
+    out: dict[str, np.ndarray] = {}
+    growth = np.full_like(revenue, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth[:, 1:] = revenue[:, 1:] / revenue[:, :-1] - 1
+    out["crescimento_receita"] = growth
+    out["margem_bruta"] = sd(revenue - cogs, revenue)
+    out["margem_ebit"] = sd(ebit, revenue)
+    out["margem_liquida"] = sd(x["r_Lucro_Liquido"], revenue)
+    out["giro_ativo"] = sd(revenue, _media_movel(total_assets))
+    receivable_days = 365.0 * sd(_media_movel(x["p_Contas_Receber_Clientes"]), revenue)
+    inventory_days = 365.0 * sd(_media_movel(x["p_Estoques"]), cogs)
+    payable_days = 365.0 * sd(_media_movel(x["p_Fornecedores"]), cogs)
+    out["ciclo_conversao_caixa"] = receivable_days + inventory_days - payable_days
+    out["capitalizacao"] = sd(x["p_Patrimonio_Liquido"], total_assets)
+    out["endividamento_exigivel"] = sd(liabilities, total_assets)
+    out["liquidez_corrente"] = sd(x["p_Ativo_Circulante"], x["p_Passivo_Circulante"])
+    out["liquidez_seca"] = sd(x["p_Ativo_Circulante"] - x["p_Estoques"], x["p_Passivo_Circulante"])
+    out["ccl_ativo"] = sd(x["p_Ativo_Circulante"] - x["p_Passivo_Circulante"], total_assets)
+    out["ncg_operacional_ativo"] = sd(
+        x["p_Contas_Receber_Clientes"] + x["p_Estoques"] - x["p_Fornecedores"], total_assets
+    )
+    out["divida_liquida_ativo"] = sd(gross_debt - x["p_Caixa_Equivalentes"], total_assets)
+    out["composicao_endividamento"] = sd(x["p_Passivo_Circulante"], liabilities)
+    if core.USAR_DESPESAS_FINANCEIRAS_COMO_PROXY_JUROS:
+        coverage = sd(ebit, x["r_Despesas_Financeiras"])
+        zero_interest = x["r_Despesas_Financeiras"] == 0
+        coverage = np.where(zero_interest & (ebit > 0), core.COBERTURA_JUROS_TETO_ECONOMICO, coverage)
+        coverage = np.where(zero_interest & (ebit < 0), core.ANCHORS["cobertura_juros"][0][0], coverage)
+        out["cobertura_juros"] = coverage
+    else:
+        out["cobertura_juros"] = np.full_like(revenue, np.nan)
+    return out
+
+
+def _nota_temporal(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Versão em lote de ``core.temporal_indicator_table`` para um indicador."""
+    level = scores[:, -1]
+    level_normalized = np.clip(100.0 * level / core.CURVE_MAX_SCORE, 0.0, 100.0)
+    valid = ~np.isnan(scores)
+    has_history = ~np.isnan(level) & (valid.sum(axis=1) >= 2)
+    first = scores[np.arange(len(scores)), np.argmax(valid, axis=1)]
+    change = 100.0 * (level - first) / core.CURVE_MAX_SCORE
+    worst = np.min(np.where(valid, scores, np.inf), axis=1)
+    dynamics = np.where(has_history, np.clip(level_normalized + 0.5 * change, 0.0, 100.0), np.nan)
+    resilience = np.where(has_history, np.clip(100.0 * worst / core.CURVE_MAX_SCORE, 0.0, 100.0), np.nan)
+    weights = core.TEMPORAL_COMPONENT_WEIGHTS
+    total = np.zeros(len(scores))
+    coverage = np.zeros(len(scores))
+    for name, value in (
+        ("nivel_atual", level_normalized),
+        ("dinamica_temporal", dynamics),
+        ("resiliencia", resilience),
+    ):
+        finite = np.isfinite(value)
+        total = total + np.where(finite, weights[name] * value, 0.0)
+        coverage = coverage + np.where(finite, weights[name], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        temporal = np.where(coverage > 0, total / coverage, np.nan)
+    return temporal, coverage
+
+
+def _pontuar(
+    base: BaseCenarios,
+    contas: dict[str, np.ndarray],
+) -> dict[str, np.ndarray]:
+    """Versão em lote de ``core.score_prepared_base`` com perfis fixos."""
+    indicators = _indices(contas)
+    temporal: dict[str, np.ndarray] = {}
+    coverage: dict[str, np.ndarray] = {}
+    for column, points in core.ANCHORS.items():
+        if column not in core.FIXED_WEIGHTS:
+            continue
+        xp, fp = zip(*points)
+        values = indicators[column]
+        notes = np.interp(values.ravel(), xp, fp, left=fp[0], right=fp[-1]).reshape(values.shape)
+        notes[np.isnan(values)] = np.nan
+        temporal[column], coverage[column] = _nota_temporal(notes)
+
+    margins = indicators["margem_liquida"]
+    losses = np.sum(margins < 0, axis=1)
+    loss_multiplier = np.where(
+        losses >= 3,
+        core.RECURRING_LOSS_MULTIPLIERS[3],
+        np.where(losses >= 2, core.RECURRING_LOSS_MULTIPLIERS[2], 1.0),
+    )
+    result: dict[str, np.ndarray] = {
+        "exercicios_prejuizo_liquido": losses,
+        "multiplicador_prejuizo_recorrente": loss_multiplier,
+    }
+    for method in METODOS:
+        nucleus_values = {}
+        for nucleus, columns in core.NUCLEI.items():
+            scores = np.column_stack([temporal[column] for column in columns])
+            covered = np.column_stack([coverage[column] for column in columns])
+            nucleus_coverage = covered @ base.pesos_fixos[nucleus]
+            valid = ~np.isnan(scores)
+            weights = np.where(valid, base.pesos[(method, nucleus)], 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                weights = weights / weights.sum(axis=1, keepdims=True)
+            raw = np.sum(np.where(valid, scores, 0.0) * weights, axis=1)
+            usable = valid.any(axis=1) & (nucleus_coverage >= core.MIN_NUCLEUS_COVERAGE)
+            multiplier = loss_multiplier if nucleus == "EO" else np.ones(len(raw))
+            raw = np.where(usable, raw, np.nan)
+            result[f"cobertura_{nucleus}_{method}"] = nucleus_coverage
+            result[f"nucleo_{nucleus}_{method}_antes_prejuizo"] = 10 * raw
+            result[f"multiplicador_{nucleus}_{method}"] = np.where(usable, multiplier, np.nan)
+            nucleus_values[nucleus] = raw * multiplier
+            result[f"nucleo_{nucleus}_{method}"] = 10 * nucleus_values[nucleus]
+        eo = 10 * nucleus_values["EO"]
+        fp = 10 * nucleus_values["FP"]
+        both = np.isfinite(eo) & np.isfinite(fp)
+        with np.errstate(invalid="ignore"):
+            geometric = np.where(
+                (eo <= 0) | (fp <= 0),
+                0.0,
+                1000
+                * (eo / 1000) ** core.NUCLEUS_WEIGHTS["EO"]
+                * (fp / 1000) ** core.NUCLEUS_WEIGHTS["FP"],
+            )
+        bottleneck = np.minimum(eo, fp)
+        result[f"finscore_{method}"] = np.where(both, geometric, np.nan)
+        result[f"gargalo_{method}"] = np.where(both, bottleneck, np.nan)
+        result[f"finscore_{method}_pos_gargalo"] = np.where(
+            both,
+            (1 - core.BOTTLENECK_SHARE) * geometric + core.BOTTLENECK_SHARE * bottleneck,
+            np.nan,
+        )
+    pre_cap = np.minimum(
+        result["finscore_estrutural_pos_gargalo"], result["finscore_adaptativo_pos_gargalo"]
+    )
+    result["finscore_prudencial_pre_cap"] = pre_cap
+    result["divergencia_modelos"] = np.abs(
+        result["finscore_estrutural"] - result["finscore_adaptativo"]
+    )
+
+    equity = contas["p_Patrimonio_Liquido"][:, -1]
+    capitalization = indicators["capitalizacao"][:, -1]
+    leverage = indicators["endividamento_exigivel"][:, -1]
+    interest_coverage = indicators["cobertura_juros"][:, -1]
+    triggered = {
+        "CAP-PL-NEG": equity < 0,
+        "CAP-PL-2": (capitalization >= 0) & (capitalization < 0.02),
+        "CAP-PL-5": (capitalization >= 0.02) & (capitalization < 0.05),
+        "CAP-END-100": leverage >= 1.0,
+        "CAP-END-95": (leverage >= 0.95) & (leverage < 1.0),
+        "CAP-JUROS-1": interest_coverage < 1.0,
+    }
+    cap = np.full(len(pre_cap), 1000.0)
+    for rule, value in _CAPS:
+        cap = np.where(triggered[rule], np.minimum(cap, value), cap)
+    result["cap_prudencial_aplicavel"] = cap
+    result["finscore_prudencial"] = np.where(np.isfinite(pre_cap), np.minimum(pre_cap, cap), np.nan)
+    result["caps_acionados"] = _juntar_rotulos(triggered, len(cap))
+    result["flags"] = _juntar_rotulos(_flags_contabeis(contas, base), len(cap))
+    result["margem_liquida_ultimo_ano"] = margins[:, -1]
+    return result
+
+
+def _flags_contabeis(
+    contas: dict[str, np.ndarray],
+    base: BaseCenarios,
+) -> dict[str, np.ndarray]:
+    """Versão em lote de ``core.accounting_flags`` para cenários determinísticos."""
+    x = contas
+    tolerance = core.BALANCE_TOLERANCE * np.clip(np.abs(x["p_Ativo_Total"]), 1.0, None)
+    tests = {
+        "conta_nao_negativa_negativa": np.logical_or.reduce(
+            [x[account] < 0 for account in sorted(core.NONNEGATIVE)]
+        ),
+        "ativo_total_nao_positivo": x["p_Ativo_Total"] <= 0,
+        "AC_menor_componentes": x["p_Ativo_Circulante"] + tolerance
+        < _nansoma(*(x[account] for account in _ATIVO_CIRCULANTE)),
+        "AT_menor_AC_Imobilizado": x["p_Ativo_Total"] + tolerance
+        < x["p_Ativo_Circulante"] + x["p_Imobilizado_Liquido"],
+        "PC_menor_componentes": x["p_Passivo_Circulante"] + tolerance
+        < _nansoma(*(x[account] for account in _PASSIVO_CIRCULANTE)),
+        "PNC_menor_emprestimos_LP": x["p_Passivo_Nao_Circulante"] + tolerance
+        < x["p_Emprestimos_Financiamentos_LP"],
+        "balanco_nao_fecha": np.abs(
+            x["p_Ativo_Total"]
+            - x["p_Passivo_Circulante"]
+            - x["p_Passivo_Nao_Circulante"]
+            - x["p_Patrimonio_Liquido"]
+        )
+        > tolerance,
+        "lucro_liquido_nao_reconciliado": np.abs(
+            x["r_Lucro_Liquido"]
+            - (x["r_Resultado_Antes_IR_CSLL"] - x["r_Despesa_IR_CSLL"] + base.outros_efeitos)
+        )
+        > 1e-08 * np.clip(np.abs(x["r_Lucro_Liquido"]), 1.0, None),
+    }
+    return {name: tests[name].any(axis=1) for name in _FLAGS}
+
+
+def _juntar_rotulos(masks: Mapping[str, np.ndarray], size: int) -> np.ndarray:
+    labels = np.full(size, "", dtype=object)
+    for name, mask in masks.items():
+        labels = np.where(mask, np.where(labels == "", name, labels + "; " + name), labels)
+    return labels
+
+
+def avaliar_cenarios(
+    base: BaseCenarios,
+    choques: pd.DataFrame | Mapping[str, Any],
+) -> pd.DataFrame:
+    """Avalia um lote de cenários e devolve uma linha por cenário.
+
+    ``choques`` mapeia cada chave de ``CHOQUES`` para um número ou uma
+    sequência (chaves ausentes e valores vazios valem zero). O resultado traz os choques, os
+    scores e núcleos de ``core.calculate_scores``, o cap aplicável com as
+    regras acionadas e as flags contábeis; cenários com flags recebem
+    ``status='INVALIDO_CONTABILMENTE'`` e mantêm os scores apenas como
+    referência.
+    """
+    return pd.DataFrame(_avaliar(base, _normalizar_choques(choques)))
+
+
+def _avaliar(base: BaseCenarios, shocks: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    scores = _pontuar(base, _aplicar_choques(base, shocks))
+    status = np.where(scores["flags"] == "", "VALIDO", "INVALIDO_CONTABILMENTE")
+    return {**shocks, "status": status, **scores}
+
+
+def simular_what_if(base: BaseCenarios, **choques: float) -> dict[str, Any]:
+    """Avalia um único cenário; atalho de ``avaliar_cenarios`` para a interface."""
+    shocks = {key: np.array([float(value)]) for key, value in choques.items()}
+    row = _avaliar(base, _normalizar_choques(shocks))
+    return {
+        key: (value[0].item() if isinstance(value[0], np.generic) else value[0])
+        for key, value in row.items()
+    }
+
+
+# Grade padrão da varredura: de zero ao dobro do choque SEVERO, 10 pontos por eixo.
+EIXOS_GRADE_PADRAO = ("receita", "margem_ebit", "juros", "divida")
+PONTOS_GRADE_PADRAO = 10
+COLUNAS_GRADE = (
+    "finscore_prudencial",
+    "finscore_prudencial_pre_cap",
+    "cap_prudencial_aplicavel",
+    "finscore_estrutural",
+    "finscore_adaptativo",
+    "caps_acionados",
+    "status",
+)
+
+
+def _eixos_estresse() -> list[tuple[str, str, dict[str, float], float]]:
+    """Eixos do estresse reverso: (nome, tipo, direção unitária, intensidade máxima).
+
+    Cada choque isolado segue o sinal do cenário SEVERO. Os cenários combinados
+    ADVERSO e SEVERO são escalados por um multiplicador até a receita zerar.
+    """
+    severe = core.SCENARIO_DEFINITIONS["SEVERO"]
+    axes = [
+        (key, "INDIVIDUAL", {key: float(np.sign(severe[key]))}, INTENSIDADE_MAXIMA_ESTRESSE[key])
+        for key in CHOQUES
+        if severe[key] != 0.0
+    ]
+    for name in ("ADVERSO", "SEVERO"):
+        definition = {key: float(core.SCENARIO_DEFINITIONS[name][key]) for key in CHOQUES}
+        axes.append((name, "COMBINADO", definition, 1.0 / abs(definition["receita"])))
+    return axes
+
+
+def _choques_eixos(direcoes: np.ndarray, intensidades: np.ndarray) -> dict[str, np.ndarray]:
+    return {key: intensidades * direcoes[:, position] for position, key in enumerate(CHOQUES)}
+
+
+def resolver_estresse_reverso(
+    base: BaseCenarios,
+    limiares: tuple[float, ...] = LIMIARES_ESTRESSE_PADRAO,
+    *,
+    incluir_caps: bool = True,
+    pontos_varredura: int = 21,
+    iteracoes: int = 20,
+) -> pd.DataFrame:
+    """Encontra, por eixo de choque, a menor intensidade que rompe cada critério.
+
+    Os critérios são ``finscore_prudencial`` abaixo de cada limiar e, com
+    ``incluir_caps``, um cap prudencial mais restritivo que o observado. Uma
+    varredura grossa compartilhada por todos os critérios localiza o primeiro
+    ponto de ruptura; em seguida todos os pares (eixo, critério) são refinados
+    juntos por bisseção, um lote vetorizado por iteração. O resultado é
+    ``ROMPE`` (intensidade encontrada), ``JA_ROMPIDO`` (o observado já rompe) ou
+    ``NAO_ROMPE`` (nenhuma ruptura até a intensidade máxima).
+    """
+    if pontos_varredura < 2 or iteracoes < 1:
+        raise ValueError("Use ao menos 2 pontos de varredura e 1 iteração de bisseção.")
+    axes = _eixos_estresse()
+    directions = np.array([[vector.get(key, 0.0) for key in CHOQUES] for _, _, vector, _ in axes])
+    maxima = np.array([maximum for *_, maximum in axes])
+    criteria = [(f"FINSCORE_ABAIXO_{limit:g}", float(limit)) for limit in limiares]
+    if incluir_caps:
+        criteria.append(("CAP_PRUDENCIAL", np.nan))
+    observed_cap = float(_pontuar(base, _aplicar_choques(base, _normalizar_choques({})))[
+        "cap_prudencial_aplicavel"
+    ][0])
+
+    def breaches(scores: dict[str, np.ndarray]) -> np.ndarray:
+        """Matriz (critérios, cenários) de rupturas."""
+        score = scores["finscore_prudencial"]
+        rows = [np.isfinite(score) & (score < limit) for _, limit in criteria[: len(limiares)]]
+        if incluir_caps:
+            rows.append(scores["cap_prudencial_aplicavel"] < observed_cap)
+        return np.array(rows, dtype=bool).reshape(len(criteria), -1)
+
+    # Varredura grossa: todos os eixos x pontos em um único lote.
+    fractions = np.linspace(0.0, 1.0, pontos_varredura)
+    grid = (maxima[:, None] * fractions[None, :]).ravel()
+    axis_index = np.repeat(np.arange(len(axes)), pontos_varredura)
+    scanned = breaches(_pontuar(base, _aplicar_choques(base, _choques_eixos(directions[axis_index], grid))))
+    scanned = scanned.reshape(len(criteria), len(axes), pontos_varredura)
+
+    pair_axis = np.tile(np.arange(len(axes)), len(criteria))
+    pair_criterion = np.repeat(np.arange(len(criteria)), len(axes))
+    hit = scanned[pair_criterion, pair_axis]
+    first = np.argmax(hit, axis=1)
+    any_hit = hit.any(axis=1)
+    already = hit[:, 0]
+    step = maxima[pair_axis] / (pontos_varredura - 1)
+    high = np.where(any_hit, first * step, np.nan)
+    low = np.where(any_hit & ~already, (first - 1) * step, high)
+
+    active = np.flatnonzero(any_hit & ~already)
+    for _ in range(iteracoes if active.size else 0):
+        middle = (low[active] + high[active]) / 2.0
+        result = breaches(
+            _pontuar(base, _aplicar_choques(base, _choques_eixos(directions[pair_axis[active]], middle)))
+        )
+        broke = result[pair_criterion[active], np.arange(active.size)]
+        high[active] = np.where(broke, middle, high[active])
+        low[active] = np.where(broke, low[active], middle)
+
+    solved = np.flatnonzero(any_hit)
+    final = _pontuar(
+        base, _aplicar_choques(base, _choques_eixos(directions[pair_axis[solved]], high[solved]))
+    )
+    final_status = np.where(final["flags"] == "", "VALIDO", "INVALIDO_CONTABILMENTE")
+    at_break = {
+        "finscore_prudencial_ruptura": np.full(len(pair_axis), np.nan),
+        "cap_prudencial_ruptura": np.full(len(pair_axis), np.nan),
+        "caps_acionados_ruptura": np.full(len(pair_axis), "", dtype=object),
+        "status_cenario_ruptura": np.full(len(pair_axis), "", dtype=object),
+    }
+    at_break["finscore_prudencial_ruptura"][solved] = final["finscore_prudencial"]
+    at_break["cap_prudencial_ruptura"][solved] = final["cap_prudencial_aplicavel"]
+    at_break["caps_acionados_ruptura"][solved] = final["caps_acionados"]
+    at_break["status_cenario_ruptura"][solved] = final_status
+
+    names = np.array([name for name, *_ in axes], dtype=object)
+    kinds = np.array([kind for _, kind, *_ in axes], dtype=object)
+    single = kinds[pair_axis] == "INDIVIDUAL"
+    signed = np.array([vector.get(name, np.nan) for name, _, vector, _ in axes])
+    return pd.DataFrame(
+        {
+            "eixo": names[pair_axis],
+            "tipo": kinds[pair_axis],
+            "criterio": [criteria[position][0] for position in pair_criterion],
+            "limiar": [criteria[position][1] for position in pair_criterion],
+            "cap_observado": observed_cap,
+            "intensidade_maxima": maxima[pair_axis],
+            "resultado": np.where(already, "JA_ROMPIDO", np.where(any_hit, "ROMPE", "NAO_ROMPE")),
+            "intensidade_ruptura": high,
+            # Choque relativo equivalente; para cenários combinados a intensidade
+            # é o multiplicador aplicado a todos os choques do cenário.
+            "choque_ruptura": np.where(single, high * signed[pair_axis], np.nan),
+            "precisao_intensidade": np.where(
+                any_hit & ~already, step / 2.0**iteracoes, np.where(already, 0.0, np.nan)
+            ),
+            **at_break,
+        }
+    )
+
+
+def grade_padrao(pontos: int = PONTOS_GRADE_PADRAO) -> dict[str, np.ndarray]:
+    """Valores de cada eixo da grade padrão, de 0 a 2x o choque SEVERO."""
+    severe = core.SCENARIO_DEFINITIONS["SEVERO"]
+    # ``+ 0.0`` evita o rótulo -0.0 nos eixos dos choques negativos.
+    return {key: severe[key] * np.linspace(0.0, 2.0, pontos) + 0.0 for key in EIXOS_GRADE_PADRAO}
+
+
+def varrer_grade_cenarios(
+    base: BaseCenarios,
+    grade: Mapping[str, Any] | None = None,
+    *,
+    tamanho_bloco: int = 4096,
+    colunas: tuple[str, ...] = COLUNAS_GRADE,
+) -> pd.DataFrame:
+    """Avalia o produto cartesiano dos eixos de ``grade`` em blocos.
+
+    ``grade`` mapeia chaves de ``CHOQUES`` para sequências de valores (padrão:
+    ``grade_padrao()``, 10x10x10x10 pontos). Os pontos são gerados por índice
+    dentro de cada bloco, sem materializar a grade inteira como cenários; a
+    memória de trabalho fica limitada a ``tamanho_bloco`` balanços e só as
+    ``colunas`` pedidas são acumuladas. Retorna uma linha por ponto da grade.
+    """
+    axes = {
+        key: np.atleast_1d(np.asarray(values, dtype=float))
+        for key, values in (grade_padrao() if grade is None else grade).items()
+    }
+    _normalizar_choques({key: 0.0 for key in axes})  # Valida as chaves.
+    if not axes or any(values.ndim != 1 or values.size == 0 for values in axes.values()):
+        raise ValueError("Cada eixo da grade precisa de ao menos um valor.")
+    if tamanho_bloco < 1:
+        raise ValueError("tamanho_bloco deve ser positivo.")
+    shape = tuple(values.size for values in axes.values())
+    total = int(np.prod(shape))
+    collected: dict[str, list[np.ndarray]] = {column: [] for column in colunas}
+    coordinates: dict[str, list[np.ndarray]] = {key: [] for key in axes}
+    for start in range(0, total, tamanho_bloco):
+        positions = np.unravel_index(np.arange(start, min(start + tamanho_bloco, total)), shape)
+        shocks = {key: axes[key][position] for key, position in zip(axes, positions)}
+        result = _avaliar(base, _normalizar_choques(shocks))
+        for key in axes:
+            coordinates[key].append(shocks[key])
+        for column in colunas:
+            collected[column].append(result[column])
+    return pd.DataFrame(
+        {
+            **{key: np.concatenate(parts) for key, parts in coordinates.items()},
+            **{column: np.concatenate(parts) for column, parts in collected.items()},
+        }
+    )
+
+
+def pivotar_grade(
+    tabela: pd.DataFrame,
+    linhas: str = "receita",
+    colunas: str = "margem_ebit",
+    valor: str = "finscore_prudencial",
+    agregacao: str = "min",
+) -> pd.DataFrame:
+    """Tabela de mapa de calor: ``valor`` por ``linhas`` x ``colunas``.
+
+    Os demais eixos da grade são resumidos por ``agregacao`` (``min`` mostra o
+    pior caso entre eles; ``mean``/``median``/``max`` também são aceitos).
+    """
+    if agregacao not in {"min", "max", "mean", "median"}:
+        raise ValueError("agregacao deve ser 'min', 'max', 'mean' ou 'median'.")
+    missing = [column for column in (linhas, colunas, valor) if column not in tabela]
+    if missing:
+        raise ValueError(f"Colunas ausentes na grade: {missing}.")
+    if linhas == colunas:
+        raise ValueError("Escolha eixos diferentes para linhas e colunas.")
+    return tabela.pivot_table(index=linhas, columns=colunas, values=valor, aggfunc=agregacao)
@@ -7,7 +7,7 @@ pelo Streamlit e um validador de runtime para detectar regressões de integraç
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Literal, TypedDict
+from typing import Any, Literal, NotRequired, TypedDict
 
 import pandas as pd
 
@@ -132,6 +132,11 @@ class FinScoreOutput(TypedDict):
     df_comparacao_monte_carlo: pd.DataFrame
     df_comparacao_aceitos_rejeitados: pd.DataFrame
     df_serasa: pd.DataFrame
+    # Menor choque que rompe limiares de score ou aciona caps (``cenarios.py``);
+    # ausente em saídas anteriores à sua introdução.
+    df_estresse_reverso: NotRequired[pd.DataFrame]
+    # Presente apenas em saídas de ``executar_finscore_incremental``.
+    execucao_incremental: NotRequired[dict[str, Any]]
 
 
 DATAFRAME_KEYS = (
@@ -169,6 +174,8 @@ DATAFRAME_KEYS = (
     "df_serasa",
 )
 
+OPTIONAL_DATAFRAME_KEYS = ("df_estresse_reverso",)
+
 DICT_KEYS = (
     "modelo",
     "status_qualidade",
@@ -231,7 +238,7 @@ def validar_contrato(output: FinScoreOutput | dict[str, Any]) -> FinScoreOutput:
     for key in DICT_KEYS:
         if key in output and not isinstance(output[key], dict):
             errors.append(f"{key} deve ser dict")
-    for key in DATAFRAME_KEYS:
+    for key in (*DATAFRAME_KEYS, *OPTIONAL_DATAFRAME_KEYS):
         if key in output and not isinstance(output[key], pd.DataFrame):
             errors.append(f"{key} deve ser pandas.DataFrame")
 
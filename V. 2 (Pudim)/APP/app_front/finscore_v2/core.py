@@ -77,10 +77,13 @@ import os
 import math
 import re
 from dataclasses import dataclass
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.decomposition import PCA
+
+def PCA(*args, **kwargs):
+    """Importa ``sklearn.decomposition.PCA`` somente no primeiro uso."""
+    from sklearn.decomposition import PCA as _classe
+    return _classe(*args, **kwargs)
 DELTA_MIN = 0.05
 DELTA_MAX = 0.35
 BALANCE_TOLERANCE = 0.01 / 2
@@ -1155,6 +1158,8 @@ def run_sensitivity(base: pd.DataFrame, n: int, seed: int, profiles: dict[str, P
     attempts = 0
     while len(rows) < n and attempts < n * MAX_ATTEMPT_FACTOR:
         attempts += 1
+        if MONITOR_SIMULACAO is not None:
+            MONITOR_SIMULACAO(approach, attempts, len(rows), n)
         sim = simulate_trajectory(base, widths, rng, approach)
         flags = accounting_flags(sim)
         characteristics = _relative_shocks(base, sim)
@@ -1510,3 +1515,5 @@ STATUS_HASH_CODIGO = "NAO_VERIFICADO"
 MODELO_APTO = False
 diagnosticos_simulacao = {}
 diagnosticos_simulacao_correlacionada = {}
+# Chamado por ``run_sensitivity`` como (abordagem, tentativa, aceitos, alvo).
+MONITOR_SIMULACAO = None
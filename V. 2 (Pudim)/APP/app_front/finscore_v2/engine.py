@@ -2,14 +2,145 @@
 
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any
+from time import perf_counter
+from typing import Any, Callable, Iterator, Mapping, Protocol
 
 import numpy as np
 import pandas as pd
 
 from . import core
+from .cenarios import preparar_base_cenarios, resolver_estresse_reverso
 from .contracts import CONTRACT_VERSION, FinScoreOutput, validar_contrato
+from .hashing import dataframe_sha256
+
+
+# Chaves produzidas por ``_secao_scores``; reaproveitadas em bloco quando a
+# base analítica não muda entre execuções incrementais.
+_CHAVES_SCORES = (
+    "finscore_observado",
+    "pca_observado",
+    "df_contas_derivadas",
+    "df_indices_observados",
+    "df_notas_observadas",
+    "df_motivos_nan",
+    "df_score_temporal",
+    "df_contribuicoes_score",
+    "df_caps_prudenciais",
+    "df_intervalos_incerteza",
+    "df_sensibilidade_redundancia_fp",
+    "resumo_redundancia_fp",
+    "df_diagnostico_pca",
+    "df_pesos_pca",
+    "df_cargas_pca",
+    "df_springate_complementar",
+    "df_fleuriet_complementar",
+    "status_indices_complementares",
+)
+
+# Tentativas de Monte Carlo entre duas consultas ao cancelamento/progresso.
+BLOCO_SIMULACOES = 25
+# Fração inicial de cada etapa, com e sem simulações. As duas séries de Monte
+# Carlo avançam entre o seu início e o da etapa seguinte pela razão
+# aceitos/alvo.
+_FRACOES_ETAPAS = {
+    "qualidade dos dados": (0.0, 0.0),
+    "scores observados": (0.05, 0.3),
+    "cenários determinísticos": (0.15, 0.7),
+    "simulações independentes": (0.2, None),
+    "simulações correlacionadas": (0.55, None),
+    "resumo das simulações": (0.9, None),
+    "crédito externo": (0.95, 0.9),
+    "concluído": (1.0, 1.0),
+}
+
+MonitorProgresso = Callable[[str, float, Mapping[str, int]], None]
+
+
+class TokenCancelamento(Protocol):
+    """Qualquer objeto com ``is_set()``, como ``threading.Event``."""
+
+    def is_set(self) -> bool: ...
+
+
+class ExecucaoCancelada(RuntimeError):
+    """A execução foi interrompida pelo token de cancelamento."""
+
+
+class _Acompanhamento:
+    """Relata etapas ao chamador e interrompe a execução quando cancelada."""
+
+    def __init__(
+        self,
+        progresso: MonitorProgresso | None = None,
+        cancelamento: TokenCancelamento | None = None,
+        *,
+        simulacoes: bool = True,
+    ) -> None:
+        self.progresso = progresso
+        self.cancelamento = cancelamento
+        self.simulacoes = simulacoes
+
+    @property
+    def ativo(self) -> bool:
+        return self.progresso is not None or self.cancelamento is not None
+
+    def fracao(self, etapa: str) -> float:
+        with_simulations, without_simulations = _FRACOES_ETAPAS[etapa]
+        return with_simulations if self.simulacoes else without_simulations
+
+    def etapa(self, nome: str, fracao: float | None = None, **contagens: int) -> None:
+        if self.cancelamento is not None and self.cancelamento.is_set():
+            raise ExecucaoCancelada(f"Execução cancelada em {nome}.")
+        if self.progresso is not None:
+            self.progresso(nome, self.fracao(nome) if fracao is None else fracao, contagens)
+
+    @contextmanager
+    def serie(self, nome: str, seguinte: str) -> Iterator[None]:
+        """Acompanha ``core.run_sensitivity`` a cada ``BLOCO_SIMULACOES`` tentativas."""
+        self.etapa(nome)
+        if not self.ativo:
+            yield
+            return
+        start, span = self.fracao(nome), self.fracao(seguinte) - self.fracao(nome)
+
+        def monitor(approach: str, attempt: int, accepted: int, target: int) -> None:
+            done = attempt - 1
+            if done and done % BLOCO_SIMULACOES == 0:
+                self.etapa(
+                    nome,
+                    start + span * accepted / target,
+                    aceitos=accepted,
+                    tentativas=done,
+                    alvo=target,
+                )
+
+        token = _MONITOR.set(monitor)
+        try:
+            yield
+        finally:
+            _MONITOR.reset(token)
+
+
+# O gancho de ``core.run_sensitivity`` é global ao processo; o monitor de cada
+# chamada fica em uma ContextVar, de modo que execuções simultâneas (outra
+# thread, o aquecimento) não recebem o progresso nem o cancelamento alheios.
+_MONITOR: ContextVar[Callable[[str, int, int, int], None] | None] = ContextVar(
+    "finscore_monitor_simulacao", default=None
+)
+
+
+def _monitor_da_chamada(approach: str, attempt: int, accepted: int, target: int) -> None:
+    monitor = _MONITOR.get()
+    if monitor is not None:
+        monitor(approach, attempt, accepted, target)
+
+
+core.MONITOR_SIMULACAO = _monitor_da_chamada
 
 
 def preparar_dados_contabeis(raw: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -150,30 +281,22 @@ def _diagnosticos_pca(
     )
 
 
-def executar_finscore(
-    dados: pd.DataFrame,
-    *,
-    serasa_score: float | int | None = None,
-    serasa_data: str | None = None,
-    serasa_restricao_grave: bool = False,
-    correcoes_manuais: list[dict[str, Any]] | pd.DataFrame | None = None,
-    executar_simulacoes: bool = True,
-    numero_simulacoes: int = 1000,
-    semente: int = 20260723,
-) -> FinScoreOutput:
-    """Executa o FinScore 2.0.19 e os diagnósticos complementares da 2.0.20."""
-    if executar_simulacoes and numero_simulacoes < 100:
-        raise ValueError("Use ao menos 100 simulações.")
-
-    processed_at = datetime.now()
-    core.DATA_HORA_PROCESSAMENTO = processed_at
-    reported, import_report = preparar_dados_contabeis(dados)
+def _normalizar_correcoes(
+    correcoes_manuais: list[dict[str, Any]] | pd.DataFrame | None,
+) -> list[dict[str, Any]]:
     if correcoes_manuais is None:
-        manual_corrections: list[dict[str, Any]] = []
-    elif isinstance(correcoes_manuais, pd.DataFrame):
-        manual_corrections = correcoes_manuais.to_dict(orient="records")
-    else:
-        manual_corrections = list(correcoes_manuais)
+        return []
+    if isinstance(correcoes_manuais, pd.DataFrame):
+        return correcoes_manuais.to_dict(orient="records")
+    return list(correcoes_manuais)
+
+
+def _secao_qualidade(
+    reported: pd.DataFrame,
+    import_report: pd.DataFrame,
+    manual_corrections: list[dict[str, Any]],
+) -> tuple[dict[str, Any], float]:
+    """Validação, correções, auditoria, viés e confiabilidade."""
     analysis, quality, corrections, status = core.validate_correct_and_prepare(
         reported,
         import_report,
@@ -191,17 +314,7 @@ def executar_finscore(
         reported, quality, corrections, alerts
     )
     status, q_observed = _atualizar_status_qualidade(status, reliability, alerts)
-
-    result: dict[str, Any] = {
-        "contrato_versao": CONTRACT_VERSION,
-        "modelo": {
-            "nome": "Pudim",
-            "versao": core.VERSAO_MODELO,
-            "hash_codigo": core.HASH_CODIGO_MODELO,
-            "processado_em": processed_at,
-            "semente": int(semente),
-            "numero_simulacoes": int(numero_simulacoes) if executar_simulacoes else 0,
-        },
+    section = {
         "status_qualidade": status,
         "confiabilidade": reliability,
         "df_confiabilidade_componentes": reliability_components,
@@ -212,14 +325,38 @@ def executar_finscore(
         "df_correcoes_auditoria": corrections,
         "df_rastreabilidade_contas": traceability,
         "df_alertas_vies": alerts,
-        "hash_dados_reportados": core.dataframe_sha256(reported),
-        "hash_dados_utilizados": core.dataframe_sha256(analysis),
+        "hash_dados_reportados": dataframe_sha256(reported),
+        "hash_dados_utilizados": dataframe_sha256(analysis),
     }
+    return section, q_observed
 
-    model_ready = bool(status["apto_calculo"])
-    # A função congelada ``explain_missing_indices`` consulta esta tabela por
-    # nome global. Mantemos a compatibilidade aqui sem expor estado ao chamador.
-    core.df_contas_analise = analysis
+
+def _rotular_observado(
+    observed: dict[str, Any],
+    status: dict[str, Any],
+    reliability: dict[str, Any],
+    q_observed: float,
+) -> None:
+    """Acrescenta ao score os rótulos que dependem só de qualidade e confiabilidade."""
+    observed.update(reliability)
+    observed["classificacao_uso"] = status["classificacao_uso"]
+    observed["natureza_resultado"] = (
+        "EXPLORATORIO_QUALIDADE_INSUFICIENTE"
+        if q_observed < 0.60
+        else "PROVISORIO_CORRECOES_OU_ALERTAS_PENDENTES"
+        if not status["apto_decisao"]
+        else "DECISORIO_NA_POLITICA_ATUAL"
+    )
+    observed["utilizavel_decisao"] = "SIM" if status["apto_decisao"] else "NAO"
+
+
+def _secao_scores(
+    analysis: pd.DataFrame,
+    status: dict[str, Any],
+    reliability: dict[str, Any],
+    q_observed: float,
+) -> dict[str, Any]:
+    """Contas derivadas, índices, PCA, scores, caps e contrastes diagnósticos."""
     profiles: dict[str, core.PCAProfile] = {}
     observed: dict[str, Any] = {}
     derived = pd.DataFrame()
@@ -239,7 +376,7 @@ def executar_finscore(
     fleuriet = pd.DataFrame()
     complementary_status = "NÃO CALCULÁVEL — BASE NÃO APTA"
 
-    if model_ready:
+    if status["apto_calculo"]:
         derived = core.derive(analysis)
         indicators = core.indices(derived)
         notes = core.score_indices(indicators)
@@ -252,16 +389,7 @@ def executar_finscore(
         observed["finscore_prudencial"] = min(
             observed["finscore_prudencial_pre_cap"], applicable_cap
         )
-        observed.update(reliability)
-        observed["classificacao_uso"] = status["classificacao_uso"]
-        observed["natureza_resultado"] = (
-            "EXPLORATORIO_QUALIDADE_INSUFICIENTE"
-            if q_observed < 0.60
-            else "PROVISORIO_CORRECOES_OU_ALERTAS_PENDENTES"
-            if not status["apto_decisao"]
-            else "DECISORIO_NA_POLITICA_ATUAL"
-        )
-        observed["utilizavel_decisao"] = "SIM" if status["apto_decisao"] else "NAO"
+        _rotular_observado(observed, status, reliability, q_observed)
         redundancy, redundancy_summary = core.analyze_fp_redundancy(
             temporal_scores, indicators, analysis
         )
@@ -287,103 +415,469 @@ def executar_finscore(
             raise AssertionError("Controle Fleuriet: CDG diverge do CCL contábil.")
         complementary_status = "CALCULADOS COMO CONTRASTES DIAGNÓSTICOS"
 
-    result.update(
-        {
-            "finscore_observado": observed,
-            "pca_observado": profiles,
-            "df_contas_derivadas": derived,
-            "df_indices_observados": indicators,
-            "df_notas_observadas": notes,
-            "df_motivos_nan": missing_reasons,
-            "df_score_temporal": temporal_scores,
-            "df_contribuicoes_score": contributions,
-            "df_caps_prudenciais": caps,
-            "df_intervalos_incerteza": uncertainty,
-            "df_sensibilidade_redundancia_fp": redundancy,
-            "resumo_redundancia_fp": redundancy_summary,
-            "df_diagnostico_pca": pca_diagnostics,
-            "df_pesos_pca": pca_weights,
-            "df_cargas_pca": pca_loadings,
-            "df_springate_complementar": springate,
-            "df_fleuriet_complementar": fleuriet,
-            "status_indices_complementares": complementary_status,
-        }
+    return {
+        "finscore_observado": observed,
+        "pca_observado": profiles,
+        "df_contas_derivadas": derived,
+        "df_indices_observados": indicators,
+        "df_notas_observadas": notes,
+        "df_motivos_nan": missing_reasons,
+        "df_score_temporal": temporal_scores,
+        "df_contribuicoes_score": contributions,
+        "df_caps_prudenciais": caps,
+        "df_intervalos_incerteza": uncertainty,
+        "df_sensibilidade_redundancia_fp": redundancy,
+        "resumo_redundancia_fp": redundancy_summary,
+        "df_diagnostico_pca": pca_diagnostics,
+        "df_pesos_pca": pca_weights,
+        "df_cargas_pca": pca_loadings,
+        "df_springate_complementar": springate,
+        "df_fleuriet_complementar": fleuriet,
+        "status_indices_complementares": complementary_status,
+    }
+
+
+def _secao_cenarios(
+    analysis: pd.DataFrame,
+    profiles: dict[str, core.PCAProfile],
+) -> dict[str, pd.DataFrame]:
+    """Cenários determinísticos canônicos e estresse reverso sobre a mesma base."""
+    return {
+        "df_cenarios_deterministicos": core.run_deterministic_scenarios(analysis, profiles),
+        "df_estresse_reverso": resolver_estresse_reverso(
+            preparar_base_cenarios(analysis, profiles)
+        ),
+    }
+
+
+def _cenarios_vazios() -> dict[str, pd.DataFrame]:
+    return {"df_cenarios_deterministicos": pd.DataFrame(), "df_estresse_reverso": pd.DataFrame()}
+
+
+def _secao_simulacoes(
+    analysis: pd.DataFrame,
+    profiles: dict[str, core.PCAProfile],
+    observed: dict[str, Any],
+    numero_simulacoes: int,
+    semente: int,
+    acompanhamento: _Acompanhamento | None = None,
+) -> dict[str, Any]:
+    """Executa as duas séries de Monte Carlo e os resumos derivados delas."""
+    acompanhamento = acompanhamento or _Acompanhamento()
+    with acompanhamento.serie("simulações independentes", "simulações correlacionadas"):
+        independent, independent_diagnostics = core.run_sensitivity(
+            analysis, numero_simulacoes, semente, profiles, "independente"
+        )
+    with acompanhamento.serie("simulações correlacionadas", "resumo das simulações"):
+        correlated, correlated_diagnostics = core.run_sensitivity(
+            analysis, numero_simulacoes, semente + 100_000, profiles, "correlacionado"
+        )
+    acompanhamento.etapa("resumo das simulações")
+    simulation_summary = pd.concat(
+        [
+            core.descriptive(independent, observed).assign(abordagem="independente"),
+            core.descriptive(correlated, observed).assign(abordagem="correlacionado"),
+        ],
+        ignore_index=True,
+    )
+    sensitivity = pd.concat(
+        [
+            core.sensitivity_ranking(independent).assign(abordagem="independente"),
+            core.sensitivity_ranking(correlated).assign(abordagem="correlacionado"),
+        ],
+        ignore_index=True,
+    )
+    amplitudes = independent_diagnostics["limites_choques"].copy()
+    monte_carlo_comparison = core.compare_monte_carlo_approaches(
+        independent,
+        independent_diagnostics,
+        correlated,
+        correlated_diagnostics,
     )
+    comparisons = []
+    for approach, diagnostics in (
+        ("independente", independent_diagnostics),
+        ("correlacionado", correlated_diagnostics),
+    ):
+        table = diagnostics["comparacao_aceitos_rejeitados"].copy()
+        table.insert(0, "abordagem", approach)
+        comparisons.append(table)
+    accepted_rejected = pd.concat(comparisons, ignore_index=True)
+    return {
+        "df_simulacoes": independent,
+        "df_simulacoes_independentes": independent,
+        "df_simulacoes_correlacionadas": correlated,
+        "df_resumo_simulacoes": simulation_summary,
+        "df_sensibilidade": sensitivity,
+        "df_amplitudes": amplitudes,
+        "df_comparacao_monte_carlo": monte_carlo_comparison,
+        "df_comparacao_aceitos_rejeitados": accepted_rejected,
+        "diagnosticos_simulacao": independent_diagnostics,
+        "diagnosticos_simulacao_correlacionada": correlated_diagnostics,
+    }
+
 
-    scenarios = pd.DataFrame()
+def _simulacoes_vazias() -> dict[str, Any]:
     independent = pd.DataFrame()
-    correlated = pd.DataFrame()
-    simulation_summary = pd.DataFrame()
-    sensitivity = pd.DataFrame()
-    amplitudes = pd.DataFrame()
-    monte_carlo_comparison = pd.DataFrame()
-    accepted_rejected = pd.DataFrame()
-    independent_diagnostics: dict[str, Any] = {}
-    correlated_diagnostics: dict[str, Any] = {}
+    return {
+        "df_simulacoes": independent,
+        "df_simulacoes_independentes": independent,
+        "df_simulacoes_correlacionadas": pd.DataFrame(),
+        "df_resumo_simulacoes": pd.DataFrame(),
+        "df_sensibilidade": pd.DataFrame(),
+        "df_amplitudes": pd.DataFrame(),
+        "df_comparacao_monte_carlo": pd.DataFrame(),
+        "df_comparacao_aceitos_rejeitados": pd.DataFrame(),
+        "diagnosticos_simulacao": {},
+        "diagnosticos_simulacao_correlacionada": {},
+    }
 
+
+def _montar_resultado(
+    *,
+    processed_at: datetime,
+    semente: int,
+    numero_simulacoes: int,
+    qualidade: dict[str, Any],
+    scores: dict[str, Any],
+    cenarios: dict[str, pd.DataFrame],
+    simulacoes: dict[str, Any],
+    serasa: pd.DataFrame,
+) -> dict[str, Any]:
+    return {
+        "contrato_versao": CONTRACT_VERSION,
+        "modelo": {
+            "nome": "Pudim",
+            "versao": core.VERSAO_MODELO,
+            "hash_codigo": core.HASH_CODIGO_MODELO,
+            "processado_em": processed_at,
+            "semente": int(semente),
+            "numero_simulacoes": int(numero_simulacoes),
+        },
+        **qualidade,
+        **scores,
+        **cenarios,
+        **simulacoes,
+        "df_serasa": serasa,
+    }
+
+
+def executar_finscore(
+    dados: pd.DataFrame,
+    *,
+    serasa_score: float | int | None = None,
+    serasa_data: str | None = None,
+    serasa_restricao_grave: bool = False,
+    correcoes_manuais: list[dict[str, Any]] | pd.DataFrame | None = None,
+    executar_simulacoes: bool = True,
+    numero_simulacoes: int = 1000,
+    semente: int = 20260723,
+    progresso: MonitorProgresso | None = None,
+    cancelamento: TokenCancelamento | None = None,
+) -> FinScoreOutput:
+    """Executa o FinScore 2.0.19 e os diagnósticos complementares da 2.0.20.
+
+    ``progresso(etapa, fracao, contagens)``, quando informado, recebe cada
+    etapa com a fração concluída entre 0 e 1; nas séries de Monte Carlo ele é
+    chamado a cada ``BLOCO_SIMULACOES`` tentativas e ``contagens`` traz
+    ``aceitos``, ``tentativas`` e ``alvo``. ``cancelamento`` é consultado nos
+    mesmos pontos: quando ``is_set()`` fica verdadeiro, a execução levanta
+    ``ExecucaoCancelada`` sem esperar o fim das simulações.
+    """
+    if executar_simulacoes and numero_simulacoes < 100:
+        raise ValueError("Use ao menos 100 simulações.")
+
+    acompanhamento = _Acompanhamento(progresso, cancelamento, simulacoes=executar_simulacoes)
+    acompanhamento.etapa("qualidade dos dados")
+    processed_at = datetime.now()
+    core.DATA_HORA_PROCESSAMENTO = processed_at
+    reported, import_report = preparar_dados_contabeis(dados)
+    qualidade, q_observed = _secao_qualidade(
+        reported, import_report, _normalizar_correcoes(correcoes_manuais)
+    )
+    status = qualidade["status_qualidade"]
+    analysis = qualidade["df_contas_analise"]
+    model_ready = bool(status["apto_calculo"])
+    # A função congelada ``explain_missing_indices`` consulta esta tabela por
+    # nome global. Mantemos a compatibilidade aqui sem expor estado ao chamador.
+    core.df_contas_analise = analysis
+    acompanhamento.etapa("scores observados")
+    scores = _secao_scores(analysis, status, qualidade["confiabilidade"], q_observed)
+    observed = scores["finscore_observado"]
+
+    scenarios = _cenarios_vazios()
+    simulacoes = _simulacoes_vazias()
     if model_ready:
-        scenarios = core.run_deterministic_scenarios(analysis, profiles)
+        acompanhamento.etapa("cenários determinísticos")
+        scenarios = _secao_cenarios(analysis, scores["pca_observado"])
         if executar_simulacoes:
-            independent, independent_diagnostics = core.run_sensitivity(
-                analysis, numero_simulacoes, semente, profiles, "independente"
-            )
-            correlated, correlated_diagnostics = core.run_sensitivity(
-                analysis, numero_simulacoes, semente + 100_000, profiles, "correlacionado"
+            simulacoes = _secao_simulacoes(
+                analysis,
+                scores["pca_observado"],
+                observed,
+                numero_simulacoes,
+                semente,
+                acompanhamento,
             )
-            simulation_summary = pd.concat(
-                [
-                    core.descriptive(independent, observed).assign(abordagem="independente"),
-                    core.descriptive(correlated, observed).assign(abordagem="correlacionado"),
-                ],
-                ignore_index=True,
-            )
-            sensitivity = pd.concat(
-                [
-                    core.sensitivity_ranking(independent).assign(abordagem="independente"),
-                    core.sensitivity_ranking(correlated).assign(abordagem="correlacionado"),
-                ],
-                ignore_index=True,
-            )
-            amplitudes = independent_diagnostics["limites_choques"].copy()
-            monte_carlo_comparison = core.compare_monte_carlo_approaches(
-                independent,
-                independent_diagnostics,
-                correlated,
-                correlated_diagnostics,
-            )
-            comparisons = []
-            for approach, diagnostics in (
-                ("independente", independent_diagnostics),
-                ("correlacionado", correlated_diagnostics),
-            ):
-                table = diagnostics["comparacao_aceitos_rejeitados"].copy()
-                table.insert(0, "abordagem", approach)
-                comparisons.append(table)
-            accepted_rejected = pd.concat(comparisons, ignore_index=True)
 
+    acompanhamento.etapa("crédito externo")
     serasa = core.assess_external_credit(
         observed.get("finscore_prudencial", np.nan),
         serasa_score,
         serasa_data,
         serasa_restricao_grave,
     )
-    result.update(
+    result = _montar_resultado(
+        processed_at=processed_at,
+        semente=semente,
+        numero_simulacoes=numero_simulacoes if executar_simulacoes else 0,
+        qualidade=qualidade,
+        scores=scores,
+        cenarios=scenarios,
+        simulacoes=simulacoes,
+        serasa=serasa,
+    )
+    result = validar_contrato(result)
+    acompanhamento.etapa("concluído")
+    return result
+
+
+def _correcoes_aplicadas(anterior: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Reconstrói as correções manuais de uma saída a partir da trilha de auditoria."""
+    audit = anterior.get("df_correcoes_auditoria")
+    if not isinstance(audit, pd.DataFrame) or audit.empty:
+        return []
+    manual = audit.loc[audit["etapa"].eq("CORRECAO_MANUAL")]
+    return [
         {
-            "df_cenarios_deterministicos": scenarios,
-            "df_simulacoes": independent,
-            "df_simulacoes_independentes": independent,
-            "df_simulacoes_correlacionadas": correlated,
-            "df_resumo_simulacoes": simulation_summary,
-            "df_sensibilidade": sensitivity,
-            "df_amplitudes": amplitudes,
-            "df_comparacao_monte_carlo": monte_carlo_comparison,
-            "df_comparacao_aceitos_rejeitados": accepted_rejected,
-            "diagnosticos_simulacao": independent_diagnostics,
-            "diagnosticos_simulacao_correlacionada": correlated_diagnostics,
-            "df_serasa": serasa,
+            "ano": int(row["ano"]),
+            "conta": row["conta"],
+            "valor": row["valor_proposto"],
+            "fonte": row["fonte"],
+            "justificativa": row["evidencia"],
+            "responsavel": row["responsavel"],
+            "confirmado": bool(row["confirmado"]),
         }
+        for _, row in manual.iterrows()
+    ]
+
+
+def _mesclar_correcoes(
+    anteriores: list[dict[str, Any]],
+    delta: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Aplica o delta por (ano, conta): substitui, acrescenta ou remove (``remover``)."""
+    merged = {(int(item["ano"]), item["conta"]): dict(item) for item in anteriores}
+    for item in delta:
+        key = (int(item["ano"]), item["conta"])
+        if item.get("remover"):
+            merged.pop(key, None)
+        else:
+            merged[key] = {name: value for name, value in item.items() if name != "remover"}
+    return list(merged.values())
+
+
+def executar_finscore_incremental(
+    anterior: FinScoreOutput | Mapping[str, Any],
+    correcoes_manuais: list[dict[str, Any]] | pd.DataFrame | None = None,
+    *,
+    substituir_correcoes: bool = False,
+    serasa_score: float | int | None = None,
+    serasa_data: str | None = None,
+    serasa_restricao_grave: bool = False,
+    executar_simulacoes: bool | None = None,
+    numero_simulacoes: int | None = None,
+    semente: int | None = None,
+    progresso: MonitorProgresso | None = None,
+    cancelamento: TokenCancelamento | None = None,
+) -> FinScoreOutput:
+    """Recalcula uma saída anterior após mudanças nas correções manuais.
+
+    ``correcoes_manuais`` é um delta sobre as correções já aplicadas em
+    ``anterior`` (recuperadas de ``df_correcoes_auditoria``): registros com o
+    mesmo ``ano``/``conta`` substituem o anterior e ``remover=True`` o desfaz.
+    Com ``substituir_correcoes=True`` a lista passa a ser o conjunto completo.
+
+    Validação, auditoria e confiabilidade são sempre refeitas, sem reler os
+    dados reportados. Scores, cenários e Monte Carlo só são recalculados quando
+    ``hash_dados_utilizados`` muda; as simulações também são reaproveitadas se
+    quantidade e semente coincidirem. ``executar_simulacoes=False`` adia o Monte
+    Carlo, que pode ser completado depois por outra chamada incremental. Serasa
+    é sempre reavaliado com os argumentos recebidos. As seções reaproveitadas
+    ficam em ``resultado["execucao_incremental"]``. ``progresso`` e
+    ``cancelamento`` funcionam como em ``executar_finscore``; etapas
+    reaproveitadas não são relatadas.
+    """
+    previous = validar_contrato(dict(anterior))
+    previous_model = previous["modelo"]
+    previous_simulations = int(previous_model["numero_simulacoes"])
+    if executar_simulacoes is None:
+        executar_simulacoes = previous_simulations > 0
+    if numero_simulacoes is None:
+        numero_simulacoes = previous_simulations or 1000
+    if semente is None:
+        semente = int(previous_model["semente"])
+    if executar_simulacoes and numero_simulacoes < 100:
+        raise ValueError("Use ao menos 100 simulações.")
+
+    delta = _normalizar_correcoes(correcoes_manuais)
+    manual_corrections = (
+        delta
+        if substituir_correcoes
+        else _mesclar_correcoes(_correcoes_aplicadas(previous), delta)
+    )
+
+    acompanhamento = _Acompanhamento(progresso, cancelamento, simulacoes=executar_simulacoes)
+    acompanhamento.etapa("qualidade dos dados")
+    processed_at = datetime.now()
+    core.DATA_HORA_PROCESSAMENTO = processed_at
+    qualidade, q_observed = _secao_qualidade(
+        previous["df_contas_reportadas"],
+        previous["df_relatorio_importacao"],
+        manual_corrections,
+    )
+    status = qualidade["status_qualidade"]
+    reliability = qualidade["confiabilidade"]
+    analysis = qualidade["df_contas_analise"]
+    model_ready = bool(status["apto_calculo"])
+    core.df_contas_analise = analysis
+
+    reused = ["dados_reportados"]
+    recomputed = ["qualidade"]
+    same_base = (
+        qualidade["hash_dados_utilizados"] == previous["hash_dados_utilizados"]
+        and model_ready == bool(previous["status_qualidade"]["apto_calculo"])
+    )
+    if same_base:
+        scores = {key: previous[key] for key in _CHAVES_SCORES}
+        observed = dict(previous["finscore_observado"])
+        if observed:
+            _rotular_observado(observed, status, reliability, q_observed)
+        scores["finscore_observado"] = observed
+        if "df_estresse_reverso" in previous:
+            scenarios = {key: previous[key] for key in _cenarios_vazios()}
+            reused += ["scores", "cenarios"]
+        else:
+            # Saídas anteriores ao estresse reverso: refaz só os cenários.
+            acompanhamento.etapa("cenários determinísticos")
+            scenarios = (
+                _secao_cenarios(analysis, scores["pca_observado"])
+                if model_ready
+                else _cenarios_vazios()
+            )
+            reused.append("scores")
+            recomputed.append("cenarios")
+    else:
+        acompanhamento.etapa("scores observados")
+        scores = _secao_scores(analysis, status, reliability, q_observed)
+        observed = scores["finscore_observado"]
+        acompanhamento.etapa("cenários determinísticos")
+        scenarios = (
+            _secao_cenarios(analysis, scores["pca_observado"])
+            if model_ready
+            else _cenarios_vazios()
+        )
+        recomputed += ["scores", "cenarios"]
+
+    simulacoes = _simulacoes_vazias()
+    if model_ready and executar_simulacoes:
+        if (
+            same_base
+            and previous_simulations == numero_simulacoes
+            and int(previous_model["semente"]) == semente
+        ):
+            simulacoes = {key: previous[key] for key in simulacoes}
+            reused.append("simulacoes")
+        else:
+            simulacoes = _secao_simulacoes(
+                analysis,
+                scores["pca_observado"],
+                observed,
+                numero_simulacoes,
+                semente,
+                acompanhamento,
+            )
+            recomputed.append("simulacoes")
+
+    acompanhamento.etapa("crédito externo")
+    serasa = core.assess_external_credit(
+        observed.get("finscore_prudencial", np.nan),
+        serasa_score,
+        serasa_data,
+        serasa_restricao_grave,
+    )
+    recomputed.append("serasa")
+    result = _montar_resultado(
+        processed_at=processed_at,
+        semente=semente,
+        numero_simulacoes=numero_simulacoes if executar_simulacoes else 0,
+        qualidade=qualidade,
+        scores=scores,
+        cenarios=scenarios,
+        simulacoes=simulacoes,
+        serasa=serasa,
     )
-    return validar_contrato(result)
+    result["execucao_incremental"] = {
+        "processado_em_anterior": previous_model["processado_em"],
+        "hash_dados_utilizados_anterior": previous["hash_dados_utilizados"],
+        "correcoes_manuais": len(manual_corrections),
+        "secoes_reutilizadas": reused,
+        "secoes_recalculadas": recomputed,
+        "simulacoes_adiadas": bool(model_ready and not executar_simulacoes),
+    }
+    result = validar_contrato(result)
+    acompanhamento.etapa("concluído")
+    return result
+
+
+def _executar_empresa(
+    item: tuple[str, pd.DataFrame, dict[str, Any]],
+) -> tuple[str, FinScoreOutput | None, str | None]:
+    company, data, options = item
+    try:
+        return company, executar_finscore(data, **options), None
+    except ExecucaoCancelada:
+        raise
+    except Exception as error:
+        return company, None, f"{type(error).__name__}: {error}"
+
+
+def executar_finscore_lote(
+    bases: Mapping[str, pd.DataFrame],
+    *,
+    processos: int | None = 1,
+    **opcoes: Any,
+) -> tuple[dict[str, FinScoreOutput], pd.DataFrame]:
+    """Executa o FinScore para várias empresas com isolamento de falhas.
+
+    ``opcoes`` são repassadas a ``executar_finscore`` para todas as empresas.
+    ``executar_finscore`` publica estado em ``core``; por isso o paralelismo usa
+    processos, nunca threads. ``processos=1`` executa sequencialmente e
+    ``None`` usa um processo por CPU. Retorna as saídas por empresa e uma
+    tabela ``empresa``/``erro`` com as falhas. ``progresso`` e
+    ``cancelamento`` não atravessam processos e exigem ``processos=1``; o
+    cancelamento interrompe o lote inteiro com ``ExecucaoCancelada``.
+    """
+    if processos != 1 and len(bases) > 1 and {"progresso", "cancelamento"} & set(opcoes):
+        raise ValueError("progresso e cancelamento exigem processos=1.")
+    items = [(str(company), data, dict(opcoes)) for company, data in bases.items()]
+    if processos == 1 or len(items) <= 1:
+        results = [_executar_empresa(item) for item in items]
+    else:
+        # spawn: um fork herdaria os globais de ``core`` e os locks das threads
+        # do app (fila de tarefas, aquecimento) no estado em que estivessem.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processos, mp_context=context) as executor:
+            results = list(executor.map(_executar_empresa, items))
+
+    outputs: dict[str, FinScoreOutput] = {}
+    failures: list[dict[str, str]] = []
+    for company, output, error in results:
+        if output is None:
+            failures.append({"empresa": company, "erro": error or ""})
+        else:
+            outputs[company] = output
+    return outputs, pd.DataFrame(failures, columns=["empresa", "erro"])
 
 
 def executar_autotestes() -> pd.DataFrame:
@@ -402,3 +896,25 @@ def executar_autotestes() -> pd.DataFrame:
         )
         raise AssertionError(f"Autoteste(s) com falha: {description}")
     return tests
+
+
+def aquecer(numero_simulacoes: int = 100) -> dict[str, float]:
+    """Paga no processo atual os custos da primeira pontuação.
+
+    Importa o scikit-learn, inicializa o BLAS e percorre uma vez todas as
+    seções do motor com ``synthetic_valid_data`` (``numero_simulacoes=0``
+    omite o Monte Carlo). Retorna a duração de cada etapa em segundos.
+    """
+    timings: dict[str, float] = {}
+    start = perf_counter()
+    core.PCA(n_components=1).fit(np.eye(3))
+    timings["pca"] = perf_counter() - start
+
+    start = perf_counter()
+    executar_finscore(
+        core.synthetic_valid_data(),
+        executar_simulacoes=numero_simulacoes > 0,
+        numero_simulacoes=max(numero_simulacoes, 100),
+    )
+    timings["pontuacao"] = perf_counter() - start
+    return timings
@@ -0,0 +1,97 @@
+"""Impressão digital de DataFrames usada como chave de cache do motor.
+
+``dataframe_sha256`` produz exatamente o mesmo hash de
+``core.dataframe_sha256`` (gravado nas exportações como
+``hash_dados_reportados``/``hash_dados_utilizados``), mas percorre as colunas em
+ordem alfabética diretamente sobre os arrays do DataFrame, sem ``copy`` nem
+``reindex``. O resultado fica memorizado por objeto enquanto a estrutura do
+DataFrame não muda.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas.core.util.hashing import combine_hash_arrays
+
+
+_MEMO: dict[int, tuple[weakref.ref, tuple[Any, ...], str]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def _assinatura(df: pd.DataFrame) -> tuple[Any, ...]:
+    """Identifica a versão estrutural do objeto: forma, rótulos, tipos e buffers.
+
+    Atribuições que trocam uma coluna, o índice ou os blocos internos mudam a
+    assinatura. Escrita in-place nos mesmos buffers não é detectável a baixo
+    custo; nesse caso use ``usar_cache=False``.
+    """
+    return (
+        df.shape,
+        tuple(df.columns),
+        tuple(str(dtype) for dtype in df.dtypes),
+        id(df.index),
+        tuple(id(block.values) for block in df._mgr.blocks),
+    )
+
+
+def _calcular(df: pd.DataFrame) -> str:
+    columns = sorted(df.columns)
+    # ``items`` devolve visões das colunas; a ordem alfabética reproduz o
+    # ``reindex`` de ``core.dataframe_sha256`` sem materializar outro DataFrame.
+    by_name = dict(df.items())
+    arrays = (
+        pd.util.hash_array(by_name[column]._values, categorize=True)
+        for column in columns
+    )
+    index_hash = pd.util.hash_pandas_object(df.index, index=False, categorize=True)._values
+    combined = combine_hash_arrays(
+        (array for chunk in (arrays, (index_hash,)) for array in chunk),
+        len(columns) + 1,
+    )
+    payload = np.asarray(combined, dtype=np.uint64).tobytes()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def dataframe_sha256(df: pd.DataFrame, *, usar_cache: bool = True) -> str:
+    """SHA-256 compatível com ``core.dataframe_sha256``, sem cópia do DataFrame."""
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("dataframe_sha256 espera um DataFrame.")
+    if df.columns.has_duplicates:
+        # ``reindex`` do cálculo original rejeita rótulos duplicados; mantemos o erro.
+        from . import core
+
+        return core.dataframe_sha256(df)
+    if not usar_cache:
+        return _calcular(df)
+
+    key = id(df)
+    signature = _assinatura(df)
+    with _MEMO_LOCK:
+        entry = _MEMO.get(key)
+    if entry is not None and entry[0]() is df and entry[1] == signature:
+        return entry[2]
+
+    digest = _calcular(df)
+    reference = weakref.ref(df, lambda _ref, key=key: _descartar(key, _ref))
+    with _MEMO_LOCK:
+        _MEMO[key] = (reference, signature, digest)
+    return digest
+
+
+def _descartar(key: int, reference: weakref.ref) -> None:
+    with _MEMO_LOCK:
+        entry = _MEMO.get(key)
+        if entry is not None and entry[0] is reference:
+            del _MEMO[key]
+
+
+def limpar_cache_hashes() -> None:
+    """Esquece os hashes memorizados (útil em testes e após mutações in-place)."""
+    with _MEMO_LOCK:
+        _MEMO.clear()
@@ -0,0 +1,289 @@
+"""Serialização binária compacta de ``FinScoreOutput``.
+
+Um arquivo contém um cabeçalho fixo, um manifesto JSON e um segmento Arrow IPC
+por tabela (DataFrames do contrato, tabelas aninhadas nos diagnósticos e séries
+dos perfis PCA), cada um alinhado em 64 bytes e comprimido com zstd. Valores
+que não são tabelas (dicionários, escalares, datas, ``PCAProfile``) vão para o
+manifesto como JSON com marcação de tipo, sem ``pickle``: carregar um arquivo
+nunca executa código. Colunas ``object`` com tipos mistos, que o Arrow não
+representa, também são gravadas no manifesto.
+
+O manifesto registra ``CONTRACT_VERSION``; arquivos de outro contrato são
+recusados e toda carga passa por ``validar_contrato``. A leitura de arquivos
+usa ``memory_map``: cada segmento é uma fatia do mapeamento, sem copiar o
+arquivo para a memória. Objetos compartilhados (``df_simulacoes`` é o mesmo
+DataFrame de ``df_simulacoes_independentes``) são gravados uma única vez.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import struct
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from . import core
+from .contracts import CONTRACT_VERSION, ContractError, FinScoreOutput, validar_contrato
+
+
+MAGIC = b"FSPUDIM\x00"
+FORMATO_VERSAO = 1
+COMPRESSOES = ("zstd", "lz4", None)
+_CABECALHO = struct.Struct("<8sHQ")  # magic, versão do formato, tamanho do manifesto
+_ALINHAMENTO = 64
+_TIPO = "__tipo__"
+_DATACLASSES = {"PCAProfile": core.PCAProfile}
+
+
+class _Escritor:
+    """Acumula segmentos Arrow enquanto codifica os valores em JSON."""
+
+    def __init__(self, compressao: str | None) -> None:
+        self.options = pa.ipc.IpcWriteOptions(compression=compressao)
+        self.segments: list[bytes] = []
+        self.tables: list[dict[str, Any]] = []
+        self.seen: dict[int, int] = {}
+        # Mantém vivos os objetos cujo ``id`` está em ``seen``.
+        self._alive: list[Any] = []
+
+    def tabela(self, frame: pd.DataFrame) -> int:
+        known = self.seen.get(id(frame))
+        if known is not None:
+            return known
+        if not all(isinstance(column, str) for column in frame.columns):
+            raise TypeError("Só DataFrames com rótulos de coluna str são serializáveis.")
+        if frame.columns.has_duplicates:
+            raise TypeError("DataFrames com colunas duplicadas não são serializáveis.")
+        json_columns = {
+            column: [self.valor(item) for item in frame[column].tolist()]
+            for column in frame.columns
+            if frame[column].dtype == object and not _arrow_aceita(frame[column])
+        }
+        table = pa.Table.from_pandas(frame.drop(columns=list(json_columns)), preserve_index=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema, options=self.options) as writer:
+            writer.write_table(table)
+        self.segments.append(sink.getvalue().to_pybytes())
+        self.tables.append({"colunas": list(frame.columns), "colunas_json": json_columns})
+        self.seen[id(frame)] = len(self.tables) - 1
+        self._alive.append(frame)
+        return len(self.tables) - 1
+
+    def valor(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, np.generic):
+            return {_TIPO: "numpy", "dtype": value.dtype.str, "valor": value.item()}
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, pd.DataFrame):
+            return {_TIPO: "tabela", "ref": self.tabela(value)}
+        if isinstance(value, pd.Series):
+            frame = value.to_frame(name="valores")
+            return {_TIPO: "serie", "ref": self.tabela(frame), "nome": self.valor(value.name)}
+        if isinstance(value, pd.Timestamp):
+            return {_TIPO: "timestamp", "valor": value.isoformat()}
+        if isinstance(value, datetime):
+            return {_TIPO: "datetime", "valor": value.isoformat()}
+        if isinstance(value, date):
+            return {_TIPO: "date", "valor": value.isoformat()}
+        if isinstance(value, dict):
+            if all(isinstance(key, str) for key in value) and _TIPO not in value:
+                return {key: self.valor(item) for key, item in value.items()}
+            return {
+                _TIPO: "dict",
+                "itens": [[self.valor(key), self.valor(item)] for key, item in value.items()],
+            }
+        if isinstance(value, list):
+            return [self.valor(item) for item in value]
+        if isinstance(value, tuple):
+            return {_TIPO: "tupla", "itens": [self.valor(item) for item in value]}
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            return {
+                _TIPO: "ndarray",
+                "dtype": value.dtype.str,
+                "forma": list(value.shape),
+                "valores": value.ravel().tolist(),
+            }
+        name = type(value).__qualname__
+        if dataclasses.is_dataclass(value) and _mesma_dataclass(type(value), _DATACLASSES.get(name)):
+            return {
+                _TIPO: "dataclass",
+                "classe": name,
+                "campos": {
+                    field.name: self.valor(getattr(value, field.name))
+                    for field in dataclasses.fields(value)
+                },
+            }
+        raise TypeError(f"Valor do tipo {name} não é serializável.")
+
+
+def _mesma_dataclass(kind: type, registered: type | None) -> bool:
+    # O pacote pode estar carregado duas vezes (``finscore_v2`` e
+    # ``app_front.finscore_v2``); a classe vale pelo nome e pelos campos.
+    if registered is None:
+        return False
+    if kind is registered:
+        return True
+    return [field.name for field in dataclasses.fields(kind)] == [
+        field.name for field in dataclasses.fields(registered)
+    ]
+
+
+def _arrow_aceita(series: pd.Series) -> bool:
+    """Indica se a coluna ``object`` volta do Arrow sem perda."""
+    try:
+        array = pa.Array.from_pandas(series)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    if array.null_count == 0:
+        return True
+    # O Arrow devolve nulos de colunas não numéricas como ``None``; um ``NaN``
+    # misturado a textos ou booleanos não sobreviveria à ida e volta.
+    return not any(isinstance(item, float) for item in series.tolist())
+
+
+def _alinhar(offset: int) -> int:
+    return -offset % _ALINHAMENTO
+
+
+def serializar_saida(saida: FinScoreOutput | dict[str, Any], *, compressao: str | None = "zstd") -> bytes:
+    """Serializa uma saída do motor; ``compressao=None`` permite leitura sem cópia."""
+    if compressao not in COMPRESSOES:
+        raise ValueError(f"compressao deve ser uma de {COMPRESSOES}.")
+    writer = _Escritor(compressao)
+    values = {key: writer.valor(value) for key, value in saida.items()}
+
+    offset = 0
+    positions = []
+    for segment in writer.segments:
+        offset += _alinhar(offset)
+        positions.append({"offset": offset, "tamanho": len(segment)})
+        offset += len(segment)
+    manifest = json.dumps(
+        {
+            "formato_versao": FORMATO_VERSAO,
+            "contrato_versao": saida.get("contrato_versao", CONTRACT_VERSION),
+            "compressao": compressao,
+            "valores": values,
+            "tabelas": [
+                {**table, **position} for table, position in zip(writer.tables, positions)
+            ],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    header = _CABECALHO.pack(MAGIC, FORMATO_VERSAO, len(manifest))
+    start = len(header) + len(manifest)
+    parts = [header, manifest, b"\x00" * _alinhar(start)]
+    cursor = 0
+    for segment, position in zip(writer.segments, positions):
+        parts.append(b"\x00" * (position["offset"] - cursor))
+        parts.append(segment)
+        cursor = position["offset"] + len(segment)
+    return b"".join(parts)
+
+
+class _Leitor:
+    def __init__(self, buffer: pa.Buffer, manifest: dict[str, Any], base: int) -> None:
+        self.buffer = buffer
+        self.manifest = manifest
+        self.base = base
+        self.cache: dict[int, pd.DataFrame] = {}
+
+    def tabela(self, ref: int) -> pd.DataFrame:
+        cached = self.cache.get(ref)
+        if cached is not None:
+            return cached
+        entry = self.manifest["tabelas"][ref]
+        segment = self.buffer.slice(self.base + entry["offset"], entry["tamanho"])
+        frame = pa.ipc.open_file(segment).read_all().to_pandas()
+        for column, values in entry["colunas_json"].items():
+            frame[column] = pd.Series(
+                [self.valor(item) for item in values], index=frame.index, dtype=object
+            )
+        frame = frame[entry["colunas"]] if entry["colunas_json"] else frame
+        self.cache[ref] = frame
+        return frame
+
+    def valor(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.valor(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        kind = value.get(_TIPO)
+        if kind is None:
+            return {key: self.valor(item) for key, item in value.items()}
+        if kind == "numpy":
+            return np.dtype(value["dtype"]).type(value["valor"])
+        if kind == "tabela":
+            return self.tabela(value["ref"])
+        if kind == "serie":
+            return self.tabela(value["ref"])["valores"].rename(self.valor(value["nome"]))
+        if kind == "timestamp":
+            return pd.Timestamp(value["valor"])
+        if kind == "datetime":
+            return datetime.fromisoformat(value["valor"])
+        if kind == "date":
+            return date.fromisoformat(value["valor"])
+        if kind == "dict":
+            return {self.valor(key): self.valor(item) for key, item in value["itens"]}
+        if kind == "tupla":
+            return tuple(self.valor(item) for item in value["itens"])
+        if kind == "ndarray":
+            return np.asarray(value["valores"], dtype=value["dtype"]).reshape(value["forma"])
+        if kind == "dataclass" and value["classe"] in _DATACLASSES:
+            fields = {key: self.valor(item) for key, item in value["campos"].items()}
+            return _DATACLASSES[value["classe"]](**fields)
+        raise ContractError(f"Tipo serializado desconhecido: {kind!r}.")
+
+
+def desserializar_saida(dados: bytes | pa.Buffer, *, validar: bool = True) -> FinScoreOutput:
+    """Reconstrói uma saída a partir de ``serializar_saida``."""
+    buffer = dados if isinstance(dados, pa.Buffer) else pa.py_buffer(dados)
+    if buffer.size < _CABECALHO.size:
+        raise ContractError("Arquivo FinScore truncado.")
+    magic, version, manifest_size = _CABECALHO.unpack(buffer.slice(0, _CABECALHO.size).to_pybytes())
+    if magic != MAGIC:
+        raise ContractError("Arquivo não está no formato binário FinScore.")
+    if version != FORMATO_VERSAO:
+        raise ContractError(
+            f"Versão de formato {version} não suportada (esperada {FORMATO_VERSAO})."
+        )
+    start = _CABECALHO.size
+    manifest = json.loads(buffer.slice(start, manifest_size).to_pybytes())
+    if manifest.get("contrato_versao") != CONTRACT_VERSION:
+        raise ContractError(
+            "contrato_versao incompatível: "
+            f"esperado {CONTRACT_VERSION!r}, recebido {manifest.get('contrato_versao')!r}"
+        )
+    base = start + manifest_size
+    base += _alinhar(base)
+    reader = _Leitor(buffer, manifest, base)
+    output = {key: reader.valor(value) for key, value in manifest["valores"].items()}
+    return validar_contrato(output) if validar else output
+
+
+def gravar_saida(
+    saida: FinScoreOutput | dict[str, Any],
+    caminho: Path | str,
+    *,
+    compressao: str | None = "zstd",
+) -> int:
+    """Grava a saída em ``caminho`` e retorna o tamanho em bytes."""
+    payload = serializar_saida(saida, compressao=compressao)
+    Path(caminho).write_bytes(payload)
+    return len(payload)
+
+
+def carregar_saida(caminho: Path | str, *, validar: bool = True) -> FinScoreOutput:
+    """Carrega uma saída gravada por ``gravar_saida`` via mapeamento em memória."""
+    with pa.memory_map(str(caminho), "r") as source:
+        return desserializar_saida(source.read_buffer(), validar=validar)
@@ -0,0 +1,190 @@
+"""
+Geração de pareceres em PDF para uma carteira inteira, sem Streamlit.
+
+``render_pareceres_batch`` recebe pares (conteúdo, meta), monta o HTML em um
+pool de processos e imprime os PDFs: com o Playwright, pelo ``BrowserPool``
+compartilhado do processo (várias páginas ao mesmo tempo); com o xhtml2pdf,
+no próprio processo que montou o HTML. Uma falha afeta só o seu parecer: ela
+é registrada no relatório e o lote continua. Pareceres já presentes no cache
+de ``gerar_pdf_parecer`` são gravados sem renderizar.
+"""
+
+import json
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from . import export_pdf
+
+
+REPORT_NAME = "relatorio_lote.json"
+
+ProgressCallback = Callable[[int, int, Dict], None]
+
+
+def _render_item(conteudo: str, meta: Dict, is_markdown: bool, engine: str) -> Tuple[str, bytes]:
+    """
+    Executado nos processos do lote: monta o HTML e, no xhtml2pdf, já imprime.
+
+    Returns:
+        ('html', bytes do HTML) para o Playwright ou ('pdf', bytes do PDF)
+    """
+    html = export_pdf.render_parecer_html(conteudo, meta, is_markdown, engine=engine)
+    if engine == 'playwright':
+        return 'html', html.encode('utf-8')
+    return 'pdf', export_pdf.html_to_pdf_bytes(html, engine=engine)
+
+
+def _print_playwright(html: str) -> Tuple[str, bytes]:
+    """Executado nas threads de impressão: usa o ``BrowserPool`` compartilhado."""
+    return 'pdf', export_pdf.html_to_pdf_bytes(html, engine='playwright')
+
+
+def _unique_filename(meta: Dict, used: set) -> str:
+    name = export_pdf.pdf_filename(meta)
+    stem, counter = name[:-4], 2
+    while name.lower() in used:
+        name = f"{stem}_{counter}.pdf"
+        counter += 1
+    used.add(name.lower())
+    return name
+
+
+def _error_text(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def render_pareceres_batch(
+    items: Iterable[Union[Tuple[str, Dict], Tuple[str, Dict, bool]]],
+    output_dir: Union[Path, str],
+    engine: Optional[str] = None,
+    processes: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    use_cache: bool = True,
+) -> List[Dict]:
+    """
+    Gera um PDF por parecer em ``output_dir`` e grava ``relatorio_lote.json``.
+
+    Args:
+        items: Pares (conteúdo, meta) ou triplas (conteúdo, meta, is_markdown)
+        output_dir: Pasta de saída (criada se não existir)
+        engine: 'playwright', 'xhtml2pdf' ou None (usa DEFAULT_ENGINE)
+        processes: Processos que montam o HTML; None usa um por CPU e 1
+            executa tudo no processo atual
+        progress: Chamado após cada parecer com (concluídos, total, resultado)
+        use_cache: Se True, consulta e alimenta o cache de pareceres
+
+    Returns:
+        Um resultado por item, na ordem de entrada: índice, empresa, arquivo,
+        status ('OK' ou 'FALHOU'), origem ('cache' ou 'renderizado'), bytes e erro
+
+    Raises:
+        ValueError: Se o engine não estiver disponível
+    """
+    engine = engine or export_pdf.DEFAULT_ENGINE
+    available = export_pdf.get_available_engines()
+    if engine not in available:
+        raise ValueError(
+            f"Engine '{engine}' não disponível. "
+            f"Engines disponíveis: {available}."
+        )
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    entries = [(item[0], item[1], item[2] if len(item) > 2 else True) for item in items]
+    total = len(entries)
+    used: set = set()
+    results: List[Dict] = [
+        {
+            "indice": index,
+            "empresa": meta.get("empresa") if isinstance(meta, dict) else None,
+            "arquivo": _unique_filename(meta if isinstance(meta, dict) else {}, used),
+            "status": None,
+            "origem": None,
+            "bytes": 0,
+            "erro": None,
+        }
+        for index, (_, meta, _) in enumerate(entries)
+    ]
+    cache = export_pdf.get_parecer_cache() if use_cache else None
+    keys: Dict[int, str] = {}
+    done = 0
+
+    def finish(index: int, pdf_bytes: Optional[bytes] = None, error: Optional[BaseException] = None, origin: str = "renderizado") -> None:
+        nonlocal done
+        result = results[index]
+        if error is None:
+            try:
+                (output_dir / result["arquivo"]).write_bytes(pdf_bytes)
+            except OSError as write_error:
+                error = write_error
+        if error is None:
+            result.update(status="OK", origem=origin, bytes=len(pdf_bytes))
+            if cache is not None and origin == "renderizado":
+                cache.put("pdf", keys[index], pdf_bytes)
+        else:
+            result.update(status="FALHOU", arquivo=None, erro=_error_text(error))
+        done += 1
+        if progress is not None:
+            progress(done, total, dict(result))
+
+    pending: Dict = {}
+    if processes == 1:
+        renderer: Executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finscore-lote")
+    else:
+        renderer = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    printer: Optional[ThreadPoolExecutor] = None
+    if engine == 'playwright':
+        pool = export_pdf.get_browser_pool()
+        printer = ThreadPoolExecutor(max_workers=pool.max_pages, thread_name_prefix="finscore-lote-pdf")
+    try:
+        for index, (conteudo, meta, is_markdown) in enumerate(entries):
+            try:
+                if cache is not None:
+                    keys[index] = export_pdf.parecer_cache_key(conteudo, meta, is_markdown, engine)
+                    cached = cache.get("pdf", keys[index])
+                    if cached is not None:
+                        finish(index, cached, origin="cache")
+                        continue
+                future = renderer.submit(_render_item, conteudo, meta, is_markdown, engine)
+            except Exception as error:
+                finish(index, error=error)
+                continue
+            pending[future] = index
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    finish(index, error=error)
+                    continue
+                kind, payload = future.result()
+                if kind == 'pdf':
+                    finish(index, payload)
+                else:
+                    pending[printer.submit(_print_playwright, payload.decode('utf-8'))] = index
+    finally:
+        renderer.shutdown(wait=True, cancel_futures=True)
+        if printer is not None:
+            printer.shutdown(wait=True, cancel_futures=True)
+
+    report = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "engine": engine,
+        "total": total,
+        "ok": sum(result["status"] == "OK" for result in results),
+        "falhas": sum(result["status"] == "FALHOU" for result in results),
+        "segundos": round(time.perf_counter() - started, 2),
+        "itens": results,
+    }
+    (output_dir / REPORT_NAME).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return results
@@ -0,0 +1,210 @@
+"""
+Pool persistente do Chromium (Playwright) para gerar PDFs.
+
+Abrir o Chromium leva de 0,5 s a 2 s e dominava o tempo de cada parecer. O
+``BrowserPool`` mantém um navegador e um contexto vivos em uma thread própria,
+com seu event loop; ``render`` pode ser chamado de qualquer thread e espera
+o PDF dessa thread. No máximo ``max_pages`` páginas existem ao mesmo tempo;
+páginas ociosas são reaproveitadas. Se o navegador cair, ele é reaberto e a
+renderização interrompida é repetida uma vez.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class BrowserPool:
+    """
+    Navegador Chromium compartilhado, servido por um event loop dedicado.
+
+    Args:
+        max_pages: Número máximo de páginas renderizando ao mesmo tempo
+        launch_options: Opções de ``chromium.launch`` (padrão: headless)
+    """
+
+    def __init__(self, max_pages: int = 4, launch_options: Optional[Dict[str, Any]] = None):
+        if max_pages < 1:
+            raise ValueError("max_pages deve ser ao menos 1.")
+        self.max_pages = max_pages
+        self.launch_options = launch_options or {"headless": True}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Estado abaixo só é tocado dentro do event loop do pool.
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[Any] = []
+        self._open_pages = 0
+        self._stats = {"launches": 0, "renders": 0, "retries": 0, "peak_pages": 0}
+
+    def start(self) -> "BrowserPool":
+        """
+        Inicia a thread do pool e abre o navegador, se ainda não estiverem ativos.
+
+        Returns:
+            O próprio pool
+        """
+        self._submit(self._ensure_browser())
+        return self
+
+    def render(self, html: str, pdf_options: Dict[str, Any], timeout: Optional[float] = 120) -> bytes:
+        """
+        Renderiza ``html`` em PDF com ``page.pdf(**pdf_options)``.
+
+        Args:
+            html: HTML completo para renderizar
+            pdf_options: Argumentos de ``page.pdf`` (formato, margens, cabeçalho...)
+            timeout: Segundos de espera pelo PDF, incluindo a fila de páginas
+
+        Returns:
+            Bytes do PDF gerado
+        """
+        return self._submit(self._render(html, pdf_options), timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aberturas do navegador, renderizações, repetições e pico de páginas."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self, timeout: float = 30) -> None:
+        """
+        Fecha páginas, contexto e navegador e encerra a thread do pool.
+
+        Chamadas posteriores a ``render`` levantam ``RuntimeError``.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+
+    # -- Thread e event loop -------------------------------------------------
+
+    def _submit(self, coroutine, timeout: Optional[float] = None):
+        with self._lock:
+            if self._closed:
+                coroutine.close()
+                raise RuntimeError("O pool de navegadores foi encerrado.")
+            if self._thread is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    name="finscore-playwright",
+                    daemon=True,
+                )
+                self._thread.start()
+            loop = self._loop
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Tempo esgotado ou interrupção: não deixa a página presa no loop.
+            future.cancel()
+            raise
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._browser_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.max_pages)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    # -- Corrotinas (executadas na thread do pool) ---------------------------
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._context
+            await self._discard_browser()
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+            browser = await self._playwright.chromium.launch(**self.launch_options)
+            browser.on("disconnected", self._on_disconnected)
+            self._browser = browser
+            self._context = await browser.new_context()
+            with self._lock:
+                self._stats["launches"] += 1
+            return self._context
+
+    def _on_disconnected(self, browser) -> None:
+        if browser is self._browser:
+            self._browser = None
+            self._context = None
+            self._idle.clear()
+
+    async def _discard_browser(self) -> None:
+        browser, self._browser, self._context = self._browser, None, None
+        self._idle.clear()
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    async def _acquire_page(self):
+        while self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                return page
+        context = await self._ensure_browser()
+        return await context.new_page()
+
+    async def _render(self, html: str, pdf_options: Dict[str, Any]) -> bytes:
+        async with self._slots:
+            self._open_pages += 1
+            with self._lock:
+                self._stats["peak_pages"] = max(self._stats["peak_pages"], self._open_pages)
+            try:
+                for attempt in range(2):
+                    page = await self._acquire_page()
+                    try:
+                        await page.set_content(html, wait_until="networkidle")
+                        pdf_bytes = await page.pdf(**pdf_options)
+                    except Exception:
+                        crashed = self._browser is None or not self._browser.is_connected()
+                        await self._close_page(page)
+                        if crashed and attempt == 0:
+                            # Navegador caiu no meio da renderização: reabre e repete.
+                            with self._lock:
+                                self._stats["retries"] += 1
+                            continue
+                        raise
+                    except BaseException:
+                        # Cancelada (tempo esgotado em ``render``): a página pode
+                        # estar no meio da carga e não volta para as ociosas.
+                        await self._close_page(page)
+                        raise
+                    self._idle.append(page)
+                    with self._lock:
+                        self._stats["renders"] += 1
+                    return pdf_bytes
+            finally:
+                self._open_pages -= 1
+
+    async def _close_page(self, page) -> None:
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _shutdown(self) -> None:
+        await self._discard_browser()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -8,16 +8,23 @@ Suporta dois engines:
 A escolha do engine é automática baseada na plataforma ou pode ser forçada.
 """
 
+import atexit
 import os
 import sys
 import platform
-import asyncio
 import base64
-from datetime import datetime
+import re
+import hashlib
+import json
+import threading
+import importlib.util
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional, Literal
 from string import Template
 import markdown_it
+from markdown_it.common.normalize_url import validateLink as _validate_link
 from io import BytesIO
 
 # Detectar plataforma
@@ -25,18 +32,10 @@ IS_WINDOWS = platform.system() == 'Windows'
 IS_LINUX = platform.system() == 'Linux'
 IS_MAC = platform.system() == 'Darwin'
 
-# Tentar importar ambos os engines
-try:
-    from xhtml2pdf import pisa
-    XHTML2PDF_AVAILABLE = True
-except ImportError:
-    XHTML2PDF_AVAILABLE = False
-
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+# Verificar os engines sem importá-los: xhtml2pdf (ReportLab) e Playwright
+# custam centenas de ms e só são carregados ao gerar o primeiro PDF.
+XHTML2PDF_AVAILABLE = importlib.util.find_spec("xhtml2pdf") is not None
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
 
 # Engine padrão baseado na plataforma
 if IS_WINDOWS:
@@ -52,6 +51,23 @@ NEUTRAL_LIGHT = "#f5f6fa"
 BODY_FONT = "'Source Sans 3', 'Helvetica Neue', Arial, sans-serif"
 TITLE_FONT = "'Source Serif 4', 'Libre Baskerville', serif"
 
+# Pool de Chromium criado no primeiro PDF do Playwright (``get_browser_pool``).
+_BROWSER_POOL = None
+_BROWSER_POOL_LOCK = threading.Lock()
+
+# Campos de ``meta`` lidos por ``render_parecer_html``: só eles entram na
+# chave do cache de pareceres.
+PARECER_META_KEYS = (
+    "empresa", "cnpj", "data_analise", "finscore_ajustado", "finscore",
+    "classificacao_finscore", "classificacao_fs", "serasa_score", "serasa",
+    "classificacao_serasa", "classificacao_ser", "decisao", "serasa_data",
+    "cidade_relatorio", "ano_inicial", "ano_final",
+)
+_LOGO_PATH = Path(__file__).resolve().parents[1] / "assets" / "logo_assertif_cab.png"
+_TEMPLATE_VERSION: Optional[str] = None
+_PARECER_CACHE = None
+_PARECER_CACHE_LOCK = threading.Lock()
+
 
 def get_available_engines() -> list:
     """
@@ -96,14 +112,36 @@ def _convert_markdown_to_html(markdown_text: str) -> str:
     Returns:
         HTML renderizado
     """
+    return _markdown_parser().render(markdown_text)
+
+
+@lru_cache(maxsize=1)
+def _markdown_parser() -> "markdown_it.MarkdownIt":
+    """Parser markdown-it do parecer, criado uma vez (as regras são compiladas na criação)."""
     md = (
         markdown_it
         .MarkdownIt("commonmark")
         .enable(["table", "strikethrough"])
     )
-    return md.render(markdown_text)
+    # O minichart pode vir em SVG; dentro de <img> ele não executa scripts, mas
+    # num link abriria o documento. A regra do núcleo tira o href desses links.
+    md.validateLink = lambda url: _validate_link(url) or _svg_data_uri(url)
+    md.core.ruler.push("svg_somente_em_imagens", _remover_links_svg)
+    return md
+
+
+def _svg_data_uri(url: str) -> bool:
+    return url.strip().lower().startswith("data:image/svg+xml;")
+
+
+def _remover_links_svg(state) -> None:
+    for token in state.tokens:
+        for child in token.children or ():
+            if child.type == "link_open" and _svg_data_uri(str(child.attrGet("href") or "")):
+                del child.attrs["href"]
 
 
+@lru_cache(maxsize=None)
 def _get_css_for_engine(engine: str) -> str:
     """
     Retorna CSS específico para o engine escolhido.
@@ -158,6 +196,7 @@ def _get_css_for_engine(engine: str) -> str:
         )
 
 
+@lru_cache(maxsize=None)
 def _get_fonts_for_engine(engine: str) -> str:
     """
     Retorna tags de fontes para o engine escolhido.
@@ -191,6 +230,11 @@ def _get_font_families_for_engine(engine: str) -> Dict[str, str]:
     Returns:
         Dicionário com serif, sans, mono
     """
+    return dict(_font_families(engine))
+
+
+@lru_cache(maxsize=None)
+def _font_families(engine: str) -> Dict[str, str]:
     if engine == 'playwright':
         return {
             'serif': "'Source Serif 4', 'Times New Roman', serif",
@@ -205,110 +249,15 @@ def _get_font_families_for_engine(engine: str) -> Dict[str, str]:
         }
 
 
-def render_parecer_html(conteudo: str, meta: Dict, is_markdown: bool = True, engine: str = 'xhtml2pdf') -> str:
+@lru_cache(maxsize=1)
+def _logo_html() -> tuple[str, str]:
     """
-    Renderiza o conteúdo do parecer em HTML completo com estilos de impressão.
+    Logo da Assertif embutido em base64, para a capa e para o cabeçalho.
     
-    Args:
-        conteudo: Corpo do parecer (Markdown ou HTML)
-        meta: Dicionário com metadados (empresa, cnpj, data_analise, etc.)
-        is_markdown: Se True, converte de Markdown para HTML
-        engine: 'playwright' ou 'xhtml2pdf'
-        
     Returns:
-        HTML completo pronto para impressão
+        Tupla (logo da capa, logo do cabeçalho)
     """
-    def _format_score(value) -> str:
-        try:
-            number = float(value)
-        except (TypeError, ValueError):
-            return "N/A"
-        if number.is_integer():
-            return f"{number:,.0f}".replace(",", ".")
-        return f"{number:,.1f}".replace(",", ".")
-
-    def _format_periodo(meta_dict: Dict) -> tuple[str, str, str]:
-        def _safe_int(value):
-            try:
-                return int(str(value).strip())
-            except (TypeError, ValueError, AttributeError):
-                return None
-
-        ano_inicial_meta = _safe_int(meta_dict.get("ano_inicial"))
-        ano_final_meta = _safe_int(meta_dict.get("ano_final"))
-
-        periodo_resumo = "Período não informado"
-        ano_inicial_texto = "Ano inicial não informado"
-        ano_final_texto = "Ano final não informado"
-
-        if ano_inicial_meta and ano_final_meta:
-            ano_inicial_texto = str(ano_inicial_meta)
-            ano_final_texto = str(ano_final_meta)
-            if ano_inicial_meta == ano_final_meta:
-                periodo_resumo = str(ano_inicial_meta)
-            elif ano_final_meta > ano_inicial_meta:
-                periodo_resumo = f"{ano_inicial_meta}–{ano_final_meta}"
-            else:
-                periodo_resumo = f"{ano_inicial_meta}, {ano_final_meta}"
-        elif ano_inicial_meta:
-            ano_inicial_texto = str(ano_inicial_meta)
-            ano_final_texto = "Ano final não informado"
-            periodo_resumo = str(ano_inicial_meta)
-        elif ano_final_meta:
-            ano_final_texto = str(ano_final_meta)
-            ano_inicial_texto = "Ano inicial não informado"
-            periodo_resumo = str(ano_final_meta)
-
-        return periodo_resumo, ano_inicial_texto, ano_final_texto
-
-    # Converter Markdown para HTML se necessário
-    if is_markdown:
-        conteudo_html = _convert_markdown_to_html(conteudo)
-    else:
-        conteudo_html = conteudo
-    
-    # Extrair dados do meta
-    empresa = meta.get("empresa", "N/A")
-    cnpj = meta.get("cnpj", "N/A")
-    data_analise = meta.get("data_analise", datetime.now().strftime("%d/%m/%Y"))
-    finscore = meta.get("finscore_ajustado", "N/A")
-    classificacao_fs = meta.get("classificacao_finscore", meta.get("classificacao_fs", "N/A"))
-    serasa = meta.get("serasa_score", "N/A")
-    classificacao_ser = meta.get("classificacao_serasa", meta.get("classificacao_ser", "N/A"))
-    decisao = meta.get("decisao", "N/A")
-    
-    # Formatar decisão (com ícones conforme solicitado)
-    decisao_map = {
-        "aprovar": "APROVAR",
-        "aprovar_com_ressalvas": "APROVAR COM RESSALVAS",
-        "nao_aprovar": "NÃO APROVAR"
-    }
-    # Mapa com ícones para exibição no cabeçalho/PDF
-    decisao_icon_map = {
-        "aprovar": "✅ APROVAR",
-        "aprovar_com_ressalvas": "⚠️ APROVAR COM RESSALVAS",
-        "nao_aprovar": "❌ NÃO APROVAR",
-    }
-    decisao_texto = decisao_icon_map.get(decisao, decisao_map.get(decisao, decisao.upper()))
-    
-    # Data por extenso
-    meses = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
-             "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
-    hoje = datetime.now()
-    data_extenso = f"{hoje.day} de {meses[hoje.month-1]} de {hoje.year}"
-    data_relatorio = meta.get("data_analise") or data_extenso
-    serasa_data_texto = str(meta.get("serasa_data") or "Consulta não informada")
-    cidade_relatorio = meta.get("cidade_relatorio", "São Paulo (SP)")
-    periodo_texto, ano_inicial_texto, ano_final_texto = _format_periodo(meta)
-    finscore_display = _format_score(meta.get("finscore_ajustado") or meta.get("finscore"))
-    serasa_display = _format_score(meta.get("serasa_score") or meta.get("serasa"))
-    
-    # Obter configurações específicas do engine
-    page_css = _get_css_for_engine(engine)
-    fonts_html = _get_fonts_for_engine(engine)
-    font_families = _get_font_families_for_engine(engine)
-
-    logo_path = Path(__file__).resolve().parents[1] / "assets" / "logo_assertif_cab.png"
+    logo_path = _LOGO_PATH
     if logo_path.exists():
         try:
             logo_b64 = base64.b64encode(logo_path.read_bytes()).decode("utf-8")
@@ -320,11 +269,40 @@ def render_parecer_html(conteudo: str, meta: Dict, is_markdown: bool = True, eng
     else:
         logo_html = "<strong>Assertif</strong>"
         header_logo_html = "<strong>Assertif</strong>"
+    return logo_html, header_logo_html
+
+
+@lru_cache(maxsize=None)
+def _compiled_parecer_template(engine: str) -> Template:
+    """
+    Template do parecer com CSS, fontes, cores e logos do engine já aplicados.
+    
+    Compilado uma vez por engine; restam só os campos do parecer (empresa,
+    scores, datas e corpo), preenchidos em ``render_parecer_html``.
     
-    font_family_mono = font_families['mono']
+    Args:
+        engine: 'playwright' ou 'xhtml2pdf'
+        
+    Returns:
+        ``Template`` com os campos do parecer
+    """
+    logo_html, header_logo_html = _logo_html()
+    return Template(_PARECER_TEMPLATE.safe_substitute(
+        fonts_html=_get_fonts_for_engine(engine),
+        page_css=_get_css_for_engine(engine),
+        BODY_FONT=BODY_FONT,
+        NEUTRAL_DARK=NEUTRAL_DARK,
+        TITLE_FONT=TITLE_FONT,
+        ACCENT_PRIMARY=ACCENT_PRIMARY,
+        ACCENT_SECONDARY=ACCENT_SECONDARY,
+        font_family_mono=_get_font_families_for_engine(engine)['mono'],
+        header_logo_html=header_logo_html,
+        logo_html=logo_html,
+    ))
 
-    # Template HTML completo
-    html_template = Template("""<!DOCTYPE html>
+
+# Template HTML completo
+_PARECER_TEMPLATE = Template("""<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
@@ -863,20 +841,109 @@ def render_parecer_html(conteudo: str, meta: Dict, is_markdown: bool = True, eng
 </body>
 </html>""")
 
-    html = html_template.safe_substitute(
+
+def render_parecer_html(conteudo: str, meta: Dict, is_markdown: bool = True, engine: str = 'xhtml2pdf') -> str:
+    """
+    Renderiza o conteúdo do parecer em HTML completo com estilos de impressão.
+    
+    Args:
+        conteudo: Corpo do parecer (Markdown ou HTML)
+        meta: Dicionário com metadados (empresa, cnpj, data_analise, etc.)
+        is_markdown: Se True, converte de Markdown para HTML
+        engine: 'playwright' ou 'xhtml2pdf'
+        
+    Returns:
+        HTML completo pronto para impressão
+    """
+    def _format_score(value) -> str:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return "N/A"
+        if number.is_integer():
+            return f"{number:,.0f}".replace(",", ".")
+        return f"{number:,.1f}".replace(",", ".")
+
+    def _format_periodo(meta_dict: Dict) -> tuple[str, str, str]:
+        def _safe_int(value):
+            try:
+                return int(str(value).strip())
+            except (TypeError, ValueError, AttributeError):
+                return None
+
+        ano_inicial_meta = _safe_int(meta_dict.get("ano_inicial"))
+        ano_final_meta = _safe_int(meta_dict.get("ano_final"))
+
+        periodo_resumo = "Período não informado"
+        ano_inicial_texto = "Ano inicial não informado"
+        ano_final_texto = "Ano final não informado"
+
+        if ano_inicial_meta and ano_final_meta:
+            ano_inicial_texto = str(ano_inicial_meta)
+            ano_final_texto = str(ano_final_meta)
+            if ano_inicial_meta == ano_final_meta:
+                periodo_resumo = str(ano_inicial_meta)
+            elif ano_final_meta > ano_inicial_meta:
+                periodo_resumo = f"{ano_inicial_meta}–{ano_final_meta}"
+            else:
+                periodo_resumo = f"{ano_inicial_meta}, {ano_final_meta}"
+        elif ano_inicial_meta:
+            ano_inicial_texto = str(ano_inicial_meta)
+            ano_final_texto = "Ano final não informado"
+            periodo_resumo = str(ano_inicial_meta)
+        elif ano_final_meta:
+            ano_final_texto = str(ano_final_meta)
+            ano_inicial_texto = "Ano inicial não informado"
+            periodo_resumo = str(ano_final_meta)
+
+        return periodo_resumo, ano_inicial_texto, ano_final_texto
+
+    # Converter Markdown para HTML se necessário
+    if is_markdown:
+        conteudo_html = _convert_markdown_to_html(conteudo)
+    else:
+        conteudo_html = conteudo
+    
+    # Extrair dados do meta
+    empresa = meta.get("empresa", "N/A")
+    cnpj = meta.get("cnpj", "N/A")
+    data_analise = meta.get("data_analise", datetime.now().strftime("%d/%m/%Y"))
+    finscore = meta.get("finscore_ajustado", "N/A")
+    classificacao_fs = meta.get("classificacao_finscore", meta.get("classificacao_fs", "N/A"))
+    serasa = meta.get("serasa_score", "N/A")
+    classificacao_ser = meta.get("classificacao_serasa", meta.get("classificacao_ser", "N/A"))
+    decisao = meta.get("decisao", "N/A")
+    
+    # Formatar decisão (com ícones conforme solicitado)
+    decisao_map = {
+        "aprovar": "APROVAR",
+        "aprovar_com_ressalvas": "APROVAR COM RESSALVAS",
+        "nao_aprovar": "NÃO APROVAR"
+    }
+    # Mapa com ícones para exibição no cabeçalho/PDF
+    decisao_icon_map = {
+        "aprovar": "✅ APROVAR",
+        "aprovar_com_ressalvas": "⚠️ APROVAR COM RESSALVAS",
+        "nao_aprovar": "❌ NÃO APROVAR",
+    }
+    decisao_texto = decisao_icon_map.get(decisao, decisao_map.get(decisao, decisao.upper()))
+    
+    # Data por extenso
+    meses = ["janeiro", "fevereiro", "março", "abril", "maio", "junho",
+             "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+    hoje = datetime.now()
+    data_extenso = f"{hoje.day} de {meses[hoje.month-1]} de {hoje.year}"
+    data_relatorio = meta.get("data_analise") or data_extenso
+    serasa_data_texto = str(meta.get("serasa_data") or "Consulta não informada")
+    cidade_relatorio = meta.get("cidade_relatorio", "São Paulo (SP)")
+    periodo_texto, ano_inicial_texto, ano_final_texto = _format_periodo(meta)
+    finscore_display = _format_score(meta.get("finscore_ajustado") or meta.get("finscore"))
+    serasa_display = _format_score(meta.get("serasa_score") or meta.get("serasa"))
+    
+    html = _compiled_parecer_template(engine).safe_substitute(
         empresa=empresa,
-        fonts_html=fonts_html,
-        page_css=page_css,
-        BODY_FONT=BODY_FONT,
-        NEUTRAL_DARK=NEUTRAL_DARK,
-        TITLE_FONT=TITLE_FONT,
-        ACCENT_PRIMARY=ACCENT_PRIMARY,
-        ACCENT_SECONDARY=ACCENT_SECONDARY,
-        font_family_mono=font_family_mono,
-        header_logo_html=header_logo_html,
         cnpj=cnpj,
         data_relatorio=data_relatorio,
-        logo_html=logo_html,
         decisao_texto=decisao_texto,
         cidade_relatorio=cidade_relatorio,
         finscore_display=finscore_display,
@@ -894,53 +961,72 @@ def render_parecer_html(conteudo: str, meta: Dict, is_markdown: bool = True, eng
     return html
 
 
-async def _html_to_pdf_playwright_async(html: str, header_html: str) -> bytes:
+def _playwright_pdf_options(header_html: str) -> Dict:
     """
-    Converte HTML para PDF usando Playwright (Chromium).
-    Função assíncrona para uso em ambientes Linux/Mac.
+    Opções de ``page.pdf`` do parecer: A4, margens, cabeçalho e rodapé.
     
     Args:
-        html: HTML completo para renderizar
+        header_html: Template do cabeçalho repetido nas páginas
         
     Returns:
-        Bytes do PDF gerado
+        Dicionário de argumentos para ``page.pdf``
     """
     footer_left_text = FOOTER_BRAND
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        # Definir conteúdo HTML
-        await page.set_content(html, wait_until="networkidle")
-        
-        # Gerar PDF com alta qualidade
-        pdf_bytes = await page.pdf(
-            format="A4",
-            margin={
-                "top": "1.2cm",
-                "right": "2cm",
-                "bottom": "2.5cm",
-                "left": "2cm"
-            },
-            print_background=True,
-            display_header_footer=True,
-            header_template=header_html,
-            footer_template=f"""
+    return {
+        "format": "A4",
+        "margin": {
+            "top": "1.2cm",
+            "right": "2cm",
+            "bottom": "2.5cm",
+            "left": "2cm"
+        },
+        "print_background": True,
+        "display_header_footer": True,
+        "header_template": header_html,
+        "footer_template": f"""
                 <div style="font-size: 9pt; font-family: 'Source Sans 3', Arial, sans-serif; color: #2d3c4f; width: 100%; padding: 8px 40px; display: flex; justify-content: space-between; align-items: center; border-top: 1px solid #d4dae4; background: #ffffff;">
                     <span style="font-weight:600;">{footer_left_text}</span>
                     <span style="font-size: 8.5pt; color: #556070;">Página <span class="pageNumber"></span> de <span class="totalPages"></span></span>
                 </div>
             """
-        )
-        
-        await browser.close()
-        return pdf_bytes
+    }
+
+
+def get_browser_pool():
+    """
+    Retorna o pool de Chromium do processo, criando-o na primeira chamada.
+    
+    O navegador fica aberto entre os PDFs e é fechado na saída do processo
+    (``shutdown_browser_pool``). ``FINSCORE_PDF_PAGINAS`` limita as páginas
+    renderizando ao mesmo tempo (padrão: 4).
+    
+    Returns:
+        ``BrowserPool`` compartilhado
+    """
+    global _BROWSER_POOL
+    with _BROWSER_POOL_LOCK:
+        if _BROWSER_POOL is None:
+            from .browser_pool import BrowserPool
+
+            _BROWSER_POOL = BrowserPool(max_pages=int(os.environ.get("FINSCORE_PDF_PAGINAS", "4")))
+        return _BROWSER_POOL
+
+
+def shutdown_browser_pool() -> None:
+    """Fecha o pool de Chromium, se existir; o próximo PDF abre outro."""
+    global _BROWSER_POOL
+    with _BROWSER_POOL_LOCK:
+        pool, _BROWSER_POOL = _BROWSER_POOL, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_browser_pool)
 
 
 def _html_to_pdf_playwright(html: str, header_html: str) -> bytes:
     """
-    Wrapper síncrono para Playwright.
+    Gera o PDF no Chromium persistente de ``get_browser_pool``.
     
     Args:
         html: HTML completo para renderizar
@@ -955,14 +1041,7 @@ def _html_to_pdf_playwright(html: str, header_html: str) -> bytes:
         )
     
     try:
-        # Criar novo loop de eventos
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            pdf_bytes = loop.run_until_complete(_html_to_pdf_playwright_async(html, header_html))
-            return pdf_bytes
-        finally:
-            loop.close()
+        return get_browser_pool().render(html, _playwright_pdf_options(header_html))
     except NotImplementedError:
         # Fallback se asyncio não funcionar (Windows + Streamlit)
         raise RuntimeError(
@@ -992,6 +1071,8 @@ def _html_to_pdf_xhtml2pdf(html: str) -> bytes:
             "Instale com: pip install xhtml2pdf"
         )
     
+    from xhtml2pdf import pisa
+
     try:
         # Renderizar PDF em memória
         pdf_bytes_io = BytesIO()
@@ -1052,20 +1133,127 @@ def html_to_pdf_bytes(html: str, engine: Optional[str] = None, header_html: Opti
         raise ValueError(f"Engine desconhecido: {engine}")
 
 
+def pdf_filename(meta: Dict) -> str:
+    """
+    Nome do arquivo do parecer: ``Parecer_<empresa>_<dígitos do CNPJ>.pdf``.
+    
+    Args:
+        meta: Dicionário com metadados (empresa, cnpj)
+        
+    Returns:
+        Nome de arquivo sem separadores de pasta
+    """
+    empresa = re.sub(r"[^\w.-]+", "_", str(meta.get("empresa") or "Empresa")).strip("_.") or "Empresa"
+    cnpj = re.sub(r"\D", "", str(meta.get("cnpj") or "")) or "CNPJ"
+    return f"Parecer_{empresa}_{cnpj}.pdf"
+
+
+def template_version() -> str:
+    """
+    Versão do template: hash deste módulo (HTML, CSS, fontes e opções do PDF) e do logo.
+    
+    Returns:
+        Hash hexadecimal curto, calculado uma vez por processo
+    """
+    global _TEMPLATE_VERSION
+    if _TEMPLATE_VERSION is None:
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        if _LOGO_PATH.exists():
+            digest.update(_LOGO_PATH.read_bytes())
+        _TEMPLATE_VERSION = digest.hexdigest()[:16]
+    return _TEMPLATE_VERSION
+
+
+def parecer_cache_key(conteudo: str, meta: Dict, is_markdown: bool = True, engine: Optional[str] = None) -> str:
+    """
+    Chave de conteúdo de um parecer renderizado.
+    
+    Combina o hash do texto, os campos de ``PARECER_META_KEYS``, o engine, a
+    versão do template e a data de hoje (impressa por extenso na assinatura).
+    
+    Args:
+        conteudo: Corpo do parecer (Markdown ou HTML)
+        meta: Dicionário com metadados
+        is_markdown: Se True, o conteúdo é Markdown
+        engine: 'playwright', 'xhtml2pdf' ou None (usa DEFAULT_ENGINE)
+        
+    Returns:
+        Hash sha256 hexadecimal
+    """
+    payload = {
+        "conteudo": hashlib.sha256(conteudo.encode("utf-8")).hexdigest(),
+        "is_markdown": bool(is_markdown),
+        "meta": {key: meta.get(key) for key in PARECER_META_KEYS if key in meta},
+        "engine": engine or DEFAULT_ENGINE,
+        "template": template_version(),
+        "data": date.today().isoformat(),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def get_parecer_cache():
+    """
+    Retorna o cache de pareceres do processo, criando-o na primeira chamada.
+    
+    Com ``FINSCORE_PDF_CACHE_DIR`` definido, as entradas também são gravadas
+    nessa pasta.
+    
+    Returns:
+        ``ParecerCache`` compartilhado
+    """
+    global _PARECER_CACHE
+    with _PARECER_CACHE_LOCK:
+        if _PARECER_CACHE is None:
+            from .parecer_cache import ParecerCache
+
+            _PARECER_CACHE = ParecerCache(directory=os.environ.get("FINSCORE_PDF_CACHE_DIR") or None)
+        return _PARECER_CACHE
+
+
+def render_parecer_html_cached(conteudo: str, meta: Dict, is_markdown: bool = True, engine: str = 'xhtml2pdf') -> str:
+    """
+    ``render_parecer_html`` com o resultado guardado em ``get_parecer_cache``.
+    
+    Args:
+        conteudo: Corpo do parecer (Markdown ou HTML)
+        meta: Dicionário com metadados
+        is_markdown: Se True, converte de Markdown para HTML
+        engine: 'playwright' ou 'xhtml2pdf'
+        
+    Returns:
+        HTML completo
+    """
+    cache = get_parecer_cache()
+    key = parecer_cache_key(conteudo, meta, is_markdown, engine)
+    cached = cache.get("html", key)
+    if cached is not None:
+        return cached.decode("utf-8")
+    html = render_parecer_html(conteudo, meta, is_markdown, engine=engine)
+    cache.put("html", key, html.encode("utf-8"))
+    return html
+
+
 def gerar_pdf_parecer(
     conteudo: str, 
     meta: Dict, 
     is_markdown: bool = True, 
-    engine: Optional[str] = None
+    engine: Optional[str] = None,
+    use_cache: bool = True,
 ) -> bytes:
     """
     Função de alto nível que gera o PDF completo do parecer.
     
+    Com ``use_cache`` o PDF é reaproveitado enquanto texto, metadados, engine,
+    template e data não mudarem (``parecer_cache_key``).
+    
     Args:
         conteudo: Corpo do parecer (Markdown ou HTML)
         meta: Dicionário com metadados
         is_markdown: Se True, converte de Markdown para HTML
         engine: 'playwright', 'xhtml2pdf' ou None (auto-detecta)
+        use_cache: Se False, sempre renderiza de novo
         
     Returns:
         Bytes do PDF gerado
@@ -1078,10 +1266,15 @@ def gerar_pdf_parecer(
     if engine is None:
         engine = DEFAULT_ENGINE
     
-    # Renderizar HTML com engine apropriado
-    html = render_parecer_html(conteudo, meta, is_markdown, engine=engine)
-    
-    # Converter para PDF
-    pdf_bytes = html_to_pdf_bytes(html, engine=engine)
+    if not use_cache:
+        html = render_parecer_html(conteudo, meta, is_markdown, engine=engine)
+        return html_to_pdf_bytes(html, engine=engine)
     
+    cache = get_parecer_cache()
+    key = parecer_cache_key(conteudo, meta, is_markdown, engine)
+    pdf_bytes = cache.get("pdf", key)
+    if pdf_bytes is None:
+        html = render_parecer_html_cached(conteudo, meta, is_markdown, engine=engine)
+        pdf_bytes = html_to_pdf_bytes(html, engine=engine)
+        cache.put("pdf", key, pdf_bytes)
     return pdf_bytes
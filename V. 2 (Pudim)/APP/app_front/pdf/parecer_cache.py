@@ -0,0 +1,152 @@
+"""
+Cache de HTML e PDF renderizados de pareceres.
+
+Cada entrada é endereçada pelo conteúdo: a chave (``export_pdf.parecer_cache_key``)
+resume o texto do parecer, os campos de ``meta`` usados no template, o engine,
+a versão do template e a data impressa na assinatura. A mesma chave produz os
+mesmos bytes, então um novo download ou a reabertura do parecer não renderiza
+de novo. As entradas ficam em memória com descarte LRU e, opcionalmente, em
+uma pasta (``FINSCORE_PDF_CACHE_DIR``), que sobrevive a reinícios do app.
+Na pasta só entram chaves SHA-256 (64 hexadecimais), e o descarte só remove
+arquivos com esse nome.
+"""
+
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+
+MEMORY_ENTRIES = 32
+DISK_ENTRIES = 256
+KINDS = ("html", "pdf")
+# Arquivos que o cache grava: chave SHA-256 e o tipo. Só eles são descartados,
+# para não apagar PDFs alheios se a pasta configurada for compartilhada.
+_ARQUIVO_CACHE = re.compile(r"[0-9a-f]{64}\.(html|pdf)")
+
+
+class ParecerCache:
+    """
+    Cache LRU de renderizações, em memória e opcionalmente em disco.
+
+    Args:
+        memory_entries: Entradas mantidas em memória (a menos usada sai primeiro)
+        directory: Pasta do cache em disco; ``None`` desativa o disco
+        disk_entries: Arquivos mantidos na pasta (os menos acessados saem primeiro)
+    """
+
+    def __init__(
+        self,
+        memory_entries: int = MEMORY_ENTRIES,
+        directory: Optional[Union[Path, str]] = None,
+        disk_entries: int = DISK_ENTRIES,
+    ):
+        self.memory_entries = memory_entries
+        self.directory = Path(directory) if directory else None
+        self.disk_entries = disk_entries
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(self, kind: str, key: str) -> Optional[bytes]:
+        """
+        Bytes guardados para ``(kind, key)``, da memória ou do disco.
+
+        Args:
+            kind: 'html' ou 'pdf'
+            key: Chave do conteúdo
+
+        Returns:
+            Bytes da renderização ou None se não houver entrada
+        """
+        path = self._path(kind, key)
+        with self._lock:
+            value = self._entries.get((kind, key))
+            if value is not None:
+                self._entries.move_to_end((kind, key))
+                self._stats["hits"] += 1
+        if value is not None:
+            self._touch(path)
+            return value
+        if path is not None:
+            try:
+                value = path.read_bytes()
+            except OSError:
+                value = None
+            else:
+                self._touch(path)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(kind, key, value)
+        return value
+
+    def put(self, kind: str, key: str, value: bytes) -> None:
+        """
+        Guarda ``value`` em memória e, se configurado, em disco.
+
+        Args:
+            kind: 'html' ou 'pdf'
+            key: Chave do conteúdo
+            value: Bytes da renderização
+        """
+        with self._lock:
+            self._remember(kind, key, value)
+        path = self._path(kind, key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+            temporary.write_bytes(value)
+            os.replace(temporary, path)
+            self._prune_disk()
+        except OSError:
+            pass  # O disco é só uma camada a mais; a memória já tem a entrada.
+
+    def stats(self) -> dict:
+        """Acertos em memória e em disco, faltas e entradas em memória."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Esvazia a memória; os arquivos em disco são mantidos."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _remember(self, kind: str, key: str, value: bytes) -> None:
+        self._entries[(kind, key)] = value
+        self._entries.move_to_end((kind, key))
+        while len(self._entries) > self.memory_entries:
+            self._entries.popitem(last=False)
+
+    def _touch(self, path: Optional[Path]) -> None:
+        # A data de modificação marca o último acesso, para o descarte em disco.
+        if path is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def _path(self, kind: str, key: str) -> Optional[Path]:
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de entrada desconhecido: {kind!r}. Use {list(KINDS)}.")
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.{kind}"
+        # Outras chaves ficam só em memória: o descarte em disco não as veria.
+        return path if _ARQUIVO_CACHE.fullmatch(path.name) else None
+
+    def _prune_disk(self) -> None:
+        files = [path for path in self.directory.iterdir() if _ARQUIVO_CACHE.fullmatch(path.name)]
+        if len(files) <= self.disk_entries:
+            return
+        files.sort(key=lambda path: path.stat().st_mtime)
+        for path in files[: len(files) - self.disk_entries]:
+            path.unlink(missing_ok=True)
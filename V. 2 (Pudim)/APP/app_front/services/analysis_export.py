@@ -1,26 +1,65 @@
-"""Exportação auditável do FinScore Pudim 2.0.20."""
+"""Exportação auditável do FinScore Pudim 2.0.20.
+
+Montar e formatar as 35 abas leva alguns segundos. ``preparar_planilha_analise``
+gera a planilha uma única vez por resultado, em uma thread de fundo, e guarda
+os bytes sob ``chave_exportacao`` (hashes da saída, modelo, semente e
+metadados); ``obter_planilha_analise`` aguarda essa mesma geração.
+
+``gravar_pacote_exportacao`` grava as mesmas abas como Parquet ou CSV em um
+zip, com um ``manifesto.json`` de hashes e resumo, para sistemas que não leem
+XLSX.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections import deque
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import hashlib
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
+from itertools import chain, islice
 import json
+from pathlib import Path
 import re
+import tempfile
 import unicodedata
-from typing import Any
+import zipfile
+from typing import Any, BinaryIO, Callable, Optional
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.comments import Comment
-from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
+from pandas.api.types import is_scalar
 
 try:
-    from finscore_v2 import core, executar_autotestes
+    from finscore_v2 import core
 except ModuleNotFoundError:
-    from app_front.finscore_v2 import core, executar_autotestes
+    from app_front.finscore_v2 import core
+
+from .autotestes import obter_autotestes
+from .memoria import MemoriaLRU
+
+
+# Planilhas mantidas em memória (a mais antiga sai primeiro).
+EXPORT_CACHE_ENTRIES = 4
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finscore-exportacao")
+_FUTURES = MemoriaLRU(EXPORT_CACHE_ENTRIES)
 
+FORMATOS_PACOTE = ("parquet", "csv")
+THREADS_PACOTE = 4
+# Linhas por grupo do Parquet e por bloco do CSV.
+LINHAS_POR_BLOCO = 50_000
+# Arquivos prontos aguardam a cópia para o zip em memória até este tamanho e
+# em disco acima dele.
+_LIMITE_MEMORIA_ARQUIVO = 16 * 2**20
 
 SHEET_ORDER = [
     "resumo_modelo", "confiabilidade", "correcoes_auditoria",
@@ -35,14 +74,43 @@ SHEET_ORDER = [
     "simulacoes_correlacionadas", "resumo_simulacao", "simulacoes",
     "springate", "fleuriet_simplificado", "sensibilidade", "amplitudes",
 ]
-_AUTOTESTES_CACHE: pd.DataFrame | None = None
+# Perfis: abas fora das séries de Monte Carlo e modo padrão dessas séries.
+# ``resumo`` e ``auditoria`` atendem ao arquivamento em lote; ``completo`` é
+# a exportação do notebook.
+ABAS_RESUMO = (
+    "resumo_modelo", "configuracao", "evidencia_serasa", "score_observado",
+    "score_temporal", "contribuicoes_score", "caps_prudenciais",
+    "intervalos_incerteza", "comparacao_monte_carlo", "resumo_simulacao",
+)
+ABAS_AUDITORIA = (
+    "confiabilidade", "correcoes_auditoria", "alertas_vies_material",
+    "qualidade_dados", "rastreabilidade_contas", "contas_reportadas",
+    "contas_utilizadas", "autotestes",
+)
+MODOS_SIMULACAO = ("bruto", "sem_duplicatas", "quantis")
+QUANTIS_SIMULACAO = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+_ABAS_POR_MODO = {
+    "bruto": ("simulacoes_independentes", "simulacoes_correlacionadas", "simulacoes"),
+    "sem_duplicatas": ("simulacoes_independentes", "simulacoes_correlacionadas"),
+    "quantis": ("quantis_simulacoes",),
+}
+PERFIS_EXPORTACAO = {
+    "resumo": (ABAS_RESUMO, "quantis"),
+    "auditoria": (ABAS_RESUMO + ABAS_AUDITORIA, "quantis"),
+    "completo": (
+        tuple(name for name in SHEET_ORDER if name not in _ABAS_POR_MODO["bruto"]),
+        "bruto",
+    ),
+}
+_ORDEM_ABAS = [
+    name
+    for sheet in SHEET_ORDER
+    for name in ((sheet, "quantis_simulacoes") if sheet == "aceitos_rejeitados" else (sheet,))
+]
 
 
 def _autotestes() -> pd.DataFrame:
-    global _AUTOTESTES_CACHE
-    if _AUTOTESTES_CACHE is None:
-        _AUTOTESTES_CACHE = executar_autotestes().copy(deep=True)
-    return _AUTOTESTES_CACHE.copy(deep=True)
+    return obter_autotestes()
 
 
 def _table(output: dict[str, Any], key: str) -> pd.DataFrame:
@@ -176,120 +244,583 @@ def _configuracao(output: dict[str, Any], meta: dict[str, Any]) -> pd.DataFrame:
         ("hash_dados_utilizados", output.get("hash_dados_utilizados")),
         ("hash_regras", _hash_regras()),
     ]
+    incremental = output.get("execucao_incremental")
+    if isinstance(incremental, dict):
+        rows += [
+            ("secoes_reutilizadas", ", ".join(incremental.get("secoes_reutilizadas", []))),
+            ("secoes_recalculadas", ", ".join(incremental.get("secoes_recalculadas", []))),
+            ("hash_dados_utilizados_anterior", incremental.get("hash_dados_utilizados_anterior")),
+        ]
     return pd.DataFrame(rows, columns=["parametro", "valor"])
 
 
-def montar_abas_exportacao(output: dict[str, Any], meta: dict[str, Any] | None = None) -> dict[str, pd.DataFrame]:
-    """Monta as mesmas 35 abas e na mesma ordem do notebook 2.0.20."""
-    meta = meta or {}
-    sheets = {
-        "resumo_modelo": _resumo_modelo(output),
-        "confiabilidade": _table(output, "df_confiabilidade_componentes"),
-        "correcoes_auditoria": _table(output, "df_correcoes_auditoria"),
-        "alertas_vies_material": _table(output, "df_alertas_vies"),
-        "qualidade_dados": _table(output, "df_qualidade"),
-        "rastreabilidade_contas": _table(output, "df_rastreabilidade_contas"),
-        "contas_reportadas": _table(output, "df_contas_reportadas"),
-        "contas_utilizadas": _table(output, "df_contas_analise"),
-        "evidencia_serasa": _table(output, "df_serasa"),
-        "autotestes": _autotestes(),
-        "configuracao": _configuracao(output, meta),
+def _quantis_simulacoes(output: dict[str, Any]) -> pd.DataFrame:
+    """Resumo por abordagem e variável numérica das séries de Monte Carlo."""
+    labels = [f"p{round(q * 100):02d}" for q in QUANTIS_SIMULACAO]
+    frames = []
+    for approach, key in (
+        ("independente", "df_simulacoes_independentes"),
+        ("correlacionado", "df_simulacoes_correlacionadas"),
+    ):
+        table = output.get(key)
+        if not isinstance(table, pd.DataFrame) or table.empty:
+            continue
+        numeric = table.select_dtypes("number").drop(columns=["simulacao", "tentativa"], errors="ignore")
+        summary = numeric.quantile(list(QUANTIS_SIMULACAO)).T
+        summary.columns = labels
+        summary.insert(0, "desvio_padrao", numeric.std())
+        summary.insert(0, "media", numeric.mean())
+        summary.insert(0, "n", numeric.count())
+        summary.insert(0, "variavel", summary.index)
+        summary.insert(0, "abordagem", approach)
+        frames.append(summary.reset_index(drop=True))
+    if not frames:
+        return pd.DataFrame(columns=["abordagem", "variavel", "n", "media", "desvio_padrao", *labels])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _abas_exportacao(perfil: str, simulacoes: str | None) -> list[str]:
+    if perfil not in PERFIS_EXPORTACAO:
+        raise ValueError(f"Perfil de exportação desconhecido: {perfil!r}. Use {sorted(PERFIS_EXPORTACAO)}.")
+    names, default_mode = PERFIS_EXPORTACAO[perfil]
+    mode = simulacoes or default_mode
+    if mode not in MODOS_SIMULACAO:
+        raise ValueError(f"Modo de simulações desconhecido: {mode!r}. Use {list(MODOS_SIMULACAO)}.")
+    selected = set(names) | set(_ABAS_POR_MODO[mode])
+    return [name for name in _ORDEM_ABAS if name in selected]
+
+
+def _construtores_abas(
+    output: dict[str, Any],
+    meta: dict[str, Any],
+    perfil: str,
+    simulacoes: str | None,
+) -> dict[str, Callable[[], pd.DataFrame]]:
+    """Função que monta cada aba selecionada, na ordem da exportação."""
+    builders = {
+        "resumo_modelo": lambda: _resumo_modelo(output),
+        "confiabilidade": lambda: _table(output, "df_confiabilidade_componentes"),
+        "correcoes_auditoria": lambda: _table(output, "df_correcoes_auditoria"),
+        "alertas_vies_material": lambda: _table(output, "df_alertas_vies"),
+        "qualidade_dados": lambda: _table(output, "df_qualidade"),
+        "rastreabilidade_contas": lambda: _table(output, "df_rastreabilidade_contas"),
+        "contas_reportadas": lambda: _table(output, "df_contas_reportadas"),
+        "contas_utilizadas": lambda: _table(output, "df_contas_analise"),
+        "evidencia_serasa": lambda: _table(output, "df_serasa"),
+        "autotestes": _autotestes,
+        "configuracao": lambda: _configuracao(output, meta),
     }
     if output.get("status_qualidade", {}).get("apto_calculo", False):
-        sheets.update({
-            "score_observado": pd.DataFrame([output.get("finscore_observado", {})]),
-            "score_temporal": _table(output, "df_score_temporal"),
-            "contribuicoes_score": _table(output, "df_contribuicoes_score"),
-            "caps_prudenciais": _table(output, "df_caps_prudenciais"),
-            "intervalos_incerteza": _table(output, "df_intervalos_incerteza"),
-            "contas_derivadas": _table(output, "df_contas_derivadas"),
-            "indices_observados": _table(output, "df_indices_observados"),
-            "notas_observadas": _table(output, "df_notas_observadas"),
-            "motivos_nan": _table(output, "df_motivos_nan"),
-            "diagnostico_pca": _table(output, "df_diagnostico_pca"),
-            "pesos_pca": _table(output, "df_pesos_pca"),
-            "cargas_pca": _cargas_pca_orientadas(_table(output, "df_cargas_pca")),
-            "cenarios_deterministicos": _table(output, "df_cenarios_deterministicos"),
-            "redundancia_fp": _table(output, "df_sensibilidade_redundancia_fp"),
-            "comparacao_monte_carlo": _table(output, "df_comparacao_monte_carlo"),
-            "aceitos_rejeitados": _table(output, "df_comparacao_aceitos_rejeitados"),
-            "simulacoes_independentes": _table(output, "df_simulacoes_independentes"),
-            "simulacoes_correlacionadas": _table(output, "df_simulacoes_correlacionadas"),
-            "resumo_simulacao": _table(output, "df_resumo_simulacoes"),
-            "simulacoes": _table(output, "df_simulacoes"),
-            "springate": _table(output, "df_springate_complementar"),
-            "fleuriet_simplificado": _table(output, "df_fleuriet_complementar"),
-            "sensibilidade": _table(output, "df_sensibilidade"),
-            "amplitudes": _table(output, "df_amplitudes"),
+        builders.update({
+            "score_observado": lambda: pd.DataFrame([output.get("finscore_observado", {})]),
+            "score_temporal": lambda: _table(output, "df_score_temporal"),
+            "contribuicoes_score": lambda: _table(output, "df_contribuicoes_score"),
+            "caps_prudenciais": lambda: _table(output, "df_caps_prudenciais"),
+            "intervalos_incerteza": lambda: _table(output, "df_intervalos_incerteza"),
+            "contas_derivadas": lambda: _table(output, "df_contas_derivadas"),
+            "indices_observados": lambda: _table(output, "df_indices_observados"),
+            "notas_observadas": lambda: _table(output, "df_notas_observadas"),
+            "motivos_nan": lambda: _table(output, "df_motivos_nan"),
+            "diagnostico_pca": lambda: _table(output, "df_diagnostico_pca"),
+            "pesos_pca": lambda: _table(output, "df_pesos_pca"),
+            "cargas_pca": lambda: _cargas_pca_orientadas(_table(output, "df_cargas_pca")),
+            "cenarios_deterministicos": lambda: _table(output, "df_cenarios_deterministicos"),
+            "redundancia_fp": lambda: _table(output, "df_sensibilidade_redundancia_fp"),
+            "comparacao_monte_carlo": lambda: _table(output, "df_comparacao_monte_carlo"),
+            "aceitos_rejeitados": lambda: _table(output, "df_comparacao_aceitos_rejeitados"),
+            "simulacoes_independentes": lambda: _table(output, "df_simulacoes_independentes"),
+            "quantis_simulacoes": lambda: _quantis_simulacoes(output),
+            "simulacoes_correlacionadas": lambda: _table(output, "df_simulacoes_correlacionadas"),
+            "resumo_simulacao": lambda: _table(output, "df_resumo_simulacoes"),
+            "simulacoes": lambda: _table(output, "df_simulacoes"),
+            "springate": lambda: _table(output, "df_springate_complementar"),
+            "fleuriet_simplificado": lambda: _table(output, "df_fleuriet_complementar"),
+            "sensibilidade": lambda: _table(output, "df_sensibilidade"),
+            "amplitudes": lambda: _table(output, "df_amplitudes"),
         })
-    return sheets
+    return {
+        name: builders[name]
+        for name in _abas_exportacao(perfil, simulacoes)
+        if name in builders
+    }
+
+
+def montar_abas_exportacao(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    *,
+    perfil: str = "completo",
+    simulacoes: str | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Monta as abas do ``perfil`` na ordem do notebook 2.0.20.
+
+    ``completo`` reproduz as 35 abas do notebook. ``simulacoes`` substitui o
+    modo padrão do perfil para as séries de Monte Carlo: ``bruto`` (as três
+    abas, com ``simulacoes`` repetindo as independentes), ``sem_duplicatas``
+    ou ``quantis`` (uma aba ``quantis_simulacoes``). Só as abas selecionadas
+    são montadas.
+    """
+    builders = _construtores_abas(output, meta or {}, perfil, simulacoes)
+    return {name: build() for name, build in builders.items()}
+
+
+_NAVY, _RED, _AMBER, _GREEN, _BLUE = "17365D", "F4CCCC", "FCE5CD", "D9EAD3", "D9EAF7"
+_SEVERITY_LABELS = ["severidade", "potencial_vies", "risco_vies", "status", "status_acao", "classificacao_uso"]
+_CURRENCY_FORMAT = '#,##0.00;[Red](#,##0.00);-'
+_CURRENCY_TOKENS = ["valor_", "delta_absoluto", "score", "observado", "media", "mediana", "minimo", "maximo", "cap"]
+_PERCENT_TOKENS = ["percentual", "materialidade", "confianca", "correlacao", "variancia", "participacao", "peso", "freq_", "impacto_absoluto", "cobertura", "amplitude", "choque"]
+_INDEX_PERCENT = {"crescimento_receita", "margem_bruta", "margem_ebit", "margem_liquida", "capitalizacao", "endividamento_exigivel", "ccl_ativo", "ncg_operacional_ativo", "divida_liquida_ativo", "composicao_endividamento"}
+_INDEX_MULTIPLES = {"giro_ativo", "liquidez_corrente", "liquidez_seca", "cobertura_juros"}
+_INDEX_DAYS = {"prazo_recebimento_dias", "prazo_estoques_dias", "prazo_fornecedores_dias", "ciclo_conversao_caixa"}
+_ROW_HEIGHTS = {"correcoes_auditoria": 72, "alertas_vies_material": 72, "qualidade_dados": 48, "motivos_nan": 48, "caps_prudenciais": 48, "intervalos_incerteza": 48}
+_HEADER_COMMENTS = {"valor_original": "Valor lido da planilha-fonte, nunca sobrescrito.", "valor_utilizado": "Valor empregado somente na cópia analítica.", "confianca": "Confiança da regra; não equivale a probabilidade estatística.", "materialidade_pct_ativo": "Magnitude da mudança dividida pelo Ativo Total do exercício.", "confirmado": "Verdadeiro somente após verificação documental."}
+# Largura e alinhamento consideram só as primeiras linhas de cada coluna
+# (cabeçalho incluído), como sempre fez a formatação da planilha.
+_SAMPLE_ROWS = 200
+_THIN = Side(style="thin")
+
+
+def _cor_severidade(value: Any) -> str | None:
+    text = str(value).upper()
+    return _RED if any(x in text for x in ["CRIT", "BLOQUE", "NAO APTA"]) else _AMBER if any(x in text for x in ["ALTO", "PROVIS", "PEND"]) else _GREEN if any(x in text for x in ["PASS", "DECISORIO", "CONTROLADO"]) else _BLUE if any(x in text for x in ["QUARENTENA", "INFO"]) else None
+
+
+def _formato_coluna(sheet: str, header: Any) -> str | None:
+    """Formato numérico da coluna; o último critério aplicável prevalece."""
+    text = str(header).lower()
+    fmt = None
+    if any(token in text for token in _CURRENCY_TOKENS):
+        fmt = _CURRENCY_FORMAT
+    if any(token in text for token in _PERCENT_TOKENS):
+        fmt = "0.00%"
+    if sheet == "indices_observados":
+        fmt = "0.00%" if header in _INDEX_PERCENT else "0.00x" if header in _INDEX_MULTIPLES else "0.00" if header in _INDEX_DAYS else fmt
+    return fmt
+
+
+def _largura(values: list[Any]) -> float:
+    max_length = max((len(str(value)) for value in values if value is not None), default=0)
+    return min(max(max_length + 2, 11), 55)
 
 
 def _style_workbook(workbook) -> None:
-    navy, red, amber, green, blue = "17365D", "F4CCCC", "FCE5CD", "D9EAD3", "D9EAF7"
     for worksheet in workbook.worksheets:
         worksheet.freeze_panes = "A2"
         worksheet.sheet_view.showGridLines = False
         worksheet.auto_filter.ref = worksheet.dimensions
         for cell in worksheet[1]:
-            cell.fill = PatternFill("solid", fgColor=navy)
+            cell.fill = PatternFill("solid", fgColor=_NAVY)
             cell.font = Font(color="FFFFFF", bold=True)
             cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
         worksheet.row_dimensions[1].height = 34
         for column_cells in worksheet.columns:
             letter = get_column_letter(column_cells[0].column)
-            max_length = 0
-            for cell in column_cells[:200]:
-                if cell.value is not None:
-                    max_length = max(max_length, len(str(cell.value)))
+            for cell in column_cells[:_SAMPLE_ROWS]:
                 cell.alignment = Alignment(vertical="top", wrap_text=True)
-            worksheet.column_dimensions[letter].width = min(max(max_length + 2, 11), 55)
+            worksheet.column_dimensions[letter].width = _largura([cell.value for cell in column_cells[:_SAMPLE_ROWS]])
         headers = {cell.value: cell.column for cell in worksheet[1] if cell.value is not None}
-        for label in ["severidade", "potencial_vies", "risco_vies", "status", "status_acao", "classificacao_uso"]:
+        for label in _SEVERITY_LABELS:
             if label not in headers:
                 continue
             for row in range(2, worksheet.max_row + 1):
-                cell = worksheet.cell(row, headers[label]); text = str(cell.value).upper()
-                fill = red if any(x in text for x in ["CRIT", "BLOQUE", "NAO APTA"]) else amber if any(x in text for x in ["ALTO", "PROVIS", "PEND"]) else green if any(x in text for x in ["PASS", "DECISORIO", "CONTROLADO"]) else blue if any(x in text for x in ["QUARENTENA", "INFO"]) else None
+                cell = worksheet.cell(row, headers[label])
+                fill = _cor_severidade(cell.value)
                 if fill:
                     cell.fill = PatternFill("solid", fgColor=fill)
         for header, column in headers.items():
-            text = str(header).lower()
-            if any(token in text for token in ["valor_", "delta_absoluto", "score", "observado", "media", "mediana", "minimo", "maximo", "cap"]):
-                for row in range(2, worksheet.max_row + 1): worksheet.cell(row, column).number_format = '#,##0.00;[Red](#,##0.00);-'
-            if any(token in text for token in ["percentual", "materialidade", "confianca", "correlacao", "variancia", "participacao", "peso", "freq_", "impacto_absoluto", "cobertura", "amplitude", "choque"]):
-                for row in range(2, worksheet.max_row + 1): worksheet.cell(row, column).number_format = "0.00%"
-        if worksheet.title == "indices_observados":
-            percentage = {"crescimento_receita", "margem_bruta", "margem_ebit", "margem_liquida", "capitalizacao", "endividamento_exigivel", "ccl_ativo", "ncg_operacional_ativo", "divida_liquida_ativo", "composicao_endividamento"}
-            multiples = {"giro_ativo", "liquidez_corrente", "liquidez_seca", "cobertura_juros"}
-            days = {"prazo_recebimento_dias", "prazo_estoques_dias", "prazo_fornecedores_dias", "ciclo_conversao_caixa"}
-            for header, column in headers.items():
-                fmt = "0.00%" if header in percentage else "0.00x" if header in multiples else "0.00" if header in days else None
-                if fmt:
-                    for row in range(2, worksheet.max_row + 1): worksheet.cell(row, column).number_format = fmt
-        heights = {"correcoes_auditoria": 72, "alertas_vies_material": 72, "qualidade_dados": 48, "motivos_nan": 48, "caps_prudenciais": 48, "intervalos_incerteza": 48}
-        if worksheet.title in heights:
-            for row in range(2, worksheet.max_row + 1): worksheet.row_dimensions[row].height = heights[worksheet.title]
+            fmt = _formato_coluna(worksheet.title, header)
+            if fmt:
+                for row in range(2, worksheet.max_row + 1): worksheet.cell(row, column).number_format = fmt
+        if worksheet.title in _ROW_HEIGHTS:
+            for row in range(2, worksheet.max_row + 1): worksheet.row_dimensions[row].height = _ROW_HEIGHTS[worksheet.title]
     if "correcoes_auditoria" in workbook.sheetnames:
-        comments = {"valor_original": "Valor lido da planilha-fonte, nunca sobrescrito.", "valor_utilizado": "Valor empregado somente na cópia analítica.", "confianca": "Confiança da regra; não equivale a probabilidade estatística.", "materialidade_pct_ativo": "Magnitude da mudança dividida pelo Ativo Total do exercício.", "confirmado": "Verdadeiro somente após verificação documental."}
         for cell in workbook["correcoes_auditoria"][1]:
-            if cell.value in comments: cell.comment = Comment(comments[cell.value], "FinScore")
+            if cell.value in _HEADER_COMMENTS: cell.comment = Comment(_HEADER_COMMENTS[cell.value], "FinScore")
+
+
+def _valor_celula(value: Any) -> tuple[Any, str | None]:
+    """Valor e formato que ``DataFrame.to_excel`` grava com o openpyxl."""
+    if is_scalar(value) and pd.isna(value):
+        return None, None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value), None
+    if isinstance(value, (int, np.integer)):
+        return int(value), None
+    if isinstance(value, (float, np.floating)):
+        if np.isinf(value):
+            return ("inf" if value > 0 else "-inf"), None
+        return float(value), None
+    if isinstance(value, datetime):
+        return value, "YYYY-MM-DD HH:MM:SS"
+    if isinstance(value, date):
+        return value, "YYYY-MM-DD"
+    if isinstance(value, timedelta):
+        return value.total_seconds() / 86400, "0"
+    return str(value), None
+
+
+class _Estilos:
+    """Um ``StyleArray`` por combinação de estilo, registrado uma vez na pasta."""
+
+    def __init__(self, workbook) -> None:
+        self.worksheet = workbook.create_sheet("_estilos")
+        workbook.remove(self.worksheet)
+        self.cache: dict[tuple, Any] = {}
+
+    def __call__(self, header: bool, aligned: bool, fill: str | None, fmt: str | None):
+        key = (header, aligned, fill, fmt)
+        style = self.cache.get(key)
+        if style is None:
+            cell = WriteOnlyCell(self.worksheet)
+            if header:
+                cell.font = Font(color="FFFFFF", bold=True)
+                cell.border = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+            if aligned:
+                cell.alignment = Alignment(vertical="top", wrap_text=True)
+            if fill:
+                cell.fill = PatternFill("solid", fgColor=fill)
+            if fmt:
+                cell.number_format = fmt
+            style = self.cache[key] = cell._style
+        return style
+
+
+def _escrever_aba(workbook, estilos: _Estilos, name: str, table: pd.DataFrame) -> None:
+    """Grava uma aba em fluxo, com o resultado de ``to_excel`` + ``_style_workbook``."""
+    worksheet = workbook.create_sheet(name[:31])
+    headers = [_valor_celula(column)[0] for column in table.columns] or [None]
+    formats = [_formato_coluna(worksheet.title, header) for header in headers]
+    severity = [header in _SEVERITY_LABELS for header in headers]
+    last_row = len(table) + 1
+
+    worksheet.freeze_panes = "A2"
+    worksheet.sheet_view.showGridLines = False
+    worksheet.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{last_row}"
+    worksheet.row_dimensions[1].height = 34
+    if worksheet.title in _ROW_HEIGHTS:
+        for row in range(2, last_row + 1):
+            worksheet.row_dimensions[row].height = _ROW_HEIGHTS[worksheet.title]
+
+    rows = (
+        [_valor_celula(value) for value in values]
+        for values in table.itertuples(index=False, name=None)
+    )
+    sample = list(islice(rows, _SAMPLE_ROWS - 1))
+    for index, header in enumerate(headers):
+        width = _largura([header] + [row[index][0] for row in sample])
+        worksheet.column_dimensions[get_column_letter(index + 1)].width = width
+
+    header_cells = []
+    for header in headers:
+        cell = Cell(worksheet, 1, 1, value=header, style_array=estilos(True, True, _NAVY, None))
+        if worksheet.title == "correcoes_auditoria" and header in _HEADER_COMMENTS:
+            cell.comment = Comment(_HEADER_COMMENTS[header], "FinScore")
+        header_cells.append(cell)
+    worksheet.append(header_cells)
+
+    for number, row in enumerate(chain(sample, rows), start=2):
+        aligned = number <= _SAMPLE_ROWS
+        cells = []
+        for (value, value_fmt), fmt, colored in zip(row, formats, severity):
+            fill = _cor_severidade("" if value is None else value) if colored else None
+            fmt = fmt or value_fmt
+            if aligned or fill or fmt:
+                cells.append(Cell(worksheet, 1, 1, value=value, style_array=estilos(False, aligned, fill, fmt)))
+            else:
+                # Valores crus não servem: o openpyxl os grava na última
+                # ``Cell`` recebida na linha, herdando o estilo dela.
+                cells.append(None if value is None else Cell(worksheet, 1, 1, value=value))
+        worksheet.append(cells)
+
+
+def _gerar_planilha_fluxo(sheets: dict[str, pd.DataFrame]) -> bytes:
+    workbook = Workbook(write_only=True)
+    estilos = _Estilos(workbook)
+    for name, table in sheets.items():
+        _escrever_aba(workbook, estilos, name, table)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
 
+def gerar_planilha_analise(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    *,
+    perfil: str = "completo",
+    simulacoes: str | None = None,
+    somente_escrita: bool = True,
+) -> bytes:
+    """Gera o XLSX da análise com as abas de ``montar_abas_exportacao``.
 
-def gerar_planilha_analise(output: dict[str, Any], meta: dict[str, Any] | None = None) -> bytes:
+    Por padrão as abas são gravadas em fluxo (``Workbook(write_only=True)``),
+    linha a linha e com os estilos resolvidos por coluna, sem manter a pasta
+    inteira em memória. ``somente_escrita=False`` usa o caminho anterior
+    (``to_excel`` + ``_style_workbook`` célula a célula), mantido como
+    referência de equivalência visual.
+    """
+    sheets = montar_abas_exportacao(output, meta, perfil=perfil, simulacoes=simulacoes)
+    if somente_escrita:
+        return _gerar_planilha_fluxo(sheets)
     buffer = BytesIO()
     with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        for name, table in montar_abas_exportacao(output, meta).items():
+        for name, table in sheets.items():
             table.to_excel(writer, sheet_name=name[:31], index=False)
         _style_workbook(writer.book)
     return buffer.getvalue()
 
 
-def nome_arquivo_analise(output: dict[str, Any], meta: dict[str, Any] | None = None) -> str:
+def chave_exportacao(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    *,
+    perfil: str = "completo",
+    simulacoes: str | None = None,
+) -> str:
+    """Identifica o conteúdo da planilha: mesma chave, mesmos bytes."""
+    model = output.get("modelo", {})
+    payload = {
+        "abas": _abas_exportacao(perfil, simulacoes),
+        "contrato_versao": output.get("contrato_versao"),
+        "versao": model.get("versao"),
+        "hash_codigo": model.get("hash_codigo"),
+        "processado_em": model.get("processado_em"),
+        "semente": model.get("semente"),
+        "numero_simulacoes": model.get("numero_simulacoes"),
+        "hash_dados_reportados": output.get("hash_dados_reportados"),
+        "hash_dados_utilizados": output.get("hash_dados_utilizados"),
+        "hash_regras": _hash_regras(),
+        "meta": meta or {},
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def preparar_planilha_analise(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    *,
+    perfil: str = "completo",
+    simulacoes: str | None = None,
+) -> Future:
+    """Gera a planilha em segundo plano, uma vez por ``chave_exportacao``.
+
+    Uma falha também fica guardada: com a mesma chave a entrada é a mesma e
+    repetir a geração a cada rerun só repetiria o erro.
+    """
+    key = chave_exportacao(output, meta, perfil=perfil, simulacoes=simulacoes)
+    return _FUTURES.obter_ou_criar(
+        key,
+        lambda: _EXECUTOR.submit(
+            gerar_planilha_analise,
+            output,
+            copy.deepcopy(meta or {}),
+            perfil=perfil,
+            simulacoes=simulacoes,
+        ),
+    )
+
+
+def obter_planilha_analise(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    timeout: Optional[float] = None,
+    **opcoes: Any,
+) -> bytes:
+    """Bytes da planilha, reaproveitando a geração já iniciada ou concluída."""
+    return preparar_planilha_analise(output, meta, **opcoes).result(timeout=timeout)
+
+
+def nome_arquivo_analise(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    perfil: str = "completo",
+    extensao: str = "xlsx",
+) -> str:
     company = str((meta or {}).get("empresa") or "empresa")
     normalized = unicodedata.normalize("NFKD", company).encode("ascii", "ignore").decode()
     slug = re.sub(r"[^a-zA-Z0-9]+", "_", normalized).strip("_").lower() or "empresa"
     processed = output.get("modelo", {}).get("processado_em")
     timestamp = processed.strftime("%Y%m%d_%H%M") if isinstance(processed, datetime) else datetime.now().strftime("%Y%m%d_%H%M")
     version = str(output.get("modelo", {}).get("versao", "2.0.20"))
-    return f"resultados_finscore_{version}_{slug}_{timestamp}.xlsx"
+    suffix = "" if perfil == "completo" else f"_{perfil}"
+    return f"resultados_finscore_{version}_{slug}_{timestamp}{suffix}.{extensao}"
+
+
+def _json_valor(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _esquema_arrow(table: pd.DataFrame) -> tuple[pa.Schema, set[str]]:
+    """Tipos Arrow da aba inteira; colunas ``object`` mistas são gravadas como texto.
+
+    Os tipos são inferidos coluna a coluna sobre a tabela completa para que
+    todos os blocos gravem o mesmo esquema.
+    """
+    fields, text = [], set()
+    for label, series in table.items():
+        name = str(label)
+        try:
+            kind = pa.Array.from_pandas(series).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            kind = pa.string()
+            text.add(name)
+        fields.append(pa.field(name, kind))
+    return pa.schema(fields), text
+
+
+def _bloco_arrow(chunk: pd.DataFrame, schema: pa.Schema, text: set[str]) -> pa.Table:
+    arrays = []
+    for field, (_, series) in zip(schema, chunk.items()):
+        if field.name in text:
+            values = [None if is_scalar(value) and pd.isna(value) else str(value) for value in series]
+            arrays.append(pa.array(values, pa.string()))
+        else:
+            arrays.append(pa.Array.from_pandas(series, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _gravar_parquet(table: pd.DataFrame, handle) -> None:
+    schema, text = _esquema_arrow(table)
+    with pq.ParquetWriter(handle, schema, compression="zstd") as writer:
+        for start in range(0, len(table), LINHAS_POR_BLOCO):
+            writer.write_table(_bloco_arrow(table.iloc[start:start + LINHAS_POR_BLOCO], schema, text))
+
+
+def _gravar_csv(table: pd.DataFrame, handle) -> None:
+    text = TextIOWrapper(handle, encoding="utf-8", newline="")
+    table.iloc[:0].to_csv(text, index=False, lineterminator="\n")
+    for start in range(0, len(table), LINHAS_POR_BLOCO):
+        table.iloc[start:start + LINHAS_POR_BLOCO].to_csv(text, index=False, header=False, lineterminator="\n")
+    text.flush()
+    text.detach()
+
+
+def _serializar_aba(name: str, build: Callable[[], pd.DataFrame], formato: str) -> tuple[Any, dict[str, Any]]:
+    """Executado nas threads do pacote: grava a aba em um arquivo temporário."""
+    table = build()
+    spool = tempfile.SpooledTemporaryFile(max_size=_LIMITE_MEMORIA_ARQUIVO)
+    (_gravar_parquet if formato == "parquet" else _gravar_csv)(table, spool)
+    info = {
+        "arquivo": f"{name}.{formato}",
+        "aba": name,
+        "linhas": len(table),
+        "colunas": [str(column) for column in table.columns],
+    }
+    return spool, info
+
+
+def _data_zip(output: dict[str, Any]) -> tuple[int, int, int, int, int, int]:
+    # Data fixa (a do processamento) para que o mesmo resultado gere o mesmo zip.
+    processed = output.get("modelo", {}).get("processado_em")
+    if isinstance(processed, datetime) and processed.year >= 1980:
+        return processed.timetuple()[:6]
+    return (1980, 1, 1, 0, 0, 0)
+
+
+def _copiar_para_zip(archive: zipfile.ZipFile, spool, info: dict[str, Any], stamp: tuple) -> dict[str, Any]:
+    size = spool.seek(0, 2)
+    spool.seek(0)
+    entry = zipfile.ZipInfo(info["arquivo"], date_time=stamp)
+    # O Parquet já vem comprimido com zstd; só o CSV passa pelo deflate.
+    entry.compress_type = zipfile.ZIP_STORED if info["arquivo"].endswith(".parquet") else zipfile.ZIP_DEFLATED
+    entry.file_size = size
+    digest = hashlib.sha256()
+    with archive.open(entry, "w") as target:
+        while block := spool.read(2**20):
+            digest.update(block)
+            target.write(block)
+    return {**info, "bytes": size, "sha256": digest.hexdigest()}
+
+
+def gravar_pacote_exportacao(
+    destino: Path | str | BinaryIO,
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    *,
+    formato: str = "parquet",
+    perfil: str = "completo",
+    simulacoes: str | None = None,
+    threads: int = THREADS_PACOTE,
+) -> dict[str, Any]:
+    """Grava em ``destino`` um zip com um arquivo por aba e ``manifesto.json``.
+
+    As abas são as de ``montar_abas_exportacao`` para ``perfil`` e
+    ``simulacoes``, montadas e serializadas em ``threads`` threads, em blocos
+    de ``LINHAS_POR_BLOCO`` linhas. Cada arquivo pronto é copiado para o zip
+    na ordem das abas; no máximo ``threads`` tabelas existem ao mesmo tempo.
+    O manifesto (também retornado) traz os hashes do modelo, das regras e dos
+    dados, o resumo do modelo e tamanho, linhas e sha256 de cada arquivo.
+    """
+    if formato not in FORMATOS_PACOTE:
+        raise ValueError(f"Formato de pacote desconhecido: {formato!r}. Use {list(FORMATOS_PACOTE)}.")
+    if threads < 1:
+        raise ValueError("threads deve ser ao menos 1.")
+    meta = meta or {}
+    builders = iter(_construtores_abas(output, meta, perfil, simulacoes).items())
+    model = output.get("modelo", {})
+    stamp = _data_zip(output)
+    files: list[dict[str, Any]] = []
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="finscore-pacote") as executor:
+
+        def submit() -> None:
+            for name, build in islice(builders, 1):
+                pending.append(executor.submit(_serializar_aba, name, build, formato))
+
+        try:
+            with zipfile.ZipFile(destino, "w") as archive:
+                for _ in range(threads):
+                    submit()
+                while pending:
+                    spool, info = pending.popleft().result()
+                    submit()
+                    with spool:
+                        files.append(_copiar_para_zip(archive, spool, info, stamp))
+                manifest = {
+                    "formato": formato,
+                    "perfil": perfil,
+                    "simulacoes": simulacoes or PERFIS_EXPORTACAO[perfil][1],
+                    "contrato_versao": output.get("contrato_versao"),
+                    "versao_modelo": model.get("versao"),
+                    "hash_codigo": model.get("hash_codigo"),
+                    "hash_regras": _hash_regras(),
+                    "hash_dados_reportados": output.get("hash_dados_reportados"),
+                    "hash_dados_utilizados": output.get("hash_dados_utilizados"),
+                    "semente": model.get("semente"),
+                    "numero_simulacoes": model.get("numero_simulacoes"),
+                    "processado_em": _json_valor(model.get("processado_em")),
+                    "chave_exportacao": chave_exportacao(output, meta, perfil=perfil, simulacoes=simulacoes),
+                    "resumo": {
+                        row.campo: _json_valor(row.valor)
+                        for row in _resumo_modelo(output).itertuples(index=False)
+                    },
+                    "arquivos": files,
+                }
+                archive.writestr(
+                    zipfile.ZipInfo("manifesto.json", date_time=stamp),
+                    json.dumps(manifest, ensure_ascii=False, indent=2, default=str),
+                    compress_type=zipfile.ZIP_DEFLATED,
+                )
+        finally:
+            for future in pending:
+                future.cancel()
+    return manifest
+
+
+def gerar_pacote_exportacao(
+    output: dict[str, Any],
+    meta: dict[str, Any] | None = None,
+    **opcoes: Any,
+) -> bytes:
+    """Bytes do zip de ``gravar_pacote_exportacao``."""
+    buffer = BytesIO()
+    gravar_pacote_exportacao(buffer, output, meta, **opcoes)
+    return buffer.getvalue()
@@ -0,0 +1,166 @@
+"""Aquecimento e prontidão de um processo do app FinScore.
+
+Após um deploy, a primeira pontuação pagava de uma vez a inicialização do
+numpy/scikit-learn, o primeiro PCA, os autotestes, o encoding do ``tiktoken``
+e a partida do Chromium. ``aquecer_aplicacao`` executa essas etapas antes do
+tráfego e registra o estado de cada uma; o processo fica pronto quando as
+etapas obrigatórias (motor e autotestes) concluem. Falhas em ``tiktoken`` e
+``playwright`` são registradas, mas não bloqueiam: os dois têm alternativa
+(contagem aproximada e xhtml2pdf).
+
+Com ``FINSCORE_PRONTO_ARQUIVO`` definido, o estado é gravado nesse arquivo
+quando o processo fica pronto e removido ao iniciar o aquecimento, o que
+serve de sonda de prontidão para o balanceador (``scripts/aquecer.py
+--verificar``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    from finscore_v2 import aquecer
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.finscore_v2 import aquecer
+
+from .autotestes import obter_autotestes, precalcular_autotestes
+from .tarefas import executar_no_motor
+
+
+ETAPAS = ("motor", "autotestes", "tiktoken", "playwright")
+ETAPAS_OBRIGATORIAS = ("motor", "autotestes")
+
+_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+_ESTADO: dict[str, Any] = {
+    "pronto": False,
+    "iniciado_em": None,
+    "concluido_em": None,
+    "etapas": {},
+}
+
+
+def _aquecer_motor(numero_simulacoes: int) -> str:
+    # O motor publica estado em ``core``: o aquecimento espera na fila das
+    # pontuações em vez de rodar junto com uma tarefa do usuário.
+    timings = executar_no_motor(aquecer, numero_simulacoes)
+    return ", ".join(f"{name} {seconds:.1f} s" for name, seconds in timings.items())
+
+
+def _aquecer_autotestes(numero_simulacoes: int) -> str:
+    tests = obter_autotestes()
+    return f"{len(tests)} autotestes"
+
+
+def _aquecer_tiktoken(numero_simulacoes: int) -> Optional[str]:
+    try:
+        from components import token_utils
+    except ModuleNotFoundError:
+        from app_front.components import token_utils
+    if not token_utils.TIKTOKEN_AVAILABLE:
+        return None
+    token_utils.count_text_tokens("gpt-4o", "aquecimento")
+    return "encoding cl100k_base carregado"
+
+
+def _aquecer_playwright(numero_simulacoes: int) -> Optional[str]:
+    try:
+        from pdf import export_pdf
+    except ModuleNotFoundError:
+        from app_front.pdf import export_pdf
+    if not export_pdf.PLAYWRIGHT_AVAILABLE:
+        return None
+    # Abre o navegador do pool que servirá os PDFs, em vez de um descartável.
+    export_pdf.get_browser_pool().start()
+    return "Chromium iniciado no pool de PDF"
+
+
+_FUNCOES: dict[str, Callable[[int], Optional[str]]] = {
+    "motor": _aquecer_motor,
+    "autotestes": _aquecer_autotestes,
+    "tiktoken": _aquecer_tiktoken,
+    "playwright": _aquecer_playwright,
+}
+
+
+def _arquivo_pronto() -> Optional[Path]:
+    value = os.environ.get("FINSCORE_PRONTO_ARQUIVO", "").strip()
+    return Path(value) if value else None
+
+
+def _registrar(etapa: str, **campos: Any) -> None:
+    with _LOCK:
+        _ESTADO["etapas"].setdefault(etapa, {}).update(campos)
+
+
+def estado_aquecimento() -> dict[str, Any]:
+    """Cópia do estado: ``pronto`` e status, duração e detalhe por etapa."""
+    with _LOCK:
+        return deepcopy(_ESTADO)
+
+
+def aquecer_aplicacao(
+    etapas: tuple[str, ...] = ETAPAS,
+    *,
+    numero_simulacoes: int = 100,
+) -> dict[str, Any]:
+    """Executa as etapas de aquecimento em sequência e retorna o estado final."""
+    unknown = set(etapas) - set(ETAPAS)
+    if unknown:
+        raise ValueError(f"Etapas de aquecimento desconhecidas: {sorted(unknown)}")
+    marker = _arquivo_pronto()
+    if marker is not None:
+        marker.unlink(missing_ok=True)
+    with _LOCK:
+        _ESTADO.update(
+            pronto=False,
+            iniciado_em=datetime.now().isoformat(timespec="seconds"),
+            concluido_em=None,
+            etapas={name: {"status": "PENDENTE", "segundos": None, "detalhe": ""} for name in etapas},
+        )
+    if "autotestes" in etapas:
+        precalcular_autotestes()  # Roda em outro processo enquanto o motor aquece.
+
+    for name in etapas:
+        start = time.perf_counter()
+        try:
+            detail = _FUNCOES[name](numero_simulacoes)
+        except Exception as error:
+            status, detail = "FALHOU", f"{type(error).__name__}: {error}"
+        else:
+            status, detail = ("IGNORADO", "indisponível") if detail is None else ("OK", detail)
+        _registrar(name, status=status, segundos=time.perf_counter() - start, detalhe=detail)
+
+    with _LOCK:
+        _ESTADO["pronto"] = all(
+            _ESTADO["etapas"].get(name, {}).get("status") == "OK"
+            for name in ETAPAS_OBRIGATORIAS
+        )
+        _ESTADO["concluido_em"] = datetime.now().isoformat(timespec="seconds")
+        state = deepcopy(_ESTADO)
+    if marker is not None and state["pronto"]:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.write_text(json.dumps(state, ensure_ascii=False, indent=1), encoding="utf-8")
+    return state
+
+
+def iniciar_aquecimento(**opcoes: Any) -> threading.Thread:
+    """Inicia ``aquecer_aplicacao`` uma vez por processo, em segundo plano."""
+    global _THREAD
+    with _LOCK:
+        if _THREAD is None:
+            _THREAD = threading.Thread(
+                target=aquecer_aplicacao,
+                kwargs=opcoes,
+                name="finscore-aquecimento",
+                daemon=True,
+            )
+            _THREAD.start()
+        return _THREAD
@@ -0,0 +1,113 @@
+"""Resultados persistidos da bateria de autotestes do modelo.
+
+``executar_autotestes`` roda ``run_self_tests`` inteira (ajustes PCA, cenários,
+recálculos escalados) e leva dezenas de segundos, mas o resultado depende só
+do código do modelo. A tabela é gravada em JSON na pasta de resultados, em um
+arquivo nomeado por ``VERSAO_MODELO`` e ``HASH_CODIGO_MODELO``; com outro hash
+o arquivo não é encontrado e a bateria roda de novo, uma única vez, e substitui
+o arquivo antigo da mesma versão.
+
+``precalcular_autotestes`` é chamado na inicialização do app e carrega ou
+calcula a tabela em uma thread de fundo; ``obter_autotestes`` aguarda essa
+mesma execução em vez de iniciar outra. O cálculo roda em um processo
+separado porque ``executar_autotestes`` publica estado em ``core`` e não pode
+concorrer com uma pontuação na mesma memória.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from finscore_v2 import core, executar_autotestes
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.finscore_v2 import core, executar_autotestes
+
+from .result_store import DEFAULT_DIR
+
+
+COLUNAS = ["teste", "status", "detalhe"]
+_PREFIX = "autotestes-"
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finscore-autotestes")
+_FUTURES: dict[Path, Future] = {}
+_LOCK = threading.Lock()
+
+
+def caminho_autotestes(diretorio: Path | str | None = None) -> Path:
+    """Arquivo dos autotestes do modelo em execução."""
+    folder = Path(diretorio or os.environ.get("FINSCORE_RESULTADOS_DIR") or DEFAULT_DIR)
+    return folder / f"{_PREFIX}{core.VERSAO_MODELO}-{core.HASH_CODIGO_MODELO[:16]}.json"
+
+
+def _ler(path: Path) -> Optional[pd.DataFrame]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        payload.get("versao_modelo") != core.VERSAO_MODELO
+        or payload.get("hash_codigo_modelo") != core.HASH_CODIGO_MODELO
+    ):
+        return None
+    return pd.DataFrame(payload["testes"], columns=COLUNAS)
+
+
+def _gravar(path: Path, tests: pd.DataFrame) -> None:
+    payload = {
+        "versao_modelo": core.VERSAO_MODELO,
+        "hash_codigo_modelo": core.HASH_CODIGO_MODELO,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "testes": tests[COLUNAS].astype(str).to_dict(orient="records"),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".tmp-{uuid.uuid4().hex[:8]}-{path.name}")
+    staging.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(staging, path)
+    # Só arquivos da mesma versão com outro hash: versões diferentes do app
+    # podem compartilhar a pasta sem apagar os autotestes umas das outras.
+    for stale in path.parent.glob(f"{_PREFIX}{core.VERSAO_MODELO}-*.json"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def _calcular() -> pd.DataFrame:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(executar_autotestes).result()
+
+
+def _carregar_ou_calcular(path: Path) -> pd.DataFrame:
+    tests = _ler(path)
+    if tests is None:
+        tests = _calcular()
+        try:
+            _gravar(path, tests)
+        except OSError:
+            pass  # Pasta sem escrita: a tabela vale ao menos para este processo.
+    return tests
+
+
+def precalcular_autotestes(diretorio: Path | str | None = None) -> Future:
+    """Carrega ou calcula os autotestes em segundo plano; idempotente."""
+    path = caminho_autotestes(diretorio)
+    with _LOCK:
+        future = _FUTURES.get(path)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _FUTURES[path] = _EXECUTOR.submit(_carregar_ou_calcular, path)
+    return future
+
+
+def obter_autotestes(diretorio: Path | str | None = None) -> pd.DataFrame:
+    """Tabela de autotestes do modelo atual, calculada no máximo uma vez."""
+    return precalcular_autotestes(diretorio).result().copy(deep=True)
@@ -7,15 +7,16 @@ Gera gráficos de barras lado a lado com logos, valores e classificações.
 import os
 import io
 import base64
+import threading
+from functools import lru_cache
 from typing import Tuple, Optional
 
-import matplotlib
-matplotlib.use("Agg")  # Backend não-interativo
-
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from PIL import Image
+
+from .memoria import MemoriaLRU
+
+# Matplotlib e Pillow são importados na primeira renderização: as funções de
+# faixas abaixo são usadas sem gerar imagem e não devem pagar esse custo.
 
 # Paletas pastel
 TEAL_PASTEL = ["#BFEDE6", "#A6E4DB", "#8ADBCF", "#6FD2C4"]          # Serasa (verde-água)
@@ -26,6 +27,12 @@ ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
 LOGO_SERASA = os.path.join(ASSETS_DIR, "logo_serasa3.png")
 LOGO_FINSCORE = os.path.join(ASSETS_DIR, "logo_fin1a.png")
 
+FORMATOS_MINICHART = ("png", "svg")
+MINICHARTS_MEMORIZADOS = 64  # imagens prontas, por scores, faixas e formato
+FUNDOS_MINICHART = 8  # figuras montadas, por conjunto de faixas
+
+_MINICHARTS = MemoriaLRU(MINICHARTS_MEMORIZADOS)
+
 
 def _draw_minichart(ax, categories, values, colors, score,
                    font_x=7, font_value=8, grid_color="#EDEFF3",
@@ -36,6 +43,9 @@ def _draw_minichart(ax, categories, values, colors, score,
       - linha pontilhada no 'score'
       - valores pequenos acima das barras
       - sem spines e sem ticks no eixo y
+
+    Retorna a linha do score e os rótulos de valor, que ``_ajustar_score``
+    reposiciona quando o mesmo fundo é reaproveitado para outro score.
     """
     x = np.arange(len(categories))
     ymax = max(max(values), float(score)) * 1.15
@@ -48,12 +58,13 @@ def _draw_minichart(ax, categories, values, colors, score,
     ax.grid(axis="y", color=grid_color, linestyle="-", linewidth=1, zorder=0)
 
     # Linha do resultado (pontilhada)
-    ax.axhline(score, linestyle="--", color=score_color, linewidth=1.2, zorder=5)
+    line = ax.axhline(score, linestyle="--", color=score_color, linewidth=1.2, zorder=5)
 
     # Rótulos de valor
+    labels = []
     for i, v in enumerate(values):
-        ax.text(i, v + ymax*0.03, f"{v:.0f}", ha="center", va="bottom",
-                fontsize=font_value, color="#8A8F99", fontweight="bold", zorder=5)
+        labels.append(ax.text(i, v + ymax*0.03, f"{v:.0f}", ha="center", va="bottom",
+                              fontsize=font_value, color="#8A8F99", fontweight="bold", zorder=5))
 
     # Eixo x
     ax.set_xticks(x)
@@ -66,16 +77,31 @@ def _draw_minichart(ax, categories, values, colors, score,
         spine.set_visible(False)
 
     ax.set_facecolor("#FDFAFB")
+    return line, labels
+
+
+def _ajustar_score(ax, line, labels, values, score):
+    """Move a linha do score e os rótulos de um minichart já desenhado."""
+    ymax = max(max(values), float(score)) * 1.15
+    line.set_ydata([score, score])
+    for label, v in zip(labels, values):
+        label.set_y(v + ymax*0.03)
+    ax.set_ylim(0, ymax)
 
 
+@lru_cache(maxsize=None)
 def _compose_logo_on_bg(path, bg_rgb=(253, 250, 251)):
     """
     Carrega um PNG (possivelmente com alpha), compõe sobre um fundo RGB 
     e retorna uma imagem RGB pronta para uso no Matplotlib.
+
+    O resultado é guardado por (caminho, fundo); não o modifique.
     """
     if not os.path.exists(path):
         return None
-    
+
+    from PIL import Image
+
     logo = Image.open(path)
     # Garantir RGBA para composição correta
     if logo.mode != 'RGBA':
@@ -86,16 +112,158 @@ def _compose_logo_on_bg(path, bg_rgb=(253, 250, 251)):
     return composed.convert('RGB')
 
 
+def _add_text_fallback(fig, axL, axR):
+    """Adiciona labels de texto quando os logos não estão disponíveis"""
+    # As posições já valem após ``subplots_adjust``; a figura não precisa ser desenhada.
+    boxL = axL.get_position()
+    boxR = axR.get_position()
+    fig.text(boxL.x0 + boxL.width/2, boxL.y0 - 0.10, "Serasa",
+             ha="center", va="top", fontsize=10, color="#303030")
+    fig.text(boxR.x0 + boxR.width/2, boxR.y0 - 0.10, "FinScore",
+             ha="center", va="top", fontsize=10, fontweight="bold", color="#303030")
+
+
+class _FundoMinichart:
+    """
+    Figura dos dois minicharts com barras, eixos e logos já montados.
+
+    Só a linha do score e os rótulos mudam entre pareceres; o ``lock``
+    serializa quem ajusta e salva a mesma figura.
+    """
+
+    def __init__(self, serasa_vals, finscore_vals):
+        import matplotlib
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+
+        # Categorias
+        serasa_cats = ["Muito\nBaixo", "Baixo", "Bom", "Excelente"]
+        finscore_cats = ["M.\nAcima", "L.\nAcima", "Neutro", "L.\nAbaixo", "M.\nAbaixo"]
+
+        # Dois eixos lado a lado, bem próximos
+        fig = Figure(figsize=(10.0, 3.0), dpi=250)
+        FigureCanvasAgg(fig)
+        axL, axR = fig.subplots(1, 2, gridspec_kw=dict(wspace=0.06))
+        fig.patch.set_facecolor("#FDFAFB")
+        fig.patch.set_alpha(1.0)
+
+        # Desenho dos minicharts (o score é ajustado a cada renderização)
+        self.serasa = (axL, *_draw_minichart(axL, serasa_cats, serasa_vals, TEAL_PASTEL, score=0), serasa_vals)
+        self.finscore = (axR, *_draw_minichart(axR, finscore_cats, finscore_vals, BLUE_PASTEL, score=0), finscore_vals)
+
+        # Margens
+        fig.subplots_adjust(left=0.06, right=0.99, top=0.92, bottom=0.30, wspace=0.06)
+
+        # Logos embaixo dos gráficos (centralizados e pequenos)
+        try:
+            logo_serasa_rgb = _compose_logo_on_bg(LOGO_SERASA)
+            logo_finscore_rgb = _compose_logo_on_bg(LOGO_FINSCORE)
+
+            if logo_serasa_rgb and logo_finscore_rgb:
+                imagebox_serasa = OffsetImage(logo_serasa_rgb, zoom=0.06)
+                boxL = axL.get_position()
+                # Posição em coordenadas da figura (60px para a esquerda, 20px para baixo)
+                offset_x = 60 / (fig.get_figwidth() * fig.dpi)
+                offset_y = 20 / (fig.get_figheight() * fig.dpi)
+                ab_serasa = AnnotationBbox(
+                    imagebox_serasa, 
+                    xy=(boxL.x0 + boxL.width/2 - offset_x, boxL.y0 - 0.10 - offset_y),
+                    xycoords='figure fraction',
+                    frameon=False,
+                    box_alignment=(0.5, 1.0)
+                )
+                fig.add_artist(ab_serasa)
+
+                imagebox_finscore = OffsetImage(logo_finscore_rgb, zoom=0.06)
+                boxR = axR.get_position()
+                ab_finscore = AnnotationBbox(
+                    imagebox_finscore,
+                    xy=(boxR.x0 + boxR.width/2 - offset_x, boxR.y0 - 0.10 - offset_y),
+                    xycoords='figure fraction',
+                    frameon=False,
+                    box_alignment=(0.5, 1.0)
+                )
+                fig.add_artist(ab_finscore)
+            else:
+                # Fallback para texto
+                _add_text_fallback(fig, axL, axR)
+        except Exception as e:
+            print(f"Aviso: Não foi possível carregar os logos: {e}")
+            _add_text_fallback(fig, axL, axR)
+
+        self.fig = fig
+        self.lock = threading.Lock()
+        # A linha e os rótulos ficam dentro dos eixos para qualquer score, então o
+        # recorte "tight" é o mesmo sempre: calculado aqui, poupa um desenho por PNG.
+        self.bbox = fig.get_tightbbox().padded(matplotlib.rcParams["savefig.pad_inches"])
+
+    def renderizar(self, serasa_score, finscore_score, formato):
+        """Bytes da imagem (PNG RGB ou SVG) com os scores informados."""
+        with self.lock:
+            for ax, line, labels, values, score in (
+                (*self.serasa, serasa_score),
+                (*self.finscore, finscore_score),
+            ):
+                _ajustar_score(ax, line, labels, values, score)
+            buf = io.BytesIO()
+            opcoes = dict(bbox_inches=self.bbox, facecolor=self.fig.get_facecolor(),
+                          edgecolor='none', transparent=False)
+            if formato == "svg":
+                import matplotlib
+
+                # Sem data e com ids fixos: o mesmo gráfico gera o mesmo SVG.
+                with matplotlib.rc_context({"svg.hashsalt": "finscore-minichart"}):
+                    self.fig.savefig(buf, format='svg', metadata={"Date": None}, **opcoes)
+                return buf.getvalue()
+            # PNG intermediário sem compressão: ele só é lido de volta para virar RGB.
+            self.fig.savefig(buf, format='png', pil_kwargs={"compress_level": 0}, **opcoes)
+
+        from PIL import Image
+
+        # Garantir RGB (sem alpha)
+        buf.seek(0)
+        im_final = Image.open(buf)
+        if im_final.mode == 'RGBA':
+            im_final = im_final.convert('RGB')
+        buf_rgb = io.BytesIO()
+        im_final.save(buf_rgb, format='PNG')
+        return buf_rgb.getvalue()
+
+
+@lru_cache(maxsize=FUNDOS_MINICHART)
+def _fundo_minichart(serasa_vals, finscore_vals) -> _FundoMinichart:
+    return _FundoMinichart(serasa_vals, finscore_vals)
+
+
+def _minichart_bytes(serasa_score, finscore_score, serasa_vals, finscore_vals, formato) -> bytes:
+    """Imagem memorizada por scores, faixas e formato, com descarte LRU."""
+    chave = (float(serasa_score), float(finscore_score), serasa_vals, finscore_vals, formato)
+    imagem = _MINICHARTS.obter(chave)
+    if imagem is None:
+        fundo = _fundo_minichart(serasa_vals, finscore_vals)
+        imagem = _MINICHARTS.guardar(
+            chave, fundo.renderizar(float(serasa_score), float(finscore_score), formato)
+        )
+    return imagem
+
+
 def gerar_minichart_serasa_finscore(
     serasa_score: float,
     finscore_score: float,
     serasa_vals: Tuple[float, float, float, float] = (300, 500, 700, 1000),
     finscore_vals: Tuple[float, float, float, float, float] = (125, 250, 750, 875, 1000),
     return_base64: bool = False,
-    output_path: Optional[str] = None
+    output_path: Optional[str] = None,
+    formato: str = "png",
 ) -> str:
     """
     Gera imagem comparativa lado a lado dos minicharts Serasa e FinScore.
+
+    Barras, eixos e logos de cada conjunto de faixas são montados uma vez
+    (``_fundo_minichart``); a cada chamada só a linha do score e os rótulos
+    são reposicionados. A imagem pronta fica memorizada por scores, faixas e
+    formato (até ``MINICHARTS_MEMORIZADOS`` entradas, descarte LRU).
     
     Args:
         serasa_score: Pontuação Serasa (0-1000)
@@ -104,124 +272,26 @@ def gerar_minichart_serasa_finscore(
         finscore_vals: Valores de referência das 5 categorias FinScore
         return_base64: Se True, retorna string base64 da imagem
         output_path: Se fornecido, salva a imagem neste caminho
+        formato: 'png' (RGB, 250 dpi) ou 'svg' (vetorial, sem rasterizar os
+            gráficos; só os logos seguem embutidos como imagem)
     
     Returns:
         Caminho do arquivo salvo, string base64 ou string vazia em caso de erro
     """
-    # Categorias
-    serasa_cats = ["Muito\nBaixo", "Baixo", "Bom", "Excelente"]
-    finscore_cats = ["M.\nAcima", "L.\nAcima", "Neutro", "L.\nAbaixo", "M.\nAbaixo"]
+    if formato not in FORMATOS_MINICHART:
+        raise ValueError(f"Formato de minichart desconhecido: {formato!r}. Use {list(FORMATOS_MINICHART)}.")
 
-    # Dois eixos lado a lado, bem próximos
-    fig, (axL, axR) = plt.subplots(
-        1, 2, figsize=(10.0, 3.0), dpi=250, gridspec_kw=dict(wspace=0.06)
+    imagem = _minichart_bytes(
+        serasa_score, finscore_score, tuple(serasa_vals), tuple(finscore_vals), formato
     )
-    fig.patch.set_facecolor("#FDFAFB")
-    fig.patch.set_alpha(1.0)
-
-    # Desenho dos minicharts
-    _draw_minichart(axL, serasa_cats, serasa_vals, TEAL_PASTEL, score=serasa_score)
-    _draw_minichart(axR, finscore_cats, finscore_vals, BLUE_PASTEL, score=finscore_score)
-
-    # Margens
-    plt.subplots_adjust(left=0.06, right=0.99, top=0.92, bottom=0.30, wspace=0.06)
-
-    # Logos embaixo dos gráficos (centralizados e pequenos)
-    try:
-        logo_serasa_rgb = _compose_logo_on_bg(LOGO_SERASA)
-        logo_finscore_rgb = _compose_logo_on_bg(LOGO_FINSCORE)
-        
-        if logo_serasa_rgb and logo_finscore_rgb:
-            imagebox_serasa = OffsetImage(logo_serasa_rgb, zoom=0.06)
-            boxL = axL.get_position()
-            # Posição em coordenadas da figura (60px para a esquerda, 20px para baixo)
-            offset_x = 60 / (fig.get_figwidth() * fig.dpi)
-            offset_y = 20 / (fig.get_figheight() * fig.dpi)
-            ab_serasa = AnnotationBbox(
-                imagebox_serasa, 
-                xy=(boxL.x0 + boxL.width/2 - offset_x, boxL.y0 - 0.10 - offset_y),
-                xycoords='figure fraction',
-                frameon=False,
-                box_alignment=(0.5, 1.0)
-            )
-            fig.add_artist(ab_serasa)
-
-            imagebox_finscore = OffsetImage(logo_finscore_rgb, zoom=0.06)
-            boxR = axR.get_position()
-            ab_finscore = AnnotationBbox(
-                imagebox_finscore,
-                xy=(boxR.x0 + boxR.width/2 - offset_x, boxR.y0 - 0.10 - offset_y),
-                xycoords='figure fraction',
-                frameon=False,
-                box_alignment=(0.5, 1.0)
-            )
-            fig.add_artist(ab_finscore)
-        else:
-            # Fallback para texto
-            _add_text_fallback(fig, axL, axR)
-    except Exception as e:
-        print(f"Aviso: Não foi possível carregar os logos: {e}")
-        _add_text_fallback(fig, axL, axR)
 
     # Retornar em diferentes formatos
-    if return_base64:
-        # Salvar em buffer e converter para base64
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches="tight", 
-                   facecolor=fig.get_facecolor(), edgecolor='none', 
-                   transparent=False)
-        buf.seek(0)
-        
-        # Garantir RGB (sem alpha)
-        im_final = Image.open(buf)
-        if im_final.mode == 'RGBA':
-            im_final = im_final.convert('RGB')
-        
-        buf_rgb = io.BytesIO()
-        im_final.save(buf_rgb, format='PNG')
-        buf_rgb.seek(0)
-        
-        plt.close(fig)
-        return base64.b64encode(buf_rgb.read()).decode('utf-8')
-    
-    elif output_path:
+    if output_path and not return_base64:
         # Salvar em arquivo
-        fig.savefig(output_path, bbox_inches="tight", 
-                   facecolor=fig.get_facecolor(), edgecolor='none', 
-                   transparent=False)
-        
-        # Pós-processamento: garantir RGB
-        try:
-            im_final = Image.open(output_path)
-            if im_final.mode == 'RGBA':
-                im_final = im_final.convert('RGB')
-                im_final.save(output_path)
-        except Exception as e:
-            print(f"Aviso ao converter PNG final para RGB: {e}")
-        
-        plt.close(fig)
+        with open(output_path, "wb") as arquivo:
+            arquivo.write(imagem)
         return output_path
-    
-    else:
-        # Salvar em buffer temporário e retornar base64
-        buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches="tight",
-                   facecolor=fig.get_facecolor(), edgecolor='none',
-                   transparent=False)
-        buf.seek(0)
-        plt.close(fig)
-        return base64.b64encode(buf.read()).decode('utf-8')
-
-
-def _add_text_fallback(fig, axL, axR):
-    """Adiciona labels de texto quando os logos não estão disponíveis"""
-    fig.canvas.draw()
-    boxL = axL.get_position()
-    boxR = axR.get_position()
-    fig.text(boxL.x0 + boxL.width/2, boxL.y0 - 0.10, "Serasa",
-             ha="center", va="top", fontsize=10, color="#303030")
-    fig.text(boxR.x0 + boxR.width/2, boxR.y0 - 0.10, "FinScore",
-             ha="center", va="top", fontsize=10, fontweight="bold", color="#303030")
+    return base64.b64encode(imagem).decode('utf-8')
 
 
 def obter_valores_faixas_serasa(classificacao: str) -> Tuple[float, float, float, float]:
@@ -1,13 +1,39 @@
 # app_front/services/finscore_service.py
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
 try:
-    from finscore_v2 import FinScoreOutput, executar_finscore, validar_contrato
+    from finscore_v2 import (
+        BaseCenarios,
+        FinScoreOutput,
+        dataframe_sha256,
+        executar_finscore,
+        executar_finscore_incremental,
+        pivotar_grade,
+        preparar_base_cenarios,
+        preparar_dados_contabeis,
+        simular_what_if,
+        validar_contrato,
+        varrer_grade_cenarios,
+    )
 except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
-    from app_front.finscore_v2 import FinScoreOutput, executar_finscore, validar_contrato
+    from app_front.finscore_v2 import (
+        BaseCenarios,
+        FinScoreOutput,
+        dataframe_sha256,
+        executar_finscore,
+        executar_finscore_incremental,
+        pivotar_grade,
+        preparar_base_cenarios,
+        preparar_dados_contabeis,
+        simular_what_if,
+        validar_contrato,
+        varrer_grade_cenarios,
+    )
+
+from .result_store import ResultStore, chave_resultado
 
 
 DEFAULT_SIMULATIONS = 1000
@@ -232,6 +258,51 @@ def _add_transitional_aliases(
     return output
 
 
+def _hash_base_reportada(df_ajustado) -> Optional[str]:
+    """Hash dos dados reportados, ou ``None`` se a base nem chega ao motor."""
+    try:
+        reported, _ = preparar_dados_contabeis(df_ajustado)
+    except (TypeError, ValueError):
+        return None
+    return dataframe_sha256(reported)
+
+
+def _mesma_base_reportada(anterior: Optional[dict], reported_hash: Optional[str]) -> bool:
+    """Indica se ``anterior`` foi calculado sobre os mesmos dados reportados."""
+    if not isinstance(anterior, dict) or "hash_dados_reportados" not in anterior:
+        return False
+    return reported_hash is not None and reported_hash == anterior["hash_dados_reportados"]
+
+
+def preparar_what_if(output: Optional[dict]) -> Optional[BaseCenarios]:
+    """
+    Pré-calcula o estado do simulador what-if a partir de um resultado do motor.
+
+    Retorna ``None`` quando o cálculo foi bloqueado (sem perfis PCA observados).
+    Os perfis ficam fixos: cada ``simular_what_if`` só refaz choques e scores.
+    """
+    if not isinstance(output, dict):
+        return None
+    if not output.get("status_qualidade", {}).get("apto_calculo", False):
+        return None
+    profiles = output.get("pca_observado")
+    analysis = output.get("df_contas_analise")
+    if not profiles or not isinstance(analysis, pd.DataFrame):
+        return None
+    return preparar_base_cenarios(analysis, profiles)
+
+
+def _progresso_motor(report: Callable[[str, float], None]) -> Callable[..., None]:
+    """Encaixa as etapas do motor na faixa 0,05–0,95 de ``run_finscore``."""
+
+    def engine_progress(etapa: str, fracao: float, contagens: Dict[str, int]) -> None:
+        if contagens:
+            etapa = f"{etapa} ({contagens['aceitos']}/{contagens['alvo']})"
+        report(etapa, 0.05 + 0.9 * fracao)
+
+    return engine_progress
+
+
 def run_finscore(
     df,
     meta: Dict,
@@ -239,11 +310,28 @@ def run_finscore(
     executar_simulacoes: Optional[bool] = None,
     numero_simulacoes: Optional[int] = None,
     semente: Optional[int] = None,
+    anterior: Optional[dict] = None,
+    armazenamento: Optional[ResultStore] = None,
+    progresso: Optional[Callable[[str, float], None]] = None,
+    cancelamento: Optional[Any] = None,
 ) -> dict[str, Any]:
     """
     Recebe o DataFrame contábil e o dicionário meta (empresa, cnpj, anos, serasa)
     e retorna o dicionário 'resultado' pronto para ir ao session_state['out'].
+
+    Quando ``anterior`` foi calculado sobre os mesmos dados reportados, o motor
+    roda em modo incremental: só as etapas afetadas pelas correções manuais de
+    ``meta`` são refeitas. Com ``armazenamento``, uma saída já gravada para os
+    mesmos dados, correções e opções é devolvida sem recalcular; caso contrário
+    o resultado novo é gravado.
+
+    ``progresso(etapa, fracao)``, quando informado, recebe as etapas do
+    processamento com a fração concluída entre 0 e 1, inclusive as do motor
+    (com aceitos/alvo durante o Monte Carlo). ``cancelamento`` (por exemplo um
+    ``threading.Event``) é repassado ao motor, que levanta
+    ``ExecucaoCancelada`` quando ele é acionado.
     """
+    report = progresso or (lambda etapa, fracao: None)
     ano_i = _coerce_int(meta.get("ano_inicial"))
     ano_f = _coerce_int(meta.get("ano_final"))
     if ano_i is None or ano_f is None:
@@ -259,22 +347,47 @@ def run_finscore(
     )
 
     df_ajustado, anos_rotulos = ajustar_coluna_ano(df, ano_i, ano_f)
-    resultado = executar_finscore(
-        df_ajustado,
-        serasa_score=serasa,
-        serasa_data=str(meta.get("serasa_data") or "") or None,
-        serasa_restricao_grave=_coerce_bool(
+    options = {
+        "serasa_score": serasa,
+        "serasa_data": str(meta.get("serasa_data") or "") or None,
+        "serasa_restricao_grave": _coerce_bool(
             meta.get("serasa_restricao_grave", False),
             field="serasa_restricao_grave",
         ),
-        correcoes_manuais=_normalizar_correcoes_manuais(
-            meta.get("correcoes_manuais")
-        ),
-        executar_simulacoes=run_simulations,
-        numero_simulacoes=simulations,
-        semente=seed,
+        "executar_simulacoes": run_simulations,
+        "numero_simulacoes": simulations,
+        "semente": seed,
+    }
+    corrections = _normalizar_correcoes_manuais(meta.get("correcoes_manuais"))
+    reported_hash = _hash_base_reportada(df_ajustado)
+    store_key = (
+        chave_resultado(reported_hash, corrections, options)
+        if armazenamento is not None and reported_hash is not None
+        else None
     )
-    validar_contrato(resultado)
+    if store_key is not None:
+        report("consultando resultados gravados", 0.02)
+    resultado = armazenamento.obter(store_key) if store_key is not None else None
+    if resultado is None:
+        report("executando o motor", 0.05)
+        engine_options = {
+            **options,
+            "progresso": _progresso_motor(report) if progresso is not None else None,
+            "cancelamento": cancelamento,
+        }
+        if _mesma_base_reportada(anterior, reported_hash):
+            resultado = executar_finscore_incremental(
+                anterior, corrections, substituir_correcoes=True, **engine_options
+            )
+        else:
+            resultado = executar_finscore(
+                df_ajustado, correcoes_manuais=corrections, **engine_options
+            )
+        report("validando o contrato", 0.95)
+        validar_contrato(resultado)
+        if store_key is not None:
+            report("gravando o resultado", 0.97)
+            armazenamento.gravar(store_key, resultado)
 
     anos_para_usar: Optional[List[int]] = anos_rotulos
     if not anos_para_usar:
@@ -288,4 +401,5 @@ def run_finscore(
     if anos_para_usar:
         meta["anos_rotulos"] = anos_para_usar
 
+    report("concluído", 1.0)
     return _add_transitional_aliases(resultado, meta)
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict, Optional, Tuple
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from pandas.io.parsers import TextParser
 
 try:
     from finscore_v2 import preparar_dados_contabeis
@@ -18,6 +23,18 @@ except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes
 
 SHEET_NAME = "lancamentos"
 EXPECTED_COLUMNS = ("ano", *PRIMARY)
+# Linhas de dados lidas após o cabeçalho. O Pudim exige três exercícios; os
+# modelos de clientes costumam trazer centenas de linhas vazias formatadas, e a
+# folga apenas permite que linhas excedentes ainda sejam reportadas.
+MAX_DATA_ROWS = 50
+CSV_ENCODINGS = ("utf-8-sig", "cp1252")
+# Células de CSV separado por ``;``: vírgula decimal (``1.234,56``) ou ponto
+# decimal com até duas casas (``1234.56``), que o ponto de milhar leria errado.
+_CSV_VIRGULA_DECIMAL = re.compile(r"^-?[\d.]*\d,\d+$")
+_CSV_PONTO_DECIMAL = re.compile(r"^-?\d+\.\d{1,2}$")
+INPUT_FORMATS = {".xlsx": "xlsx", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+COMPANY_COLUMN = "empresa"
+BATCH_REPORT_COLUMNS = [COMPANY_COLUMN, *QUALITY_COLUMNS]
 IMPORT_REPORT_ATTR = "finscore_import_report"
 EXTRA_COLUMNS_ATTR = "finscore_extra_columns"
 IMPORT_REPORT_DISPLAY_COLUMNS = [
@@ -74,13 +91,103 @@ def validar_cliente(meta: Dict[str, Any]) -> Dict[str, str]:
     return errors
 
 
-def _sheet_name_case_insensitive(xls: pd.ExcelFile, wanted: str) -> Optional[str]:
-    for sheet in xls.sheet_names:
+def _sheet_name_case_insensitive(sheet_names: Iterable[str], wanted: str) -> Optional[str]:
+    for sheet in sheet_names:
         if str(sheet).strip().casefold() == wanted.casefold():
             return sheet
     return None
 
 
+def _convert_cell(cell) -> Any:
+    """Converte a célula como o leitor openpyxl do pandas (``read_excel``)."""
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        integer = int(value)
+        return integer if integer == value else float(value)
+    return value
+
+
+def _input_source(upload_or_url):
+    """Evita copiar o upload: os leitores usam direto o buffer do Streamlit."""
+    if hasattr(upload_or_url, "seek") and hasattr(upload_or_url, "read"):
+        upload_or_url.seek(0)
+        return upload_or_url
+    if hasattr(upload_or_url, "getvalue"):
+        return BytesIO(upload_or_url.getvalue())
+    if isinstance(upload_or_url, str) and "://" in upload_or_url:
+        from urllib.request import urlopen
+
+        with urlopen(upload_or_url) as response:
+            return BytesIO(response.read())
+    return upload_or_url
+
+
+def ler_aba_lancamentos(
+    upload_or_path,
+    *,
+    max_linhas: int | None = MAX_DATA_ROWS,
+    sheet_name: str = SHEET_NAME,
+) -> tuple[pd.DataFrame, str]:
+    """Lê somente o cabeçalho e as primeiras ``max_linhas`` linhas da aba.
+
+    A pasta é aberta em modo somente leitura com valores calculados; as demais
+    abas nunca são carregadas. O resultado equivale a
+    ``pd.read_excel(..., sheet_name=aba, nrows=max_linhas)``. Use
+    ``max_linhas=None`` para ler a aba inteira.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(
+        _input_source(upload_or_path),
+        read_only=True,
+        data_only=True,
+        keep_links=False,
+    )
+    try:
+        sheet = _sheet_name_case_insensitive(workbook.sheetnames, sheet_name)
+        if sheet is None:
+            raise ValueError(
+                f"A planilha deve conter a aba '{sheet_name}'. "
+                f"Abas encontradas: {workbook.sheetnames}"
+            )
+        return _worksheet_to_frame(workbook[sheet], max_linhas), sheet
+    finally:
+        workbook.close()
+
+
+def _worksheet_to_frame(worksheet, max_linhas: int | None) -> pd.DataFrame:
+    worksheet.reset_dimensions()
+    rows_needed = None if max_linhas is None else max_linhas + 1
+    data: list[list[Any]] = []
+    last_row_with_data = -1
+    for row in worksheet.iter_rows(max_row=rows_needed):
+        converted = [_convert_cell(cell) for cell in row]
+        while converted and converted[-1] == "":
+            converted.pop()
+        if converted:
+            last_row_with_data = len(data)
+        data.append(converted)
+
+    data = data[: last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame()
+    width = max(len(row) for row in data)
+    data = [row + [""] * (width - len(row)) for row in data]
+    # Mesmo parser do ``read_excel``: NaN para vazios/textos nulos e inferência
+    # de tipos por coluna idêntica à leitura completa.
+    parser = TextParser(data, header=0, skip_blank_lines=False)
+    try:
+        return parser.read()
+    finally:
+        parser.close()
+
+
 def _normalize_column_labels(df: pd.DataFrame) -> pd.DataFrame:
     normalized = df.copy()
     normalized.columns = [str(column).strip() for column in normalized.columns]
@@ -158,35 +265,244 @@ def obter_colunas_extras(df: pd.DataFrame | None) -> list[str]:
     return list(value) if isinstance(value, (list, tuple)) else []
 
 
+def _input_format(upload_or_url) -> str:
+    name = getattr(upload_or_url, "name", None)
+    if not isinstance(name, str):
+        name = str(upload_or_url) if isinstance(upload_or_url, (str, Path)) else ""
+    return INPUT_FORMATS.get(Path(name.split("?")[0]).suffix.lower(), "xlsx")
+
+
+def _read_source_bytes(upload_or_url) -> bytes:
+    source = _input_source(upload_or_url)
+    if hasattr(source, "read"):
+        return source.read()
+    return Path(source).read_bytes()
+
+
+def _convencao_decimal_csv(text: str) -> dict[str, str]:
+    cells = [
+        cell.strip().strip('"')
+        for line in text.splitlines()[1:]
+        for cell in line.split(";")
+    ]
+    comma = any(_CSV_VIRGULA_DECIMAL.match(cell) for cell in cells)
+    dot = [cell for cell in cells if _CSV_PONTO_DECIMAL.match(cell)]
+    if dot and comma:
+        raise ValueError(
+            "CSV mistura vírgula e ponto como separador decimal "
+            f"(ex.: {dot[0]}); use 1.234,56 em todos os valores."
+        )
+    if dot:
+        return {"decimal": "."}
+    return {"decimal": ",", "thousands": "."}
+
+
+def ler_csv_lancamentos(upload_or_path) -> pd.DataFrame:
+    """Lê um CSV no esquema de ``lancamentos``.
+
+    Arquivos separados por ``;`` seguem a convenção brasileira (vírgula decimal
+    e ponto de milhar), salvo quando os valores usam ponto decimal (``1234.56``)
+    e nenhum usa vírgula; separados por ``,`` usam ponto decimal. O encoding é
+    UTF-8, com recuo para Windows-1252.
+    """
+    content = _read_source_bytes(upload_or_path)
+    for encoding in CSV_ENCODINGS:
+        try:
+            text = content.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"Codificação do CSV não reconhecida; use {CSV_ENCODINGS[0]}.")
+    header = text.lstrip().partition("\n")[0]
+    if header.count(";") >= header.count(","):
+        options = {"sep": ";", **_convencao_decimal_csv(text)}
+    else:
+        options = {"sep": ",", "decimal": "."}
+    return pd.read_csv(StringIO(text), **options)
+
+
+def ler_parquet_lancamentos(upload_or_path) -> tuple[pd.DataFrame, list[str]]:
+    """Lê um Parquet projetando somente ``ano`` e as contas de ``PRIMARY``.
+
+    Retorna também os nomes das colunas adicionais, que não são carregadas.
+    Quando falta alguma coluna obrigatória, o arquivo é lido inteiro para que a
+    validação produza a mesma mensagem da planilha.
+    """
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(_input_source(upload_or_path))
+    names = list(parquet.schema_arrow.names)
+    by_label = {str(name).strip(): name for name in names}
+    extra = [str(name).strip() for name in names if str(name).strip() not in EXPECTED_COLUMNS]
+    if all(column in by_label for column in EXPECTED_COLUMNS):
+        table = parquet.read(columns=[by_label[column] for column in EXPECTED_COLUMNS])
+    else:
+        table = parquet.read()
+    return table.to_pandas(), extra
+
+
 def ler_planilha(
     upload_or_url,
 ) -> Tuple[Optional[pd.DataFrame], Optional[str], Optional[str]]:
-    """Lê exclusivamente a aba ``lancamentos`` e preserva dados reportados."""
+    """Lê a aba ``lancamentos`` (ou CSV/Parquet no mesmo esquema) e preserva dados reportados."""
     try:
-        source = upload_or_url
-        if hasattr(upload_or_url, "getvalue"):
-            source = BytesIO(upload_or_url.getvalue())
-
-        workbook = pd.ExcelFile(source, engine="openpyxl")
-        sheet = _sheet_name_case_insensitive(workbook, SHEET_NAME)
-        if sheet is None:
-            raise ValueError(
-                f"A planilha deve conter a aba '{SHEET_NAME}'. "
-                f"Abas encontradas: {workbook.sheet_names}"
-            )
-        raw = pd.read_excel(workbook, sheet_name=sheet, engine="openpyxl")
+        input_format = _input_format(upload_or_url)
+        extra = None
+        if input_format == "csv":
+            raw, sheet = ler_csv_lancamentos(upload_or_url), f"{SHEET_NAME} (csv)"
+        elif input_format == "parquet":
+            raw, extra = ler_parquet_lancamentos(upload_or_url)
+            sheet = f"{SHEET_NAME} (parquet)"
+        else:
+            raw, sheet = ler_aba_lancamentos(upload_or_url)
         validated, _ = validar_dataframe_importado(raw)
+        if extra is not None:
+            validated.attrs[EXTRA_COLUMNS_ATTR] = extra
         return validated, sheet, None
-    except ImportError:
+    except ImportError as error:
+        dependency = {"xlsx": "openpyxl", "parquet": "pyarrow"}.get(
+            _input_format(upload_or_url), error.name or "openpyxl"
+        )
         return (
             None,
             None,
-            "Dependência 'openpyxl' ausente. Instale as dependências do projeto.",
+            f"Dependência '{dependency}' ausente. Instale as dependências do projeto.",
         )
     except Exception as error:
         return None, None, str(error)
 
 
+def _batch_issue(company: str, kind: str, detail: str, *, critical: bool = True) -> dict[str, Any]:
+    return {
+        COMPANY_COLUMN: company,
+        "severidade": "CRITICA" if critical else "AVISO",
+        "tipo": kind,
+        "conta": "",
+        "exercicios": "",
+        "detalhe": detail,
+        "bloqueia_calculo": critical,
+        "bloqueia_decisao": critical,
+        "bloqueia_score": critical,
+    }
+
+
+def _split_batch_sheet(
+    sheet: str,
+    table: pd.DataFrame,
+    company_column: str,
+) -> tuple[list[tuple[str, pd.DataFrame]], list[dict[str, Any]]]:
+    """Separa uma aba em empresas: formato longo pela chave ou uma aba por empresa."""
+    labels = [str(column).strip() for column in table.columns]
+    if company_column in labels:
+        position = labels.index(company_column)
+        keys = table.iloc[:, position].map(
+            lambda value: "" if pd.isna(value) else str(value).strip()
+        )
+        issues = []
+        if keys.eq("").any():
+            rows = (table.index[keys.eq("")] + 2).tolist()
+            issues.append(
+                _batch_issue(
+                    "",
+                    "empresa_sem_chave",
+                    f"Aba {sheet}: linhas sem '{company_column}' foram ignoradas: {rows}",
+                )
+            )
+        body = table.drop(columns=table.columns[position])
+        groups = [
+            (key, body.loc[keys.eq(key)])
+            for key in dict.fromkeys(keys[keys.ne("")])
+        ]
+        return groups, issues
+    if "ano" not in labels:
+        return [], [
+            _batch_issue(
+                str(sheet),
+                "aba_ignorada",
+                f"Aba {sheet} sem coluna 'ano' nem '{company_column}'; não foi importada.",
+                critical=False,
+            )
+        ]
+    return [(str(sheet).strip(), table)], []
+
+
+def _validate_company(company: str, table: pd.DataFrame) -> tuple[pd.DataFrame | None, pd.DataFrame]:
+    try:
+        validated, report = validar_dataframe_importado(table.reset_index(drop=True))
+    except Exception as error:
+        report = pd.DataFrame([_batch_issue(company, "erro_importacao", str(error))])
+        return None, report.loc[:, BATCH_REPORT_COLUMNS]
+    report = report.copy()
+    report.insert(0, COMPANY_COLUMN, company)
+    return validated, report
+
+
+def ler_planilha_lote(
+    upload_or_path,
+    *,
+    coluna_empresa: str = COMPANY_COLUMN,
+    max_workers: int | None = None,
+) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """Importa uma pasta consolidada com várias empresas em uma única leitura.
+
+    Aceita uma aba por empresa (o nome da aba identifica a empresa) e/ou abas em
+    formato longo com a coluna ``coluna_empresa``. Cada empresa passa pela mesma
+    validação de ``ler_planilha``, em paralelo. Retorna as bases aceitas,
+    na ordem de leitura, e as ocorrências por empresa em ``QUALITY_COLUMNS``;
+    empresas com erro de esquema ficam fora das bases e constam no relatório.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(
+        _input_source(upload_or_path),
+        read_only=True,
+        data_only=True,
+        keep_links=False,
+    )
+    companies: dict[str, pd.DataFrame] = {}
+    issues: list[dict[str, Any]] = []
+    try:
+        for worksheet in workbook.worksheets:
+            table = _worksheet_to_frame(worksheet, None)
+            if table.empty:
+                continue
+            groups, sheet_issues = _split_batch_sheet(worksheet.title, table, coluna_empresa)
+            issues.extend(sheet_issues)
+            for company, frame in groups:
+                if company in companies:
+                    issues.append(
+                        _batch_issue(
+                            company,
+                            "empresa_duplicada",
+                            f"Empresa repetida na aba {worksheet.title}; mantida a primeira ocorrência.",
+                        )
+                    )
+                    continue
+                companies[company] = frame
+    finally:
+        workbook.close()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        validated = list(
+            executor.map(lambda item: _validate_company(*item), companies.items())
+        )
+
+    bases: dict[str, pd.DataFrame] = {}
+    reports = [pd.DataFrame(issues, columns=BATCH_REPORT_COLUMNS)]
+    for company, (data, report) in zip(companies, validated):
+        if data is not None:
+            bases[company] = data
+        reports.append(report)
+    reports = [report for report in reports if not report.empty]
+    combined = (
+        pd.concat(reports, ignore_index=True)
+        if reports
+        else pd.DataFrame(columns=BATCH_REPORT_COLUMNS)
+    )
+    return bases, combined.loc[:, BATCH_REPORT_COLUMNS]
+
+
 def check_minimo(df: pd.DataFrame) -> Dict[str, list]:
     """Compatibilidade temporária com a view, agora cobrindo todo o Pudim."""
     columns = set(df.columns) if isinstance(df, pd.DataFrame) else set()
@@ -0,0 +1,71 @@
+"""Memória LRU limitada e segura entre threads para caches do processo.
+
+Figuras dos gráficos, minicharts do parecer e planilhas em geração guardam
+poucas entradas caras por chave; ao passar de ``limite`` sai a usada há mais
+tempo. ``limite`` pode ser alterado depois da criação.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class MemoriaLRU:
+    """Até ``limite`` entradas; a consultada há mais tempo sai primeiro."""
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self._entradas: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        """Valor de ``chave``, marcado como recente, ou ``None``."""
+        with self._lock:
+            valor = self._entradas.get(chave)
+            if valor is not None:
+                self._entradas.move_to_end(chave)
+            return valor
+
+    def guardar(self, chave: Hashable, valor: Any) -> Any:
+        """Guarda ``valor`` se ``chave`` ainda não existe e devolve o valor guardado.
+
+        Duas threads que montaram o mesmo valor ao mesmo tempo recebem o mesmo
+        objeto: vale o primeiro guardado.
+        """
+        with self._lock:
+            valor = self._entradas.setdefault(chave, valor)
+            self._usar(chave)
+            return valor
+
+    def obter_ou_criar(self, chave: Hashable, criar: Callable[[], Any]) -> Any:
+        """Valor de ``chave``; na falta, guarda ``criar()``.
+
+        ``criar`` roda sob o lock, então deve ser rápido (por exemplo, enviar
+        o trabalho a um executor e devolver o ``Future``).
+        """
+        with self._lock:
+            valor = self._entradas.get(chave)
+            if valor is None:
+                valor = self._entradas[chave] = criar()
+            self._usar(chave)
+            return valor
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def chaves(self) -> list[Hashable]:
+        """Chaves da menos para a mais recente."""
+        with self._lock:
+            return list(self._entradas)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entradas)
+
+    def _usar(self, chave: Hashable) -> None:
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.limite:
+            self._entradas.popitem(last=False)
@@ -0,0 +1,253 @@
+"""Armazenamento persistente de saídas do motor FinScore Pudim.
+
+Os resultados sobrevivem a login, recarga de página e expiração de sessão: um
+índice SQLite guarda as chaves e metadados, e cada saída fica em uma pasta com
+um único ``saida.fsz`` gravado por ``finscore_v2.gravar_saida`` (segmentos
+Arrow IPC e um manifesto JSON, sem ``pickle``). Dicionários, escalares, perfis
+PCA e colunas que o Arrow não representa vão para o manifesto.
+
+A chave combina tudo o que determina o cálculo: hash dos dados reportados,
+correções manuais (que junto com eles determinam ``hash_dados_utilizados``),
+versão e hash do código do modelo, versão do contrato, semente, configuração de
+simulações e entradas Serasa. Quando o tamanho total passa do limite, as saídas
+menos acessadas recentemente são removidas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional
+
+import pyarrow as pa
+
+try:
+    from finscore_v2 import CONTRACT_VERSION, carregar_saida, core, gravar_saida
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.finscore_v2 import CONTRACT_VERSION, carregar_saida, core, gravar_saida
+
+
+DEFAULT_DIR = Path(__file__).resolve().parents[1] / ".resultados"
+DEFAULT_MAX_MB = 512
+_INDEX_NAME = "indice.sqlite3"
+_OUTPUT_NAME = "saida.fsz"
+# Pastas que ``gravar`` cria: ``<chave[:16]>-<8 hex>``, com prefixo ``.tmp-``
+# enquanto a saída é escrita. Outras pastas do diretório não são do armazenamento.
+# Erros de uma saída ilegível (truncada, editada ou de outro contrato): a
+# leitura vira falta no cache e a entrada é descartada.
+_SAIDA_ILEGIVEL = (
+    OSError,
+    ValueError,
+    KeyError,
+    IndexError,
+    TypeError,
+    AttributeError,
+    struct.error,
+    pa.ArrowException,
+)
+_PASTA_SAIDA = re.compile(r"(\.tmp-)?[^/\\]{1,16}-[0-9a-f]{8}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    chave TEXT PRIMARY KEY,
+    pasta TEXT NOT NULL,
+    hash_dados_reportados TEXT NOT NULL,
+    hash_dados_utilizados TEXT NOT NULL,
+    versao_modelo TEXT NOT NULL,
+    hash_codigo_modelo TEXT NOT NULL,
+    semente INTEGER NOT NULL,
+    numero_simulacoes INTEGER NOT NULL,
+    tamanho_bytes INTEGER NOT NULL,
+    criado_em REAL NOT NULL,
+    ultimo_acesso REAL NOT NULL,
+    acessos INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def chave_resultado(
+    hash_dados_reportados: str,
+    correcoes_manuais: list[dict[str, Any]],
+    opcoes: dict[str, Any],
+) -> str:
+    """Chave determinística de uma execução do motor.
+
+    ``opcoes`` são os argumentos nomeados repassados a ``executar_finscore``
+    (Serasa, simulações e semente).
+    """
+    payload = {
+        "hash_dados_reportados": hash_dados_reportados,
+        "correcoes_manuais": sorted(
+            (json.dumps(item, sort_keys=True, default=str) for item in correcoes_manuais)
+        ),
+        "opcoes": {key: opcoes[key] for key in sorted(opcoes)},
+        "versao_modelo": core.VERSAO_MODELO,
+        "hash_codigo_modelo": core.HASH_CODIGO_MODELO,
+        "contrato_versao": CONTRACT_VERSION,
+    }
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """Índice SQLite e saídas serializadas em ``diretorio``, limitados a ``max_bytes``."""
+
+    def __init__(self, diretorio: Path | str = DEFAULT_DIR, *, max_bytes: int | None = None):
+        self.diretorio = Path(diretorio)
+        self.max_bytes = int(max_bytes if max_bytes is not None else DEFAULT_MAX_MB * 1024**2)
+        if self.max_bytes <= 0:
+            raise ValueError("O limite do armazenamento deve ser positivo.")
+        self._lock = threading.Lock()
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        with closing(self._conectar()) as connection, connection:
+            connection.execute(_SCHEMA)
+
+    def _conectar(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.diretorio / _INDEX_NAME, timeout=30)
+
+    def obter(self, chave: str) -> Optional[dict[str, Any]]:
+        """Carrega a saída de ``chave`` ou ``None`` se ausente ou ilegível."""
+        with closing(self._conectar()) as connection, connection:
+            row = connection.execute(
+                "SELECT pasta FROM resultados WHERE chave = ?", (chave,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE resultados SET ultimo_acesso = ?, acessos = acessos + 1 "
+                "WHERE chave = ?",
+                (time.time(), chave),
+            )
+        try:
+            return carregar_saida(self.diretorio / row[0] / _OUTPUT_NAME)
+        except _SAIDA_ILEGIVEL:
+            # Blob corrompido ou de outro contrato: descarta e recalcula.
+            self._remover([chave])
+            return None
+
+    def gravar(self, chave: str, resultado: dict[str, Any]) -> None:
+        """Grava ``resultado`` (write-through) e aplica o limite de tamanho."""
+        folder_name = f"{chave[:16]}-{uuid.uuid4().hex[:8]}"
+        staging = self.diretorio / f".tmp-{folder_name}"
+        staging.mkdir()
+        try:
+            size = gravar_saida(resultado, staging / _OUTPUT_NAME)
+            staging.rename(self.diretorio / folder_name)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        model = resultado["modelo"]
+        now = time.time()
+        with self._lock, closing(self._conectar()) as connection, connection:
+            previous = connection.execute(
+                "SELECT pasta FROM resultados WHERE chave = ?", (chave,)
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    chave,
+                    folder_name,
+                    resultado["hash_dados_reportados"],
+                    resultado["hash_dados_utilizados"],
+                    str(model["versao"]),
+                    str(model["hash_codigo"]),
+                    int(model["semente"]),
+                    int(model["numero_simulacoes"]),
+                    size,
+                    now,
+                    now,
+                ),
+            )
+        if previous is not None and previous[0] != folder_name:
+            shutil.rmtree(self.diretorio / previous[0], ignore_errors=True)
+        self._aplicar_limite()
+
+    def purgar(self, *, apenas_obsoletos: bool = False) -> int:
+        """Remove todas as saídas, ou só as de outro modelo; retorna quantas.
+
+        A limpeza completa também apaga pastas órfãs com o nome das que
+        ``gravar`` cria; outras pastas do diretório são preservadas.
+        """
+        query = "SELECT chave FROM resultados"
+        params: tuple[Any, ...] = ()
+        if apenas_obsoletos:
+            query += " WHERE versao_modelo != ? OR hash_codigo_modelo != ?"
+            params = (core.VERSAO_MODELO, core.HASH_CODIGO_MODELO)
+        with closing(self._conectar()) as connection:
+            keys = [row[0] for row in connection.execute(query, params)]
+        self._remover(keys)
+        if not apenas_obsoletos:
+            for orphan in self.diretorio.iterdir():
+                if orphan.is_dir() and _PASTA_SAIDA.fullmatch(orphan.name):
+                    shutil.rmtree(orphan, ignore_errors=True)
+        return len(keys)
+
+    def estatisticas(self) -> dict[str, Any]:
+        with closing(self._conectar()) as connection:
+            count, total = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho_bytes), 0) FROM resultados"
+            ).fetchone()
+        return {
+            "diretorio": str(self.diretorio),
+            "resultados": int(count),
+            "tamanho_bytes": int(total),
+            "limite_bytes": self.max_bytes,
+        }
+
+    def _aplicar_limite(self) -> None:
+        with closing(self._conectar()) as connection:
+            rows = connection.execute(
+                "SELECT chave, tamanho_bytes FROM resultados ORDER BY ultimo_acesso DESC"
+            ).fetchall()
+        kept = 0
+        evicted = []
+        for key, size in rows:
+            if kept + size <= self.max_bytes:
+                kept += size
+            else:
+                evicted.append(key)
+        self._remover(evicted)
+
+    def _remover(self, chaves: list[str]) -> None:
+        if not chaves:
+            return
+        with self._lock, closing(self._conectar()) as connection, connection:
+            for key in chaves:
+                row = connection.execute(
+                    "SELECT pasta FROM resultados WHERE chave = ?", (key,)
+                ).fetchone()
+                connection.execute("DELETE FROM resultados WHERE chave = ?", (key,))
+                if row is not None:
+                    shutil.rmtree(self.diretorio / row[0], ignore_errors=True)
+
+
+def obter_armazenamento() -> Optional[ResultStore]:
+    """Armazenamento configurado pelo ambiente, ou ``None`` se desativado.
+
+    ``FINSCORE_RESULTADOS`` = ``0`` desativa; ``FINSCORE_RESULTADOS_DIR`` e
+    ``FINSCORE_RESULTADOS_MAX_MB`` ajustam pasta e limite.
+    """
+    if os.environ.get("FINSCORE_RESULTADOS", "1").strip().lower() in {"0", "false", "nao", "não", "off"}:
+        return None
+    directory = Path(os.environ.get("FINSCORE_RESULTADOS_DIR") or DEFAULT_DIR)
+    max_mb = float(os.environ.get("FINSCORE_RESULTADOS_MAX_MB", DEFAULT_MAX_MB))
+    key = (directory.resolve(), max_mb)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = ResultStore(directory, max_bytes=int(max_mb * 1024**2))
+    return store
+
+
+_STORES: dict[tuple[Path, float], ResultStore] = {}
+_STORES_LOCK = threading.Lock()
@@ -0,0 +1,214 @@
+"""Pontuações em segundo plano para a interface Streamlit.
+
+``run_finscore`` dentro de ``st.spinner`` prendia a thread do script durante
+todo o cálculo: um timeout do navegador ou um rerun acidental recomeçava tudo.
+``submeter_pontuacao`` envia o cálculo a um executor compartilhado e devolve
+uma ``TarefaFinScore`` com etapa, fração concluída e resultado. O registro é
+do processo, não da sessão: a view guarda só o ``id`` (também na URL) e
+reencontra a tarefa após rerun, navegação ou recarga da página. O ``id`` da
+URL não basta para reabrir os dados enviados: a tarefa guarda também um
+segredo do navegador que a enviou (``pertence``), que não vai na URL.
+
+O executor tem um único worker, como o ``_REVIEW_EXECUTOR`` da análise:
+``executar_finscore`` publica estado em ``core`` e não pode rodar em duas
+threads ao mesmo tempo. Tarefas ainda na fila são canceladas imediatamente;
+uma tarefa em execução repassa ``cancelamento`` ao motor, que para no próximo
+bloco de simulações em vez de ocupar o executor até o fim. Outros usos do
+motor no processo, como o aquecimento, passam pelo mesmo worker
+(``executar_no_motor``).
+"""
+
+from __future__ import annotations
+
+import copy
+import hmac
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .finscore_service import run_finscore
+
+
+ESTADOS_FINAIS = ("concluida", "falhou", "cancelada")
+RETENCAO_SEGUNDOS = 3600
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finscore-tarefas")
+_TAREFAS: dict[str, "TarefaFinScore"] = {}
+_LOCK = threading.Lock()
+
+
+class TarefaCancelada(Exception):
+    """A tarefa foi cancelada antes de entregar o resultado."""
+
+
+@dataclass
+class TarefaFinScore:
+    """Estado de uma pontuação enviada ao executor."""
+
+    id: str
+    empresa: str
+    criada_em: float = field(default_factory=time.time)
+    estado: str = "na_fila"
+    etapa: str = "aguardando na fila"
+    progresso: float = 0.0
+    iniciada_em: Optional[float] = None
+    concluida_em: Optional[float] = None
+    erro: Optional[str] = None
+    rastreamento: Optional[str] = field(default=None, repr=False)
+    dados: Any = field(default=None, repr=False)
+    meta: dict = field(default_factory=dict, repr=False)
+    segredo: Optional[str] = field(default=None, repr=False)
+    cancelamento: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finalizada(self) -> bool:
+        return self.estado in ESTADOS_FINAIS
+
+    @property
+    def posicao_fila(self) -> int:
+        """Tarefas ainda não iniciadas à frente desta (0 se já iniciou)."""
+        if self.estado != "na_fila":
+            return 0
+        with _LOCK:
+            return sum(
+                1
+                for other in _TAREFAS.values()
+                if other.estado in ("na_fila", "executando") and other.criada_em < self.criada_em
+            )
+
+    def pertence(self, segredo: Optional[str]) -> bool:
+        """Se ``segredo`` é o do navegador que enviou a tarefa."""
+        if not self.segredo or not segredo:
+            return False
+        return hmac.compare_digest(self.segredo, str(segredo))
+
+    def resultado(self) -> dict[str, Any]:
+        """Saída de ``run_finscore``; levanta o erro da tarefa se falhou."""
+        if self.future is None or not self.finalizada:
+            raise RuntimeError("A tarefa ainda não terminou.")
+        if self.estado == "cancelada":
+            raise TarefaCancelada(self.id)
+        return self.future.result()
+
+    def cancelar(self) -> None:
+        """Cancela a tarefa; se já estiver executando, interrompe o motor."""
+        self.cancelamento.set()
+        if self.future is not None and self.future.cancel():
+            self._finalizar("cancelada", "cancelada")
+        elif not self.finalizada:
+            self.etapa = "cancelando"
+
+    def _atualizar(self, etapa: str, fracao: float) -> None:
+        self.etapa = etapa
+        self.progresso = max(self.progresso, min(max(float(fracao), 0.0), 1.0))
+
+    def _finalizar(
+        self,
+        estado: str,
+        etapa: str,
+        erro: Optional[str] = None,
+        rastreamento: Optional[str] = None,
+    ) -> None:
+        self.estado = estado
+        self.etapa = etapa
+        self.erro = erro
+        self.rastreamento = rastreamento
+        self.concluida_em = time.time()
+        # A tarefa fica retida por RETENCAO_SEGUNDOS; os dados enviados, não.
+        self.dados = None
+
+
+def _executar(tarefa: TarefaFinScore, opcoes: dict) -> dict[str, Any]:
+    tarefa.estado = "executando"
+    tarefa.iniciada_em = time.time()
+    try:
+        result = run_finscore(
+            tarefa.dados,
+            copy.deepcopy(tarefa.meta),
+            progresso=tarefa._atualizar,
+            cancelamento=tarefa.cancelamento,
+            **opcoes,
+        )
+    except BaseException as error:
+        if tarefa.cancelamento.is_set():
+            tarefa._finalizar("cancelada", "cancelada")
+            raise TarefaCancelada(tarefa.id) from error
+        tarefa._finalizar(
+            "falhou", "falhou", f"{type(error).__name__}: {error}", traceback.format_exc()
+        )
+        raise
+    if tarefa.cancelamento.is_set():
+        tarefa._finalizar("cancelada", "cancelada")
+        raise TarefaCancelada(tarefa.id)
+    tarefa._finalizar("concluida", "concluída")
+    tarefa.progresso = 1.0
+    return result
+
+
+def _descartar_antigas() -> None:
+    limit = time.time() - RETENCAO_SEGUNDOS
+    with _LOCK:
+        for key, task in list(_TAREFAS.items()):
+            if task.finalizada and (task.concluida_em or 0) < limit:
+                del _TAREFAS[key]
+
+
+def submeter_pontuacao(
+    dados: Any,
+    meta: dict,
+    *,
+    segredo: Optional[str] = None,
+    **opcoes: Any,
+) -> TarefaFinScore:
+    """Envia ``run_finscore(dados, meta, **opcoes)`` ao executor compartilhado.
+
+    ``dados`` e ``meta`` são copiados para a tarefa: a sessão pode mudar
+    enquanto ela aguarda ou executa, e uma sessão nova do mesmo navegador
+    (após recarregar a página, com o mesmo ``segredo``) os recupera de
+    ``tarefa.dados`` e ``tarefa.meta``. ``dados`` é liberado quando a tarefa
+    termina.
+    """
+    _descartar_antigas()
+    task = TarefaFinScore(
+        id=uuid.uuid4().hex,
+        empresa=str(meta.get("empresa") or ""),
+        dados=dados.copy() if hasattr(dados, "copy") else dados,
+        meta=copy.deepcopy(meta),
+        segredo=segredo,
+    )
+    with _LOCK:
+        _TAREFAS[task.id] = task
+        task.future = _EXECUTOR.submit(_executar, task, opcoes)
+    return task
+
+
+def executar_no_motor(funcao: Any, *args: Any, **kwargs: Any) -> Any:
+    """Executa ``funcao`` no worker das pontuações e aguarda o resultado.
+
+    Para chamadas ao motor fora de ``submeter_pontuacao`` (aquecimento): elas
+    entram na mesma fila e nunca rodam junto com uma tarefa do usuário.
+    """
+    return _EXECUTOR.submit(funcao, *args, **kwargs).result()
+
+
+def obter_tarefa(tarefa_id: Optional[str]) -> Optional[TarefaFinScore]:
+    """Tarefa registrada com ``tarefa_id`` ou ``None`` (inexistente ou expirada)."""
+    if not tarefa_id:
+        return None
+    with _LOCK:
+        return _TAREFAS.get(str(tarefa_id))
+
+
+def aguardar_tarefa(tarefa: TarefaFinScore, timeout: Optional[float] = None) -> None:
+    """Bloqueia até a tarefa terminar (usado por scripts e testes)."""
+    if tarefa.future is None:
+        return
+    try:
+        tarefa.future.exception(timeout=timeout)
+    except CancelledError:
+        pass
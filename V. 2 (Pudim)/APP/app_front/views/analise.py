@@ -20,7 +20,12 @@ from components.llm_client import call_review_llm
 from components.navigation_flow import NavigationFlow
 from components.schemas import ReviewSchema
 from components import nav
-from services.analysis_export import gerar_planilha_analise, nome_arquivo_analise
+from services.analysis_export import (
+    gerar_pacote_exportacao,
+    nome_arquivo_analise,
+    obter_planilha_analise,
+    preparar_planilha_analise,
+)
 
 try:
     from .analise_contas import render_contas_pudim
@@ -1323,17 +1328,31 @@ def render():
                 "Baixe a planilha com resultados, qualidade, trilha de auditoria, "
                 "PCA, cenários e simulações desta análise."
             )
-            try:
-                export_data = gerar_planilha_analise(ss["out"], ss.get("meta", {}))
+            out, meta = ss["out"], copy.deepcopy(ss.get("meta", {}))
+            # A planilha é gerada uma vez por resultado, fora do rerun; o
+            # clique só aguarda a geração em andamento ou lê os bytes prontos.
+            export_future = preparar_planilha_analise(out, meta)
+            if export_future.done() and export_future.exception() is not None:
+                st.error(f"Não foi possível preparar a planilha: {export_future.exception()}")
+            else:
+                if not export_future.done():
+                    st.caption("Preparando a planilha em segundo plano…")
                 st.download_button(
                     "Baixar planilha completa (.xlsx)",
-                    data=export_data,
-                    file_name=nome_arquivo_analise(ss["out"], ss.get("meta", {})),
+                    data=lambda: obter_planilha_analise(out, meta),
+                    file_name=nome_arquivo_analise(out, meta),
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    on_click="ignore",
                     use_container_width=True,
                 )
-            except Exception as exc:
-                st.error(f"Não foi possível preparar a planilha: {exc}")
+            st.download_button(
+                "Baixar tabelas (.zip com Parquet e manifesto)",
+                data=lambda: gerar_pacote_exportacao(out, meta),
+                file_name=nome_arquivo_analise(out, meta, extensao="zip"),
+                mime="application/zip",
+                on_click="ignore",
+                use_container_width=True,
+            )
 
         st.divider()
         col = st.columns([1, 1, 1])[1]
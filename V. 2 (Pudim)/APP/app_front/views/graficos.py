@@ -1,17 +1,33 @@
 # app_front/views/graficos.py
 
 from __future__ import annotations
+import hashlib
+import threading
+from functools import wraps
+
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
 
+try:
+    from services.memoria import MemoriaLRU
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.services.memoria import MemoriaLRU
+
+# plotly.express (~0,3 s) é importado só nos gráficos que o usam.
+
 TITLE_STYLE = {"font_size": 20, "y": 0.95}
 LEGEND_STYLE = {"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "right", "x": 1.0}
 MILLION = 1_000_000
 
+# Figuras prontas, por gráfico e hash dos dados (a mais antiga sai primeiro).
+FIGURAS_MEMORIZADAS = 64
+
+_FIGURAS = MemoriaLRU(FIGURAS_MEMORIZADAS)
+_CAPTURA = threading.local()
+
 
 def _prepare_base_df() -> pd.DataFrame | None:
     # Escolhe a base mais apropriada para os gráficos e padroniza a coluna 'ano'.
@@ -71,6 +87,65 @@ def _safe_div(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     return numerator.divide(denominator)
 
 
+def _hash_dados(value) -> str:
+    digest = hashlib.sha256()
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(_hash_dados(item).encode("ascii"))
+    elif isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), list(value.dtypes.astype(str)))).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _plotar(fig: go.Figure) -> None:
+    _CAPTURA.figura = fig
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def _figura_memorizada(fonte):
+    """Reexibe a figura do gráfico enquanto os dados de ``fonte(df)`` não mudam.
+
+    Na primeira chamada o gráfico é montado normalmente e a figura passada a
+    ``_plotar`` é guardada; as seguintes só a exibem. Avisos de dados
+    faltantes (retorno False) não são guardados.
+    """
+    def decorator(render):
+        @wraps(render)
+        def wrapper(df=None):
+            try:
+                key = (render.__name__, _hash_dados(fonte(df)))
+            except TypeError:  # Dados sem hash estável: monta a figura a cada chamada.
+                return render(df)
+            fig = _FIGURAS.obter(key)
+            if fig is not None:
+                st.plotly_chart(fig, use_container_width=True)
+                return True
+            _CAPTURA.figura = None
+            shown = render(df)
+            fig, _CAPTURA.figura = _CAPTURA.figura, None
+            if shown and fig is not None:
+                _FIGURAS.guardar(key, fig)
+            return shown
+        return wrapper
+    return decorator
+
+
+def _dados_df(df):
+    return df
+
+
+def _dados_out(*keys):
+    def fonte(_df):
+        out = _get_out_dict() or {}
+        return [out.get(key) for key in keys]
+    return fonte
+
 
 def _apply_year_axis(fig, labels, axis="x"):
     if labels is None:
@@ -98,6 +173,7 @@ def _apply_year_axis(fig, labels, axis="x"):
         )
 
 
+@_figura_memorizada(_dados_df)
 def render_ativos(df: pd.DataFrame) -> bool:
     required = [
         "p_Ativo_Circulante",
@@ -164,10 +240,11 @@ def render_ativos(df: pd.DataFrame) -> bool:
         height=420,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_passivos(df: pd.DataFrame) -> bool:
     required = ["p_Contas_a_Pagar", "p_Passivo_Circulante", "p_Passivo_Total"]
     if not _ensure_columns(df, required, "Evolução dos Passivos"):
@@ -221,10 +298,11 @@ def render_passivos(df: pd.DataFrame) -> bool:
         height=400,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_pl(df: pd.DataFrame) -> bool:
     required = ["p_Patrimonio_Liquido"]
     if not _ensure_columns(df, required, "Evolução do Patrimônio Líquido"):
@@ -255,10 +333,11 @@ def render_pl(df: pd.DataFrame) -> bool:
         height=360,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_ativo_passivo_circulante(df: pd.DataFrame) -> bool:
     required = ["p_Ativo_Circulante", "p_Passivo_Circulante"]
     if not _ensure_columns(df, required, "Capital de Giro e Liquidez"):
@@ -312,7 +391,7 @@ def render_ativo_passivo_circulante(df: pd.DataFrame) -> bool:
         height=420,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 def _compute_ebit_e_ebitda(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
@@ -326,6 +405,7 @@ def _compute_ebit_e_ebitda(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
     return ebit, ebitda
 
 
+@_figura_memorizada(_dados_df)
 def render_receita_total(df: pd.DataFrame) -> bool:
     required = ["r_Receita_Total", "r_Custos", "r_Lucro_Liquido", "r_Despesa_de_Juros", "r_Despesa_de_Impostos"]
     if not _ensure_columns(df, required, "Receita, Custos e EBITDA"):
@@ -381,10 +461,11 @@ def render_receita_total(df: pd.DataFrame) -> bool:
         barmode="relative",
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_juros_lucro_receita(df: pd.DataFrame) -> bool:
     required = ["r_Despesa_de_Juros", "r_Receita_Total", "r_Lucro_Liquido"]
     if not _ensure_columns(df, required, "Custo Financeiro e Resultados"):
@@ -426,7 +507,7 @@ def render_juros_lucro_receita(df: pd.DataFrame) -> bool:
         height=380,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
@@ -434,6 +515,7 @@ def render_despesa_juros(df: pd.DataFrame) -> bool:
     return render_juros_lucro_receita(df)
 
 
+@_figura_memorizada(_dados_df)
 def render_impostos(df: pd.DataFrame) -> bool:
     required = ["r_Despesa_de_Impostos", "r_Receita_Total"]
     if not _ensure_columns(df, required, "Despesa de Impostos"):
@@ -476,10 +558,11 @@ def render_impostos(df: pd.DataFrame) -> bool:
     _apply_year_axis(fig, df["ano_label"])
     fig.update_yaxes(title_text="R$ milhões", secondary_y=False)
     fig.update_yaxes(title_text="% da Receita", secondary_y=True)
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_lucro_liquido(df: pd.DataFrame) -> bool:
     if not _ensure_columns(df, ["r_Lucro_Liquido"], "Lucro Liquido"):
         return False
@@ -507,7 +590,7 @@ def render_lucro_liquido(df: pd.DataFrame) -> bool:
         height=360,
     )
     _apply_year_axis(fig, df["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 def _compute_liquidez_metricas(df: pd.DataFrame) -> pd.DataFrame:
@@ -528,6 +611,7 @@ def _compute_liquidez_metricas(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
+@_figura_memorizada(_dados_df)
 def render_liquidez_indices(df: pd.DataFrame) -> bool:
     required = ["p_Ativo_Circulante", "p_Passivo_Circulante", "p_Estoques", "p_Ativo_Total"]
     if not _ensure_columns(df, required, "Indices de Liquidez"):
@@ -561,7 +645,7 @@ def render_liquidez_indices(df: pd.DataFrame) -> bool:
         height=390,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
@@ -573,6 +657,7 @@ def render_liquidez_corrente(df: pd.DataFrame) -> bool:
     return render_liquidez_indices(df)
 
 
+@_figura_memorizada(_dados_df)
 def render_endividamento_indices(df: pd.DataFrame) -> bool:
     required = ["p_Passivo_Total", "p_Patrimonio_Liquido", "p_Caixa", "p_Ativo_Total"]
     if not _ensure_columns(df, required, "Estrutura de Capital e Alavancagem"):
@@ -619,10 +704,11 @@ def render_endividamento_indices(df: pd.DataFrame) -> bool:
         height=390,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_rentabilidade_indices(df: pd.DataFrame) -> bool:
     required = ["r_Lucro_Liquido", "r_Receita_Total", "p_Patrimonio_Liquido", "p_Ativo_Total"]
     if not _ensure_columns(df, required, "Indicadores de Rentabilidade"):
@@ -670,10 +756,11 @@ def render_rentabilidade_indices(df: pd.DataFrame) -> bool:
         height=410,
     )
     _apply_year_axis(fig, data["ano_label"])
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_df)
 def render_eficiencia_indices(df: pd.DataFrame) -> bool:
     required = [
         "p_Contas_a_Receber",
@@ -716,6 +803,8 @@ def render_eficiencia_indices(df: pd.DataFrame) -> bool:
         st.info("Sem dados suficientes para Eficiência Operacional.")
         return False
 
+    import plotly.express as px
+
     fig = px.bar(
         tidy,
         x="Valor",
@@ -735,7 +824,7 @@ def render_eficiencia_indices(df: pd.DataFrame) -> bool:
         height=420,
     )
     _apply_year_axis(fig, tidy["Ano"], axis="y")
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 def _get_out_dict() -> dict | None:
@@ -743,7 +832,10 @@ def _get_out_dict() -> dict | None:
     return ss.get("out") if ss.get("out") else None
 
 
+@_figura_memorizada(_dados_out("loadings"))
 def render_pca_loadings(df: pd.DataFrame | None = None) -> bool:
+    import plotly.express as px
+
     out = _get_out_dict()
     if not out:
         st.info("Calcule o FinScore em **Novo** para visualizar PCA.")
@@ -765,10 +857,11 @@ def render_pca_loadings(df: pd.DataFrame | None = None) -> bool:
         margin=dict(l=60, r=20, t=60, b=40),
         height=480,
     )
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_out("pca_explained_variance", "pca_explained_variance_cum"))
 def render_pca_variancia(df: pd.DataFrame | None = None) -> bool:
     out = _get_out_dict()
     if not out:
@@ -820,10 +913,11 @@ def render_pca_variancia(df: pd.DataFrame | None = None) -> bool:
         margin=dict(l=10, r=10, t=60, b=10),
         height=380,
     )
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
+@_figura_memorizada(_dados_out("df_pca"))
 def render_pca_scores(df: pd.DataFrame | None = None) -> bool:
     out = _get_out_dict()
     if not out:
@@ -845,6 +939,8 @@ def render_pca_scores(df: pd.DataFrame | None = None) -> bool:
         st.info("PCA possui menos de 2 componentes para graficar.")
         return False
 
+    import plotly.express as px
+
     fig = px.scatter(
         plot_df,
         x=pcs[0],
@@ -861,7 +957,7 @@ def render_pca_scores(df: pd.DataFrame | None = None) -> bool:
         margin=dict(l=10, r=10, t=60, b=10),
         height=420,
     )
-    st.plotly_chart(fig, use_container_width=True)
+    _plotar(fig)
     return True
 
 
@@ -1,21 +1,44 @@
 """Visualizações do contrato FinScore Pudim.
 
 Este módulo não calcula indicadores ou scores. Ele apenas seleciona e apresenta
-valores já produzidos pelo motor.
+valores já produzidos pelo motor; a grade de cenários é pedida sob demanda ao
+serviço do motor e guardada na sessão. As figuras de um resultado são montadas
+uma vez (``obter_figuras_pudim``) e reaproveitadas nos reruns e entre as abas.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any
 
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from .scores import obter_base_what_if
 from .tabelas import INDICATOR_LABELS
 
+try:
+    from services.finscore_service import pivotar_grade, varrer_grade_cenarios
+    from services.memoria import MemoriaLRU
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.services.finscore_service import pivotar_grade, varrer_grade_cenarios
+    from app_front.services.memoria import MemoriaLRU
+
 
 COLORS = ["#0b7285", "#2f9e44", "#f08c00", "#c92a2a", "#7048e8"]
+GRID_AXIS_LABELS = {
+    "receita": "Choque de receita",
+    "margem_ebit": "Choque de margem EBIT",
+    "juros": "Choque de juros",
+    "divida": "Choque de dívida",
+}
+
+# Resultados com figuras prontas em memória (o mais antigo sai primeiro).
+FIGURAS_MEMORIZADAS = 4
+
+_FIGURAS = MemoriaLRU(FIGURAS_MEMORIZADAS)
 
 
 def _frame(output: dict[str, Any], key: str) -> pd.DataFrame:
@@ -264,6 +287,113 @@ def construir_figura_monte_carlo(output: dict[str, Any]) -> go.Figure:
     return fig
 
 
+def construir_figura_grade_cenarios(pivot: pd.DataFrame) -> go.Figure:
+    """Mapa de calor de uma tabela de ``pivotar_grade`` (eixos em choques relativos)."""
+    fig = go.Figure()
+    if pivot.empty:
+        return fig
+    fig.add_trace(go.Heatmap(
+        z=pivot.to_numpy(dtype=float),
+        x=[f"{value:+.0%}" for value in pivot.columns],
+        y=[f"{value:+.0%}" for value in pivot.index],
+        zmin=0,
+        zmax=1000,
+        colorscale="RdYlGn",
+        colorbar={"title": "Pontos"},
+        hovertemplate="linha %{y} · coluna %{x}<br>%{z:.1f} pontos<extra></extra>",
+    ))
+    fig.update_layout(
+        title="Grade de cenários — pior FinScore prudencial entre os demais eixos",
+        xaxis_title=GRID_AXIS_LABELS.get(pivot.columns.name, pivot.columns.name),
+        yaxis_title=GRID_AXIS_LABELS.get(pivot.index.name, pivot.index.name),
+        height=480,
+        margin={"l": 20, "r": 20, "t": 75, "b": 20},
+    )
+    return fig
+
+
+def construir_figuras_pudim(output: dict[str, Any]) -> dict[str, go.Figure]:
+    """Todas as figuras da etapa de análise, na ordem em que são exibidas."""
+    figures = dict(construir_figuras_contabeis(output))
+    figures.update({
+        "notas": construir_figura_notas(output),
+        "temporal": construir_figura_temporal(output),
+        "nucleos": construir_figura_nucleos(output),
+        "pesos_pca": construir_figura_pesos_pca(output),
+        "cenarios": construir_figura_cenarios(output),
+        "monte_carlo": construir_figura_monte_carlo(output),
+    })
+    return figures
+
+
+def chave_figuras(output: dict[str, Any]) -> str:
+    """Identifica os dados das figuras: mesma chave, mesmas figuras."""
+    model = output.get("modelo", {})
+    payload = {
+        "contrato_versao": output.get("contrato_versao"),
+        "versao": model.get("versao"),
+        "hash_codigo": model.get("hash_codigo"),
+        "processado_em": model.get("processado_em"),
+        "semente": model.get("semente"),
+        "numero_simulacoes": model.get("numero_simulacoes"),
+        "hash_dados_reportados": output.get("hash_dados_reportados"),
+        "hash_dados_utilizados": output.get("hash_dados_utilizados"),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def obter_figuras_pudim(output: dict[str, Any]) -> dict[str, go.Figure]:
+    """Figuras de ``construir_figuras_pudim``, montadas uma vez por ``chave_figuras``.
+
+    As figuras guardadas são compartilhadas entre reruns e sessões: quem as
+    exibe não deve alterá-las (``st.plotly_chart`` só as serializa).
+    """
+    key = chave_figuras(output)
+    figures = _FIGURAS.obter(key)
+    if figures is None:
+        figures = _FIGURAS.guardar(key, construir_figuras_pudim(output))
+    return figures
+
+
+def _render_grade_cenarios(output: dict[str, Any]) -> None:
+    with st.expander("Grade de cenários"):
+        st.caption(
+            "Produto cartesiano de receita, margem EBIT, juros e dívida (10 pontos "
+            "cada, de zero ao dobro do cenário SEVERO) com os perfis PCA observados "
+            "fixos. Cada célula mostra o pior score entre os eixos não exibidos."
+        )
+        ss = st.session_state
+        key = output.get("hash_dados_utilizados")
+        cached = ss.get("_grade_cenarios")
+        if cached is None or cached[0] != key:
+            if not st.button("Calcular grade", key="grade_cenarios_calcular"):
+                return
+            base = obter_base_what_if(output)
+            if base is None:
+                st.info("Grade indisponível para este cálculo.")
+                return
+            cached = (key, varrer_grade_cenarios(base))
+            ss["_grade_cenarios"] = cached
+        table = cached[1]
+        axes = list(GRID_AXIS_LABELS)
+        columns = st.columns(2)
+        rows = columns[0].selectbox(
+            "Linhas", axes, index=0, format_func=GRID_AXIS_LABELS.get, key="grade_linhas"
+        )
+        cols = columns[1].selectbox(
+            "Colunas",
+            [axis for axis in axes if axis != rows],
+            format_func=GRID_AXIS_LABELS.get,
+            key="grade_colunas",
+        )
+        _show_figure(
+            construir_figura_grade_cenarios(pivotar_grade(table, rows, cols)),
+            "Sem pontos válidos na grade.",
+        )
+
+
 def _show_figure(fig: go.Figure, empty_message: str) -> None:
     if not fig.data:
         st.info(empty_message)
@@ -286,19 +416,20 @@ def render_graficos_pudim(output: dict[str, Any]) -> None:
     tab_contas, tab_indicadores, tab_modelo, tab_cenarios = st.tabs([
         "Contas", "Indicadores", "Modelo e PCA", "Cenários",
     ])
+    figures = obter_figuras_pudim(output)
     with tab_contas:
-        for figure in construir_figuras_contabeis(output).values():
-            _show_figure(figure, "Sem dados contábeis suficientes para este gráfico.")
+        for name in ("estrutura", "liquidez", "resultado", "divida"):
+            _show_figure(figures[name], "Sem dados contábeis suficientes para este gráfico.")
     with tab_indicadores:
-        _show_figure(construir_figura_notas(output), "Sem notas observadas para exibir.")
-        _show_figure(construir_figura_temporal(output), "Sem composição temporal para exibir.")
+        _show_figure(figures["notas"], "Sem notas observadas para exibir.")
+        _show_figure(figures["temporal"], "Sem composição temporal para exibir.")
     with tab_modelo:
-        _show_figure(construir_figura_nucleos(output), "Sem consolidação do FinScore para exibir.")
-        _show_figure(construir_figura_pesos_pca(output), "Sem pesos PCA para exibir.")
+        _show_figure(figures["nucleos"], "Sem consolidação do FinScore para exibir.")
+        _show_figure(figures["pesos_pca"], "Sem pesos PCA para exibir.")
     with tab_cenarios:
-        _show_figure(construir_figura_cenarios(output), "Sem cenários determinísticos para exibir.")
-        monte_carlo = construir_figura_monte_carlo(output)
+        _show_figure(figures["cenarios"], "Sem cenários determinísticos para exibir.")
+        _render_grade_cenarios(output)
         if int(output.get("modelo", {}).get("numero_simulacoes", 0)) == 0:
             st.info("Monte Carlo não foi executado neste cálculo.")
         else:
-            _show_figure(monte_carlo, "Sem resultados Monte Carlo para exibir.")
+            _show_figure(figures["monte_carlo"], "Sem resultados Monte Carlo para exibir.")
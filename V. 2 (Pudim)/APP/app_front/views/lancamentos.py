@@ -1,7 +1,8 @@
 # app_front/views/lancamentos.py
 from __future__ import annotations
+import copy
 import math
-import traceback
+import secrets
 from datetime import datetime
 
 import pandas as pd
@@ -16,11 +17,22 @@ from services.io_validation import (
     preparar_relatorio_importacao_para_exibicao,
     validar_cliente,
 )
-from services.finscore_service import run_finscore, ajustar_coluna_ano
+from services.finscore_service import ajustar_coluna_ano
+from services.result_store import obter_armazenamento
+from services.tarefas import TarefaCancelada, obter_tarefa, submeter_pontuacao
 
 # Rótulos com ícones (ordem fixa na UI)
 TAB_LABELS = {"Cliente": "🏢 Cliente", "Dados": "📥 Dados"}
 TAB_ORDER = ["Cliente", "Dados"]  # Ordem visual fixa
+# Id da pontuação em andamento, na sessão e na URL (?tarefa=) para sobreviver
+# a uma recarga da página.
+TASK_KEY = "_tarefa_finscore"
+TASK_QUERY_PARAM = "tarefa"
+TASK_POLL_SECONDS = 1.0
+# Segredo do navegador que enviou a pontuação, em cookie e nunca na URL: um
+# link ``?tarefa=`` compartilhado não abre os dados de outra pessoa.
+TASK_COOKIE = "finscore_tarefas"
+TASK_SECRET_KEY = "_segredo_tarefas"
 
 def _js_select_tab(label_with_icon: str):
     """Força a seleção visual de uma aba do st.tabs sem reordenar a lista."""
@@ -332,7 +344,10 @@ def _sec_dados():
     st.markdown("<h3 style='text-align: center;'>📏 Dados Contábeis</h3>", unsafe_allow_html=True)
 
     df, aba, erro = None, None, None
-    up = st.file_uploader("Envie o arquivo (.xlsx)", type=["xlsx"])
+    up = st.file_uploader(
+        "Envie o arquivo (.xlsx, .csv ou .parquet)",
+        type=["xlsx", "csv", "parquet"],
+    )
     if up:
         df, aba, erro = ler_planilha(up)
 
@@ -412,34 +427,142 @@ def _sec_dados():
                 st.error(pend)
             elif ss.df is None:
                 st.error("Envie os dados contábeis acima antes de calcular.")
+            elif (running := obter_tarefa(ss.get(TASK_KEY))) and not running.finalizada:
+                st.info("Já há um cálculo em andamento para esta sessão.")
             else:
-                processing_stage = "preparação do cálculo"
-                try:
-                    with st.spinner("Calculando FinScore…"):
-                        processing_stage = "execução do motor Pudim"
-                        res = run_finscore(ss.df, ss.meta)
-                    # Aceita dict ou tupla/lista
-                    processing_stage = "validação do retorno"
-                    out = res[0] if isinstance(res, (list, tuple)) else res
-                    if not isinstance(out, dict):
-                        raise ValueError("Formato de retorno inesperado do run_finscore.")
-                    processing_stage = "gravação do resultado na sessão"
-                    ss.out = out
-                    ss["analise_tab"] = "Resumo"  # Abre na aba Resumo
-                    ss["liberar_analise"] = True
-                    ss["liberar_parecer"] = False
-                    ss["_flow_started"] = True
-                    for key in ("_lock_parecer", "_force_parecer", "_DIRECT_TO_PARECER"):
-                        ss.pop(key, None)
-                    st.success("Processamento concluido.")
-                    processing_stage = "navegação para Análise"
-                    if not nav.go("analise"):
-                        nav.force("analise")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Erro no processamento ({processing_stage}): {e}")
-                    with st.expander("Detalhes técnicos do erro"):
-                        st.code(traceback.format_exc(), language="text")
+                task = submeter_pontuacao(
+                    ss.df,
+                    ss.meta,
+                    segredo=_segredo_navegador(),
+                    anterior=ss.get("out"),
+                    armazenamento=obter_armazenamento(),
+                )
+                ss[TASK_KEY] = task.id
+                st.query_params[TASK_QUERY_PARAM] = task.id
+
+    _acompanhar_tarefa()
+
+
+def _segredo_navegador() -> str:
+    """Segredo deste navegador para reabrir pontuações após uma recarga."""
+    ss = st.session_state
+    secret = ss.get(TASK_SECRET_KEY) or st.context.cookies.get(TASK_COOKIE)
+    if not secret:
+        secret = secrets.token_urlsafe(32)
+    if ss.get(TASK_SECRET_KEY) != secret:
+        ss[TASK_SECRET_KEY] = secret
+        components.html(
+            f"""
+            <script>
+            window.parent.document.cookie = "{TASK_COOKIE}={secret}; path=/; SameSite=Strict";
+            </script>
+            """,
+            height=0,
+        )
+    return secret
+
+
+def _esquecer_tarefa() -> None:
+    st.session_state.pop(TASK_KEY, None)
+    if TASK_QUERY_PARAM in st.query_params:
+        del st.query_params[TASK_QUERY_PARAM]
+
+
+def _aplicar_resultado(res) -> None:
+    ss = st.session_state
+    # Aceita dict ou tupla/lista
+    out = res[0] if isinstance(res, (list, tuple)) else res
+    if not isinstance(out, dict):
+        raise ValueError("Formato de retorno inesperado do run_finscore.")
+    ss.out = out
+    ss["analise_tab"] = "Resumo"  # Abre na aba Resumo
+    ss["liberar_analise"] = True
+    ss["liberar_parecer"] = False
+    ss["_flow_started"] = True
+    for key in ("_lock_parecer", "_force_parecer", "_DIRECT_TO_PARECER"):
+        ss.pop(key, None)
+
+
+def _concluir_tarefa(task) -> None:
+    _esquecer_tarefa()
+    if task.estado == "cancelada":
+        st.info("Cálculo cancelado.")
+        return
+    try:
+        _aplicar_resultado(task.resultado())
+    except TarefaCancelada:
+        st.info("Cálculo cancelado.")
+        return
+    except Exception as e:
+        st.error(f"Erro no processamento ({task.etapa}): {task.erro or e}")
+        with st.expander("Detalhes técnicos do erro"):
+            st.code(task.rastreamento or str(e), language="text")
+        return
+    st.success("Processamento concluido.")
+    if not nav.go("analise"):
+        nav.force("analise")
+    st.rerun()
+
+
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def _painel_tarefa(task_id: str) -> None:
+    task = obter_tarefa(task_id)
+    if task is None or task.finalizada:
+        st.rerun()  # Rerun completo: aplica o resultado fora do fragmento.
+    if task.estado == "na_fila":
+        ahead = task.posicao_fila
+        text = f"Aguardando na fila ({ahead} cálculo(s) à frente)…" if ahead else "Iniciando…"
+    else:
+        elapsed = datetime.now().timestamp() - (task.iniciada_em or task.criada_em)
+        text = f"Calculando FinScore: {task.etapa} ({task.progresso:.0%}, {elapsed:.0f} s)"
+    st.progress(task.progresso, text=text)
+    if not task.cancelamento.is_set() and st.button("Cancelar cálculo", key=f"cancelar_{task_id}"):
+        task.cancelar()
+    if task.cancelamento.is_set():
+        st.caption("Cancelamento solicitado; o cálculo para na próxima etapa.")
+
+
+def _acompanhar_tarefa() -> None:
+    task_id = st.session_state.get(TASK_KEY)
+    if not task_id:
+        return
+    task = obter_tarefa(task_id)
+    if task is None:
+        _esquecer_tarefa()
+        st.warning("O cálculo anterior expirou ou foi perdido. Clique em Calcular FinScore novamente.")
+    elif task.finalizada:
+        _concluir_tarefa(task)
+    else:
+        _painel_tarefa(task_id)
+
+
+def retomar_tarefa_da_url() -> None:
+    """Reassocia à sessão uma pontuação indicada em ``?tarefa=``.
+
+    Após recarregar a página a sessão é nova; os dados e metadados enviados
+    estão na própria tarefa e o fluxo volta para Lançamentos. Só o navegador
+    que enviou a tarefa (cookie ``TASK_COOKIE``) a recupera; em outro, o
+    parâmetro é descartado.
+    """
+    ss = st.session_state
+    task_id = st.query_params.get(TASK_QUERY_PARAM)
+    if not task_id or ss.get(TASK_KEY) == task_id:
+        return
+    task = obter_tarefa(task_id)
+    secret = ss.get(TASK_SECRET_KEY) or st.context.cookies.get(TASK_COOKIE)
+    if task is None or not task.pertence(secret):
+        del st.query_params[TASK_QUERY_PARAM]
+        return
+    ss[TASK_SECRET_KEY] = secret
+    ss[TASK_KEY] = task.id
+    ss["meta"] = copy.deepcopy(task.meta)
+    # Tarefa já concluída: os dados foram liberados e o resultado basta.
+    if task.dados is not None:
+        ss["df"] = task.dados.copy() if hasattr(task.dados, "copy") else task.dados
+    ss["_flow_started"] = True
+    ss["novo_tab"] = "Dados"
+    nav.force("lanc")
+
 
 def render():
     ss = st.session_state
@@ -859,17 +859,29 @@ def _inject_minichart(parecer: str, analysis_data: Dict[str, Any]) -> str:
         serasa_vals = obter_valores_faixas_serasa(cls_serasa)
         finscore_vals = obter_valores_faixas_finscore(cls_finscore)
         
+        # SVG quando o PDF sai pelo Chromium; o xhtml2pdf só recebe PNG.
+        # O formato fica gravado no texto do parecer: um parecer gerado com
+        # SVG só imprime o minichart com o playwright. Quem guardar o texto
+        # para imprimir com outro engine deve gerá-lo com DEFAULT_ENGINE igual.
+        try:
+            from pdf.export_pdf import DEFAULT_ENGINE
+        except ImportError:
+            DEFAULT_ENGINE = "xhtml2pdf"
+        formato = "svg" if DEFAULT_ENGINE == "playwright" else "png"
+        mime = {"svg": "image/svg+xml", "png": "image/png"}[formato]
+
         # Gerar minichart em base64
         chart_base64 = gerar_minichart_serasa_finscore(
             serasa_score=float(serasa_score),
             finscore_score=float(finscore_score),
             serasa_vals=serasa_vals,
             finscore_vals=finscore_vals,
-            return_base64=True
+            return_base64=True,
+            formato=formato,
         )
         
         # Construir markdown com imagem embutida
-        chart_markdown = f"\n\n![Comparativo Serasa vs FinScore](data:image/png;base64,{chart_base64})\n\n"
+        chart_markdown = f"\n\n![Comparativo Serasa vs FinScore](data:{mime};base64,{chart_base64})\n\n"
         
         # Procurar pela seção 4.4 e injetar o gráfico logo após o título
         # Padrão: ### 4.4 Opinião (Síntese Visual)
@@ -1447,7 +1459,7 @@ def render():
                 if app_front_dir not in sys.path:
                     sys.path.insert(0, app_front_dir)
                 
-                from pdf.export_pdf import gerar_pdf_parecer
+                from pdf.export_pdf import gerar_pdf_parecer, pdf_filename as nome_pdf_parecer
                 pdf_disponivel = True
                 
             except ImportError as e:
@@ -1485,8 +1497,7 @@ def render():
                             )
                             
                             # Nome do arquivo
-                            empresa_safe = meta.get("empresa", "Empresa").replace(" ", "_")
-                            pdf_filename = f"Parecer_{empresa_safe}_{meta.get('cnpj', 'CNPJ').replace('.', '').replace('/', '').replace('-', '')}.pdf"
+                            pdf_filename = nome_pdf_parecer(meta)
                             
                             b64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
                             components.html(
@@ -8,6 +8,21 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+try:
+    from services.finscore_service import preparar_what_if, simular_what_if
+except ModuleNotFoundError:  # Importação pelo pacote ``app_front`` nos testes.
+    from app_front.services.finscore_service import preparar_what_if, simular_what_if
+
+
+WHAT_IF_CHOQUES = (
+    ("receita", "Receita líquida"),
+    ("margem_ebit", "Margem EBIT"),
+    ("juros", "Taxa de juros"),
+    ("divida", "Dívida bruta"),
+    ("pl", "Patrimônio líquido"),
+    ("caixa", "Caixa"),
+)
+
 
 def _number(value: Any) -> float | None:
     try:
@@ -239,6 +254,69 @@ def _render_processamento(summary: dict[str, Any]) -> None:
     )
 
 
+def obter_base_what_if(output: dict[str, Any]):
+    """Reaproveita o estado pré-calculado enquanto a base analítica não muda."""
+    ss = st.session_state
+    key = output.get("hash_dados_utilizados")
+    cached = ss.get("_what_if_base")
+    if cached is None or cached[0] != key:
+        cached = (key, preparar_what_if(output))
+        ss["_what_if_base"] = cached
+    return cached[1]
+
+
+def _render_what_if(output: dict[str, Any], summary: dict[str, Any]) -> None:
+    base = obter_base_what_if(output)
+    if base is None:
+        return
+    with st.expander("Simulador what-if"):
+        st.caption(
+            "Variações relativas aplicadas com intensidade crescente de 50% a 100% "
+            "ao longo dos exercícios, como nos cenários determinísticos. Os perfis "
+            "PCA observados ficam fixos; o resultado não substitui o cálculo oficial."
+        )
+        columns = st.columns(3)
+        shocks = {
+            key: columns[position % 3].slider(
+                label,
+                min_value=-100,
+                max_value=100,
+                value=0,
+                step=5,
+                format="%d%%",
+                key=f"what_if_{key}",
+            )
+            / 100.0
+            for position, (key, label) in enumerate(WHAT_IF_CHOQUES)
+        }
+        result = simular_what_if(base, **shocks)
+
+        columns = st.columns(4)
+        for column, (label, key, observed) in zip(
+            columns,
+            (
+                ("FinScore prudencial", "finscore_prudencial", summary["finscore_prudencial"]),
+                ("Estrutural pós-gargalo", "finscore_estrutural_pos_gargalo", summary["estrutural"]),
+                ("Adaptativo pós-gargalo", "finscore_adaptativo_pos_gargalo", summary["adaptativo"]),
+                ("Cap aplicável", "cap_prudencial_aplicavel", summary["cap_aplicavel"]),
+            ),
+        ):
+            value, reference = _number(result[key]), _number(observed)
+            delta = (
+                f"{value - reference:+.2f}"
+                if value is not None and reference is not None
+                else None
+            )
+            column.metric(label, formatar_pontos(value), delta)
+        if result["caps_acionados"]:
+            st.caption(f"Regras prudenciais no cenário: {result['caps_acionados']}.")
+        if result["status"] != "VALIDO":
+            st.warning(
+                "Cenário contabilmente inconsistente "
+                f"({result['flags']}); use o score apenas como referência."
+            )
+
+
 def render_scores_pudim(output: dict[str, Any], meta: dict[str, Any]) -> None:
     summary = resumir_scores(output)
     _empresa(meta)
@@ -255,6 +333,7 @@ def render_scores_pudim(output: dict[str, Any], meta: dict[str, Any]) -> None:
     _render_score_principal(summary)
     _render_nucleos(summary)
     _render_prudencial(summary)
+    _render_what_if(output, summary)
     _render_indices_complementares(output)
     _render_serasa(summary)
     _render_processamento(summary)
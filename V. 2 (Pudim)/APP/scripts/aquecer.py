@@ -0,0 +1,65 @@
+"""Aquece o processo do FinScore ou verifica a prontidão de outro processo.
+
+Sem argumentos, executa as etapas de ``services.aquecimento`` (pontuação
+sintética, autotestes, tiktoken e Chromium), mostra a duração de cada uma e
+termina com código 0 se o processo ficou pronto. Antes do ``streamlit run``,
+grava os autotestes na pasta de resultados e valida o ambiente.
+
+Com ``--verificar``, apenas lê ``FINSCORE_PRONTO_ARQUIVO`` (gravado pelo app ao
+ficar pronto) e termina com 0 se o arquivo existe: use como sonda de
+prontidão do balanceador.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/aquecer.py [--simulacoes 100] [--etapas motor autotestes]
+    .venv/bin/python scripts/aquecer.py --verificar [--arquivo /tmp/finscore.pronto]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+# ``components`` e ``pdf`` usam importações absolutas, como em ``app.py``.
+for path in (APP_DIR / "app_front", APP_DIR):
+    sys.path.insert(0, str(path))
+
+from app_front.services.aquecimento import ETAPAS, aquecer_aplicacao  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=list(ETAPAS))
+    parser.add_argument("--simulacoes", type=int, default=100, help="0 omite o Monte Carlo")
+    parser.add_argument("--verificar", action="store_true", help="só verifica a prontidão")
+    parser.add_argument(
+        "--arquivo",
+        type=Path,
+        default=os.environ.get("FINSCORE_PRONTO_ARQUIVO") or None,
+        help="arquivo de prontidão (padrão: FINSCORE_PRONTO_ARQUIVO)",
+    )
+    args = parser.parse_args()
+
+    if args.verificar:
+        if args.arquivo is None:
+            parser.error("defina --arquivo ou FINSCORE_PRONTO_ARQUIVO")
+        ready = Path(args.arquivo).is_file()
+        print("pronto" if ready else "aquecendo")
+        return 0 if ready else 1
+
+    if args.arquivo is not None:
+        os.environ["FINSCORE_PRONTO_ARQUIVO"] = str(args.arquivo)
+    state = aquecer_aplicacao(tuple(args.etapas), numero_simulacoes=args.simulacoes)
+    for name, step in state["etapas"].items():
+        print(f"{name:<11} {step['status']:<9} {step['segundos']:6.1f} s  {step['detalhe']}")
+    print(json.dumps({"pronto": state["pronto"]}))
+    return 0 if state["pronto"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
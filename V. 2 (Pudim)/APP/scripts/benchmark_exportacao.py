@@ -0,0 +1,102 @@
+"""Compara tempo e pico de memória da exportação XLSX da análise.
+
+Mede ``gerar_planilha_analise(..., somente_escrita=False)`` (``to_excel`` e
+formatação célula a célula) contra o caminho em fluxo padrão. A saída do motor
+é calculada uma vez e gravada com ``gravar_saida``; cada modo roda em um
+processo novo que a carrega, para que o pico de RSS de um não contamine o
+outro. O acréscimo de RSS é ``ru_maxrss`` após a exportação menos o RSS antes
+dela.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/benchmark_exportacao.py [--simulacoes 1000] [--repeticoes 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.finscore_v2 import carregar_saida, executar_finscore, gravar_saida  # noqa: E402
+from app_front.services.analysis_export import gerar_planilha_analise  # noqa: E402
+
+MODOS = {"anterior": False, "fluxo": True}
+
+
+def _rss_atual_mb() -> float:
+    with open("/proc/self/statm", encoding="ascii") as handle:
+        pages = int(handle.read().split()[1])
+    return pages * resource.getpagesize() / 2**20
+
+
+def _medir(caminho: str, modo: str, repeticoes: int) -> None:
+    """Executado no processo filho: imprime uma linha JSON com as medidas."""
+    output = carregar_saida(caminho)
+    meta = {"empresa": "Benchmark"}
+    baseline = _rss_atual_mb()
+    samples, size = [], 0
+    for _ in range(repeticoes):
+        start = time.perf_counter()
+        size = len(gerar_planilha_analise(output, meta, somente_escrita=MODOS[modo]))
+        samples.append(time.perf_counter() - start)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "modo": modo,
+        "segundos": round(statistics.median(samples), 3),
+        "pico_rss_mb": round(peak - baseline, 1),
+        "kb": round(size / 1024, 1),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulacoes", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--medir", nargs=2, metavar=("SAIDA", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.medir:
+        _medir(args.medir[0], args.medir[1], args.repeticoes)
+        return
+
+    data = pd.read_excel(REFERENCE_XLSX, sheet_name="lancamentos")
+    output = executar_finscore(data, numero_simulacoes=args.simulacoes)
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "saida.fsz"
+        gravar_saida(output, path)
+        for modo in MODOS:
+            completed = subprocess.run(
+                [sys.executable, __file__, "--repeticoes", str(args.repeticoes), "--medir", str(path), modo],
+                cwd=APP_DIR,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            rows.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    table = pd.DataFrame(rows)
+    print(f"Simulações: {args.simulacoes}; repetições: {args.repeticoes}")
+    print(table.to_string(index=False))
+    before, after = table.set_index("modo").loc["anterior"], table.set_index("modo").loc["fluxo"]
+    print(
+        f"\nGanho de tempo {before['segundos'] / after['segundos']:.2f}x; "
+        f"pico de RSS {before['pico_rss_mb']:.0f} MB -> {after['pico_rss_mb']:.0f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
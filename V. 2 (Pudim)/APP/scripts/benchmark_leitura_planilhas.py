@@ -0,0 +1,93 @@
+"""Compara o tempo de leitura da aba ``lancamentos`` nas planilhas de teste.
+
+Mede a leitura anterior (``pd.ExcelFile`` + ``pd.read_excel`` sobre uma cópia
+em memória) contra ``io_validation.ler_aba_lancamentos``, que abre a pasta em
+modo somente leitura e percorre apenas a aba necessária.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/benchmark_leitura_planilhas.py [--repeticoes 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = APP_DIR.parent / "MODELO" / "dados_teste"
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.services.io_validation import (  # noqa: E402
+    SHEET_NAME,
+    _sheet_name_case_insensitive,
+    ler_aba_lancamentos,
+)
+
+
+def _leitura_anterior(content: bytes) -> pd.DataFrame:
+    workbook = pd.ExcelFile(BytesIO(content), engine="openpyxl")
+    sheet = _sheet_name_case_insensitive(workbook.sheet_names, SHEET_NAME)
+    if sheet is None:
+        raise ValueError("aba ausente")
+    return pd.read_excel(workbook, sheet_name=sheet, engine="openpyxl")
+
+
+def _leitura_streaming(content: bytes) -> pd.DataFrame:
+    data, _ = ler_aba_lancamentos(BytesIO(content))
+    return data
+
+
+def _mediana_ms(function, content: bytes, repetitions: int) -> float:
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function(content)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for path in sorted(DATA_DIR.glob("*.xlsx")):
+        content = path.read_bytes()
+        try:
+            _leitura_anterior(content)
+        except ValueError:
+            continue
+        before = _mediana_ms(_leitura_anterior, content, args.repeticoes)
+        after = _mediana_ms(_leitura_streaming, content, args.repeticoes)
+        rows.append(
+            {
+                "arquivo": path.name,
+                "kb": round(len(content) / 1024, 1),
+                "anterior_ms": round(before, 2),
+                "streaming_ms": round(after, 2),
+                "ganho": round(before / after, 2) if after else float("nan"),
+            }
+        )
+
+    table = pd.DataFrame(rows)
+    with pd.option_context("display.width", 120, "display.max_rows", None):
+        print(table.to_string(index=False))
+    if not table.empty:
+        print(
+            f"\nTotal: anterior {table['anterior_ms'].sum():.1f} ms; "
+            f"streaming {table['streaming_ms'].sum():.1f} ms; "
+            f"ganho mediano {table['ganho'].median():.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Mede o tempo de montagem do HTML de um parecer típico (3 a 5 páginas).
+
+Separa a conversão do corpo Markdown da montagem do template. A montagem
+"fria" esvazia antes de cada chamada os caches do template, do CSS, das
+fontes, do logo e do parser Markdown (o custo de antes da pré-compilação); a
+"quente" só preenche os campos do parecer. Não imprime PDF: mede só o HTML.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/benchmark_parecer_html.py [--repeticoes 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.pdf import export_pdf  # noqa: E402
+
+
+META = {
+    "empresa": "Indústria Exemplo Ltda.",
+    "cnpj": "12.345.678/0001-90",
+    "finscore_ajustado": 612.5,
+    "classificacao_finscore": "Aceitável",
+    "serasa_score": 710,
+    "classificacao_serasa": "Baixo Risco",
+    "decisao": "aprovar_com_ressalvas",
+    "ano_inicial": 2022,
+    "ano_final": 2024,
+}
+
+_SECAO = """## {numero}. {titulo}
+
+A análise dos demonstrativos de {ano_inicial} a {ano_final} indica **margem
+EBITDA** estável e endividamento compatível com o porte da empresa. O capital
+de giro cobre o ciclo financeiro, com folga reduzida no último exercício.
+
+| Indicador | {ano_inicial} | {ano_final} | Variação |
+|---|---:|---:|---:|
+| Liquidez corrente | 1,42 | 1,31 | -7,7% |
+| Margem EBITDA | 12,8% | 13,4% | +0,6 p.p. |
+| Dívida líquida / EBITDA | 1,9 | 2,2 | +0,3 |
+| Prazo médio de recebimento | 48 dias | 53 dias | +5 dias |
+
+- Receita cresceu acima da inflação no período.
+- Despesas financeiras subiram com a alta da taxa básica.
+- ~~Sem apontamentos~~ Dois apontamentos de baixo valor na consulta Serasa.
+
+> Recomenda-se acompanhar o prazo de recebimento nos próximos trimestres.
+"""
+
+_TITULOS = [
+    "Resumo executivo",
+    "Rentabilidade",
+    "Liquidez",
+    "Endividamento",
+    "Ciclo financeiro",
+    "Consulta Serasa",
+    "Cenários e sensibilidade",
+    "Conclusão",
+]
+
+
+def parecer_tipico(secoes: int = len(_TITULOS)) -> str:
+    """Corpo Markdown com ``secoes`` seções (8 seções ≈ 4 páginas A4)."""
+    partes = ["# Parecer de Crédito\n"]
+    for numero, titulo in enumerate(_TITULOS[:secoes], start=1):
+        partes.append(_SECAO.format(numero=numero, titulo=titulo, ano_inicial=2022, ano_final=2024))
+    return "\n".join(partes)
+
+
+def _limpar_caches() -> None:
+    for funcao in (
+        export_pdf._compiled_parecer_template,
+        export_pdf._markdown_parser,
+        export_pdf._get_css_for_engine,
+        export_pdf._get_fonts_for_engine,
+        export_pdf._font_families,
+        export_pdf._logo_html,
+    ):
+        funcao.cache_clear()
+
+
+def _medir(funcao, repeticoes: int, antes=None) -> float:
+    amostras = []
+    for _ in range(repeticoes):
+        if antes is not None:
+            antes()
+        inicio = time.perf_counter()
+        funcao()
+        amostras.append(time.perf_counter() - inicio)
+    return statistics.median(amostras) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--secoes", type=int, default=len(_TITULOS))
+    args = parser.parse_args()
+
+    conteudo = parecer_tipico(args.secoes)
+    print(f"Parecer: {len(conteudo)} caracteres, {args.secoes} seções")
+    corpo_html = export_pdf._convert_markdown_to_html(conteudo)
+    markdown = _medir(lambda: export_pdf._convert_markdown_to_html(conteudo), args.repeticoes)
+    print(f"Corpo Markdown -> HTML: {markdown:.2f} ms")
+    for engine in ("xhtml2pdf", "playwright"):
+        def template():
+            export_pdf.render_parecer_html(corpo_html, META, False, engine=engine)
+
+        def completo():
+            export_pdf.render_parecer_html(conteudo, META, True, engine=engine)
+
+        frio = _medir(template, args.repeticoes, antes=_limpar_caches)
+        template()
+        quente = _medir(template, args.repeticoes)
+        total = _medir(completo, args.repeticoes)
+        print(
+            f"{engine:>10}: template frio {frio:5.2f} ms | template quente {quente:5.2f} ms "
+            f"| parecer completo {total:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Mede tamanho e tempo da planilha de análise por perfil de exportação.
+
+Calcula uma saída com ``--simulacoes`` cenários de Monte Carlo (ou reaproveita
+a gravada em ``--saida``, no formato de ``gravar_saida``) e gera a planilha em
+cada perfil de ``PERFIS_EXPORTACAO``, além do perfil ``completo`` com os três
+modos de simulação.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/benchmark_perfis_exportacao.py [--simulacoes 20000] [--saida saida.fsz]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.finscore_v2 import carregar_saida, executar_finscore, gravar_saida  # noqa: E402
+from app_front.services.analysis_export import (  # noqa: E402
+    MODOS_SIMULACAO,
+    PERFIS_EXPORTACAO,
+    gerar_planilha_analise,
+    montar_abas_exportacao,
+)
+
+
+def _saida(simulacoes: int, caminho: Path | None) -> dict:
+    if caminho is not None and caminho.is_file():
+        output = carregar_saida(caminho)
+        if output["modelo"]["numero_simulacoes"] == simulacoes:
+            return output
+    data = pd.read_excel(REFERENCE_XLSX, sheet_name="lancamentos")
+    start = time.perf_counter()
+    output = executar_finscore(data, numero_simulacoes=simulacoes)
+    print(f"Motor: {time.perf_counter() - start:.1f} s para {simulacoes} simulações")
+    if caminho is not None:
+        gravar_saida(output, caminho)
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulacoes", type=int, default=20000)
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--saida", type=Path, default=None)
+    args = parser.parse_args()
+
+    output = _saida(args.simulacoes, args.saida)
+    meta = {"empresa": "Benchmark"}
+    cases = [(perfil, None) for perfil in PERFIS_EXPORTACAO if perfil != "completo"]
+    cases += [("completo", modo) for modo in MODOS_SIMULACAO]
+    rows = []
+    for perfil, modo in cases:
+        samples, size = [], 0
+        for _ in range(args.repeticoes):
+            start = time.perf_counter()
+            size = len(gerar_planilha_analise(output, meta, perfil=perfil, simulacoes=modo))
+            samples.append(time.perf_counter() - start)
+        sheets = montar_abas_exportacao(output, meta, perfil=perfil, simulacoes=modo)
+        rows.append({
+            "perfil": perfil,
+            "simulacoes": modo or PERFIS_EXPORTACAO[perfil][1],
+            "abas": len(sheets),
+            "linhas": sum(len(table) for table in sheets.values()),
+            "mb": round(size / 2**20, 2),
+            "segundos": round(statistics.median(samples), 2),
+        })
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
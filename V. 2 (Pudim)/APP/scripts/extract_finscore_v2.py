@@ -44,6 +44,52 @@ RUNTIME_ASSIGNMENTS = {
     "status_indices_complementares",
 }
 
+# O núcleo não desenha gráficos; o scikit-learn só é necessário ao ajustar o
+# PCA. Importá-los no topo custava mais de 1 s a cada inicialização.
+EXCLUDED_IMPORTS = {"matplotlib.pyplot"}
+LAZY_IMPORTS = {("sklearn.decomposition", "PCA")}
+LAZY_TEMPLATE = '''\
+def {name}(*args, **kwargs):
+    """Importa ``{module}.{name}`` somente no primeiro uso."""
+    from {module} import {name} as _classe
+    return _classe(*args, **kwargs)
+'''
+
+# Único desvio do notebook no corpo das funções: ``run_sensitivity`` avisa um
+# monitor opcional antes de cada tentativa. O motor o usa para relatar
+# progresso e interromper execuções canceladas; com ``None`` nada muda.
+MONITORED_FUNCTIONS = {"run_sensitivity"}
+MONITOR_TEMPLATE = '''\
+if MONITOR_SIMULACAO is not None:
+    MONITOR_SIMULACAO(approach, attempts, len(rows), n)
+'''
+
+
+def _import_nodes(node: ast.Import | ast.ImportFrom) -> list[ast.stmt]:
+    if isinstance(node, ast.Import):
+        names = [alias for alias in node.names if alias.name not in EXCLUDED_IMPORTS]
+        return [ast.Import(names=names)] if names else []
+    lazy = [alias for alias in node.names if (node.module, alias.name) in LAZY_IMPORTS]
+    eager = [alias for alias in node.names if alias not in lazy]
+    selected: list[ast.stmt] = []
+    if eager:
+        selected.append(ast.ImportFrom(module=node.module, names=eager, level=node.level))
+    for alias in lazy:
+        selected.extend(ast.parse(LAZY_TEMPLATE.format(module=node.module, name=alias.name)).body)
+    return selected
+
+
+def _monitorar(node: ast.FunctionDef) -> ast.FunctionDef:
+    """Chama ``MONITOR_SIMULACAO`` a cada tentativa do laço de Monte Carlo."""
+    loop = next(child for child in node.body if isinstance(child, ast.While))
+    counter = next(
+        index
+        for index, child in enumerate(loop.body)
+        if isinstance(child, ast.AugAssign) and getattr(child.target, "id", None) == "attempts"
+    )
+    loop.body[counter + 1:counter + 1] = ast.parse(MONITOR_TEMPLATE).body
+    return node
+
 
 def _assigned_names(node: ast.AST) -> set[str]:
     targets = getattr(node, "targets", None)
@@ -57,9 +103,9 @@ def _nodes_from_cell(index: int, source: str) -> list[ast.stmt]:
     selected: list[ast.stmt] = []
     for node in parsed.body:
         if isinstance(node, (ast.Import, ast.ImportFrom)) and index <= 62:
-            selected.append(node)
+            selected.extend(_import_nodes(node))
         elif isinstance(node, (ast.FunctionDef, ast.ClassDef)) and index in DEFINITION_CELLS:
-            selected.append(node)
+            selected.append(_monitorar(node) if node.name in MONITORED_FUNCTIONS else node)
         elif isinstance(node, (ast.Assign, ast.AnnAssign)):
             names = _assigned_names(node)
             if index == 21 and "VERSAO_MODELO" in names:
@@ -108,6 +154,8 @@ STATUS_HASH_CODIGO = "NAO_VERIFICADO"
 MODELO_APTO = False
 diagnosticos_simulacao = {}
 diagnosticos_simulacao_correlacionada = {}
+# Chamado por ``run_sensitivity`` como (abordagem, tentativa, aceitos, alvo).
+MONITOR_SIMULACAO = None
 '''
     TARGET.write_text(preamble + ast.unparse(extracted) + defaults, encoding="utf-8")
     print(f"Gerado: {TARGET}")
@@ -0,0 +1,65 @@
+"""Gera os PDFs dos pareceres de uma carteira, sem abrir o app.
+
+Lê um arquivo JSON Lines com um parecer por linha (``conteudo``, ``meta`` e,
+opcionalmente, ``is_markdown``), monta o HTML em ``--processos`` processos e
+imprime com o engine escolhido. Cada PDF vai para ``--saida``, junto com
+``relatorio_lote.json``; um parecer com erro não interrompe os demais.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/gerar_pareceres_lote.py pareceres.jsonl --saida pdfs [--engine playwright] [--processos 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.pdf.batch import REPORT_NAME, render_pareceres_batch  # noqa: E402
+
+
+def _itens(caminho: Path) -> list[tuple[str, dict, bool]]:
+    items = []
+    with caminho.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                items.append((record["conteudo"], record.get("meta", {}), record.get("is_markdown", True)))
+    return items
+
+
+def _progresso(concluidos: int, total: int, resultado: dict) -> None:
+    detail = resultado["arquivo"] if resultado["status"] == "OK" else resultado["erro"]
+    print(f"[{concluidos}/{total}] {resultado['status']} {resultado['empresa'] or '-'}: {detail}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entrada", type=Path, help="arquivo .jsonl com conteudo e meta por linha")
+    parser.add_argument("--saida", type=Path, required=True)
+    parser.add_argument("--engine", choices=["playwright", "xhtml2pdf"], default=None)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--sem-cache", action="store_true", help="renderiza mesmo pareceres já em cache")
+    args = parser.parse_args()
+
+    results = render_pareceres_batch(
+        _itens(args.entrada),
+        args.saida,
+        engine=args.engine,
+        processes=args.processos,
+        progress=_progresso,
+        use_cache=not args.sem_cache,
+    )
+    failures = sum(result["status"] == "FALHOU" for result in results)
+    print(f"{len(results) - failures} PDF(s) gerado(s), {failures} falha(s); relatório em {args.saida / REPORT_NAME}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Administra o armazenamento persistente de resultados do FinScore.
+
+Sem argumentos, mostra quantas saídas estão gravadas e o espaço usado. Com
+``--obsoletos`` remove só as saídas de outra versão/hash do modelo; com
+``--tudo`` esvazia o armazenamento.
+
+Execute a partir da pasta APP:
+
+    .venv/bin/python scripts/purgar_resultados.py [--obsoletos | --tudo]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(APP_DIR))
+
+from app_front.services.result_store import obter_armazenamento  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--obsoletos", action="store_true", help="remove saídas de outro modelo")
+    group.add_argument("--tudo", action="store_true", help="remove todas as saídas")
+    args = parser.parse_args()
+
+    store = obter_armazenamento()
+    if store is None:
+        print("Armazenamento desativado (FINSCORE_RESULTADOS=0).")
+        return
+    if args.obsoletos or args.tudo:
+        removed = store.purgar(apenas_obsoletos=args.obsoletos)
+        print(f"{removed} resultado(s) removido(s).")
+    stats = store.estatisticas()
+    print(
+        f"{stats['diretorio']}: {stats['resultados']} resultado(s), "
+        f"{stats['tamanho_bytes'] / 1024**2:.1f} MB de {stats['limite_bytes'] / 1024**2:.0f} MB."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,66 @@
 from __future__ import annotations
 
+import hashlib
 from io import BytesIO
+import json
 import unittest
+import zipfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pandas as pd
+from openpyxl import load_workbook
 
 from app_front.finscore_v2 import executar_finscore
+from app_front.services import analysis_export
 from app_front.services.analysis_export import (
+    ABAS_AUDITORIA,
+    ABAS_RESUMO,
     SHEET_ORDER,
+    chave_exportacao,
+    gerar_pacote_exportacao,
     gerar_planilha_analise,
+    montar_abas_exportacao,
     nome_arquivo_analise,
+    obter_planilha_analise,
+    preparar_planilha_analise,
 )
 
 
 APP_DIR = Path(__file__).resolve().parents[1]
 REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+
+
+def _aparencia(content: bytes) -> dict:
+    """Valores, estilos e dimensões visíveis de cada aba."""
+    sheets = {}
+    for worksheet in load_workbook(BytesIO(content)).worksheets:
+        cells = {
+            cell.coordinate: (
+                None if cell.value == "" else cell.value,
+                cell.number_format,
+                cell.fill.fgColor.rgb if cell.fill.fill_type else None,
+                cell.font.b,
+                cell.alignment.vertical,
+                cell.alignment.wrap_text,
+                cell.border.left.style,
+                cell.comment.text if cell.comment else None,
+            )
+            for row in worksheet.iter_rows()
+            for cell in row
+            if cell.value not in (None, "") or cell.has_style
+        }
+        sheets[worksheet.title] = (
+            cells,
+            {key: dim.width for key, dim in worksheet.column_dimensions.items()},
+            {key: dim.height for key, dim in worksheet.row_dimensions.items() if dim.height},
+            worksheet.freeze_panes,
+            worksheet.auto_filter.ref,
+            worksheet.sheet_view.showGridLines,
+        )
+    return sheets
+
+
 class AnalysisExportV2Test(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -41,6 +86,16 @@ class AnalysisExportV2Test(unittest.TestCase):
         self.assertEqual(workbook.sheet_names, SHEET_ORDER)
         self.assertEqual(len(workbook.sheet_names), 35)
 
+    def test_streaming_writer_matches_cell_by_cell_styling(self) -> None:
+        reference = gerar_planilha_analise(self.simulated_output, self.meta, somente_escrita=False)
+        streamed = gerar_planilha_analise(self.simulated_output, self.meta)
+
+        expected, actual = _aparencia(reference), _aparencia(streamed)
+        self.assertEqual(list(actual), list(expected))
+        for name in expected:
+            with self.subTest(aba=name):
+                self.assertEqual(actual[name], expected[name])
+
     def test_exported_tables_match_engine_contract(self) -> None:
         content = gerar_planilha_analise(self.simulated_output, self.meta)
         workbook = pd.ExcelFile(BytesIO(content), engine="openpyxl")
@@ -86,6 +141,82 @@ class AnalysisExportV2Test(unittest.TestCase):
         self.assertEqual(usage, "BLOQUEADO")
         self.assertEqual(len(pd.ExcelFile(BytesIO(content)).sheet_names), 11)
 
+    def test_workbook_is_built_once_per_result_in_background(self) -> None:
+        meta = dict(self.meta)
+        calls: list[str] = []
+
+        def build(output, meta, **opcoes):
+            calls.append(meta["empresa"])
+            return gerar_planilha_analise(output, meta, **opcoes)
+
+        analysis_export._FUTURES.limpar()
+        self.addCleanup(analysis_export._FUTURES.limpar)
+        with patch.object(analysis_export, "gerar_planilha_analise", side_effect=build):
+            first = preparar_planilha_analise(self.output, meta)
+            content = obter_planilha_analise(self.output, meta, timeout=120)
+            self.assertIs(preparar_planilha_analise(self.output, dict(meta)), first)
+
+            renamed = {**meta, "empresa": "Outra"}
+            self.assertNotEqual(chave_exportacao(self.output, renamed), chave_exportacao(self.output, meta))
+            self.assertNotEqual(
+                chave_exportacao(self.simulated_output, meta), chave_exportacao(self.output, meta)
+            )
+            obter_planilha_analise(self.output, renamed, timeout=120)
+
+        self.assertEqual(calls, ["Callamarys Comércio", "Outra"])
+        self.assertEqual(pd.ExcelFile(BytesIO(content)).sheet_names, SHEET_ORDER)
+
+    def test_profiles_select_sheets_and_simulation_layout(self) -> None:
+        audit = montar_abas_exportacao(self.simulated_output, self.meta, perfil="auditoria")
+        summary = montar_abas_exportacao(self.simulated_output, self.meta, perfil="resumo")
+        deduplicated = montar_abas_exportacao(
+            self.simulated_output, self.meta, simulacoes="sem_duplicatas"
+        )
+
+        self.assertEqual(set(summary), set(ABAS_RESUMO) | {"quantis_simulacoes"})
+        self.assertEqual(set(audit), set(summary) | set(ABAS_AUDITORIA))
+        self.assertEqual(list(deduplicated), [name for name in SHEET_ORDER if name != "simulacoes"])
+        quantiles = audit["quantis_simulacoes"].set_index(["abordagem", "variavel"])
+        independent = self.simulated_output["df_simulacoes_independentes"]
+        self.assertAlmostEqual(
+            quantiles.loc[("independente", "finscore_prudencial"), "p50"],
+            independent["finscore_prudencial"].median(),
+        )
+        self.assertEqual(quantiles.loc[("correlacionado", "finscore_prudencial"), "n"], 100)
+        self.assertNotEqual(
+            chave_exportacao(self.output, self.meta, perfil="resumo"),
+            chave_exportacao(self.output, self.meta),
+        )
+        with self.assertRaisesRegex(ValueError, "Perfil de exportação"):
+            montar_abas_exportacao(self.output, self.meta, perfil="mensal")
+        with self.assertRaisesRegex(ValueError, "Modo de simulações"):
+            montar_abas_exportacao(self.output, self.meta, simulacoes="amostra")
+
+    def test_bundle_writes_one_file_per_sheet_and_manifest(self) -> None:
+        sheets = montar_abas_exportacao(self.simulated_output, self.meta)
+        content = gerar_pacote_exportacao(self.simulated_output, self.meta, threads=3)
+        archive = zipfile.ZipFile(BytesIO(content))
+        manifest = json.loads(archive.read("manifesto.json"))
+
+        self.assertEqual(archive.namelist(), [f"{name}.parquet" for name in sheets] + ["manifesto.json"])
+        self.assertEqual(manifest["hash_regras"], analysis_export._hash_regras())
+        self.assertEqual(manifest["hash_codigo"], self.simulated_output["modelo"]["hash_codigo"])
+        self.assertEqual(manifest["hash_dados_utilizados"], self.simulated_output["hash_dados_utilizados"])
+        self.assertEqual(manifest["resumo"]["Hash das regras"], manifest["hash_regras"])
+        for entry in manifest["arquivos"]:
+            self.assertEqual(hashlib.sha256(archive.read(entry["arquivo"])).hexdigest(), entry["sha256"])
+        simulations = pd.read_parquet(BytesIO(archive.read("simulacoes_independentes.parquet")))
+        pd.testing.assert_frame_equal(simulations, sheets["simulacoes_independentes"], check_dtype=False)
+        self.assertEqual(content, gerar_pacote_exportacao(self.simulated_output, self.meta, threads=1))
+
+        csv = zipfile.ZipFile(BytesIO(
+            gerar_pacote_exportacao(self.output, self.meta, formato="csv", perfil="resumo")
+        ))
+        summary = pd.read_csv(BytesIO(csv.read("resumo_modelo.csv")))
+        self.assertEqual(list(summary["campo"]), list(sheets["resumo_modelo"]["campo"]))
+        with self.assertRaisesRegex(ValueError, "Formato de pacote"):
+            gerar_pacote_exportacao(self.output, self.meta, formato="json")
+
     def test_filename_is_safe_and_identifies_pudim(self) -> None:
         filename = nome_arquivo_analise(self.output, self.meta)
 
@@ -93,6 +224,9 @@ class AnalysisExportV2Test(unittest.TestCase):
             filename,
             r"^resultados_finscore_2\.0\.20_callamarys_comercio_\d{8}_\d{4}\.xlsx$",
         )
+        self.assertTrue(
+            nome_arquivo_analise(self.output, self.meta, "auditoria").endswith("_auditoria.xlsx")
+        )
 
     def test_schema_contains_the_2_0_20_extensions(self) -> None:
         content = gerar_planilha_analise(self.simulated_output, self.meta)
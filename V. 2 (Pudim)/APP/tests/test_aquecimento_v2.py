@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app_front.finscore_v2 import aquecer
+from app_front.services import aquecimento
+
+
+def _ok(numero_simulacoes: int) -> str:
+    return "ok"
+
+
+def _falha(numero_simulacoes: int) -> str:
+    raise RuntimeError("indisponível neste host")
+
+
+class AquecimentoV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.marker = Path(directory.name) / "pronto.json"
+        environment = patch.dict(os.environ, {"FINSCORE_PRONTO_ARQUIVO": str(self.marker)})
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def _aquecer(self, **funcoes) -> dict:
+        steps = {name: _ok for name in aquecimento.ETAPAS}
+        steps.update(funcoes)
+        with patch.dict(aquecimento._FUNCOES, steps), patch.object(
+            aquecimento, "precalcular_autotestes"
+        ):
+            return aquecimento.aquecer_aplicacao()
+
+    def test_engine_warmup_scores_synthetic_data(self) -> None:
+        timings = aquecer(numero_simulacoes=0)
+
+        self.assertEqual(set(timings), {"pca", "pontuacao"})
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+
+    def test_engine_warmup_waits_in_the_scoring_queue(self) -> None:
+        threads = []
+
+        def fake_warmup(numero_simulacoes: int) -> dict:
+            threads.append(threading.current_thread().name)
+            return {"pontuacao": 0.1}
+
+        with patch.object(aquecimento, "aquecer", fake_warmup):
+            detail = aquecimento._aquecer_motor(0)
+
+        self.assertEqual(detail, "pontuacao 0.1 s")
+        self.assertTrue(threads[0].startswith("finscore-tarefas"))
+
+    def test_ready_when_required_steps_pass_even_if_optional_step_fails(self) -> None:
+        state = self._aquecer(playwright=_falha)
+
+        self.assertTrue(state["pronto"])
+        self.assertEqual(state["etapas"]["playwright"]["status"], "FALHOU")
+        self.assertIn("RuntimeError", state["etapas"]["playwright"]["detalhe"])
+        self.assertTrue(self.marker.is_file())
+        self.assertEqual(aquecimento.estado_aquecimento(), state)
+
+    def test_not_ready_and_marker_removed_when_required_step_fails(self) -> None:
+        self.marker.write_text("{}", encoding="utf-8")
+
+        state = self._aquecer(autotestes=_falha)
+
+        self.assertFalse(state["pronto"])
+        self.assertFalse(self.marker.exists())
+        with self.assertRaisesRegex(ValueError, "desconhecidas"):
+            aquecimento.aquecer_aplicacao(("gpu",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from app_front.services import autotestes
+
+
+TESTS = pd.DataFrame(
+    [{"teste": "bateria", "status": "PASSOU", "detalhe": ""}], columns=autotestes.COLUNAS
+)
+
+
+class AutotestesV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        autotestes._FUTURES.clear()
+        self.addCleanup(autotestes._FUTURES.clear)
+
+    def test_battery_runs_once_and_is_served_from_disk_afterwards(self) -> None:
+        with patch.object(autotestes, "_calcular", return_value=TESTS) as calculate:
+            autotestes.precalcular_autotestes(self.directory.name)
+            first = autotestes.obter_autotestes(self.directory.name)
+            autotestes._FUTURES.clear()  # Simula outro processo.
+            second = autotestes.obter_autotestes(self.directory.name)
+
+        calculate.assert_called_once()
+        pd.testing.assert_frame_equal(first, TESTS)
+        pd.testing.assert_frame_equal(second, TESTS)
+        self.assertTrue(autotestes.caminho_autotestes(self.directory.name).exists())
+
+    def test_new_model_hash_recomputes_and_replaces_stale_file(self) -> None:
+        with patch.object(autotestes, "_calcular", return_value=TESTS):
+            autotestes.obter_autotestes(self.directory.name)
+        stale = autotestes.caminho_autotestes(self.directory.name)
+        other_version = stale.with_name(f"autotestes-outra-versao-{'0' * 16}.json")
+        other_version.write_text("{}", encoding="utf-8")
+
+        with patch.object(autotestes.core, "HASH_CODIGO_MODELO", "f" * 64), patch.object(
+            autotestes, "_calcular", return_value=TESTS
+        ) as calculate:
+            autotestes.obter_autotestes(self.directory.name)
+            current = autotestes.caminho_autotestes(self.directory.name)
+
+        calculate.assert_called_once()
+        self.assertNotEqual(current, stale)
+        self.assertTrue(current.exists())
+        self.assertFalse(stale.exists())
+        self.assertTrue(other_version.exists())
+
+    def test_failed_battery_is_retried_on_next_request(self) -> None:
+        with patch.object(
+            autotestes, "_calcular", side_effect=[AssertionError("falhou"), TESTS]
+        ):
+            with self.assertRaises(AssertionError):
+                autotestes.obter_autotestes(self.directory.name)
+            pd.testing.assert_frame_equal(
+                autotestes.obter_autotestes(self.directory.name), TESTS
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
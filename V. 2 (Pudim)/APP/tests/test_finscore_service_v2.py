@@ -136,6 +136,44 @@ class FinScoreServiceV2Test(unittest.TestCase):
         self.assertEqual(len(manual), 1)
         self.assertEqual(manual.iloc[0]["conta"], "r_Receitas_Financeiras")
 
+    def test_previous_result_on_same_data_is_rescored_incrementally(self) -> None:
+        previous = run_finscore(
+            self.reference_data, dict(self.meta), executar_simulacoes=False
+        )
+        meta = dict(self.meta)
+        meta["correcoes_manuais"] = [
+            {
+                "ano": 2025,
+                "conta": "r_Receitas_Financeiras",
+                "valor": 305_878.0,
+                "fonte": "Documento de teste",
+                "justificativa": "Ajuste documentado para teste de integração.",
+                "confirmado": True,
+            }
+        ]
+
+        result = run_finscore(
+            self.reference_data, meta, executar_simulacoes=False, anterior=previous
+        )
+        # Mesma base em outra ordem de linhas; as correções voltam a ser vazias.
+        reordered = run_finscore(
+            self.reference_data.iloc[::-1],
+            dict(self.meta),
+            executar_simulacoes=False,
+            anterior=result,
+        )
+
+        self.assertIn("execucao_incremental", result)
+        self.assertEqual(result["execucao_incremental"]["correcoes_manuais"], 1)
+        self.assertEqual(
+            result["finscore_ajustado"],
+            result["finscore_observado"]["finscore_prudencial"],
+        )
+        self.assertIn("execucao_incremental", reordered)
+        self.assertTrue(
+            reordered["df_correcoes_auditoria"]["etapa"].ne("CORRECAO_MANUAL").all()
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
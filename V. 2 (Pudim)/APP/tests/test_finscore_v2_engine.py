@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import threading
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
 
-from app_front.finscore_v2 import executar_autotestes, executar_finscore
-from app_front.finscore_v2 import core
+from app_front.finscore_v2 import (
+    BLOCO_SIMULACOES,
+    ExecucaoCancelada,
+    avaliar_cenarios,
+    dataframe_sha256,
+    executar_autotestes,
+    executar_finscore,
+    executar_finscore_incremental,
+    executar_finscore_lote,
+    pivotar_grade,
+    preparar_base_cenarios,
+    simular_what_if,
+    varrer_grade_cenarios,
+)
+from app_front.finscore_v2 import core, engine
+from app_front.finscore_v2.cenarios import CHOQUES as CHOQUES_CENARIO
 
 
 APP_DIR = Path(__file__).resolve().parents[1]
@@ -94,6 +110,291 @@ class FinScoreV2EngineTest(unittest.TestCase):
 
         self.assertEqual(len(result["df_rastreabilidade_contas"]), 63)
 
+    def test_batch_scoring_isolates_company_failures(self) -> None:
+        bases = {
+            "ALFA": self.reference_data,
+            "BETA": self.reference_data.iloc[:2],
+        }
+
+        outputs, failures = executar_finscore_lote(
+            bases, processos=2, executar_simulacoes=False
+        )
+
+        self.assertEqual(list(outputs), ["ALFA"])
+        self.assertAlmostEqual(
+            outputs["ALFA"]["finscore_observado"]["finscore_prudencial"],
+            412.2311278076248,
+        )
+        self.assertEqual(failures["empresa"].tolist(), ["BETA"])
+        self.assertIn("3 exercícios", failures.iloc[0]["erro"])
+
+    def test_progress_reports_stages_and_cancellation_stops_monte_carlo(self) -> None:
+        stages: list[tuple[str, float]] = []
+        executar_finscore(
+            self.reference_data,
+            executar_simulacoes=False,
+            progresso=lambda etapa, fracao, contagens: stages.append((etapa, fracao)),
+        )
+        self.assertEqual(stages[0], ("qualidade dos dados", 0.0))
+        self.assertEqual(stages[-1], ("concluído", 1.0))
+        self.assertEqual([f for _, f in stages], sorted(f for _, f in stages))
+
+        cancel = threading.Event()
+        counts: list[dict[str, int]] = []
+
+        def progress(etapa, fracao, contagens):
+            if contagens:
+                counts.append(dict(contagens))
+                cancel.set()
+
+        with self.assertRaisesRegex(ExecucaoCancelada, "simulações independentes"):
+            executar_finscore(
+                self.reference_data,
+                numero_simulacoes=1000,
+                progresso=progress,
+                cancelamento=cancel,
+            )
+        self.assertEqual(counts[0]["tentativas"], BLOCO_SIMULACOES)
+        self.assertEqual(counts[0]["alvo"], 1000)
+        self.assertLessEqual(counts[0]["aceitos"], BLOCO_SIMULACOES)
+        self.assertIsNone(engine._MONITOR.get())
+        with self.assertRaisesRegex(ValueError, "processos=1"):
+            executar_finscore_lote(
+                {"ALFA": self.reference_data, "BETA": self.reference_data},
+                processos=2,
+                cancelamento=cancel,
+            )
+
+    def test_simulation_monitor_is_scoped_to_the_calling_thread(self) -> None:
+        calls: list[tuple] = []
+        token = engine._MONITOR.set(lambda *args: calls.append(args))
+        try:
+            other = threading.Thread(target=core.MONITOR_SIMULACAO, args=("MC", 1, 1, 10))
+            other.start()
+            other.join()
+            core.MONITOR_SIMULACAO("MC", 2, 1, 10)
+        finally:
+            engine._MONITOR.reset(token)
+
+        self.assertEqual(calls, [("MC", 2, 1, 10)])
+
+    def test_incremental_rescoring_matches_full_run(self) -> None:
+        year = int(self.reference_data["ano"].max())
+        correction = {
+            "ano": year,
+            "conta": "p_Estoques",
+            "valor": 1.1 * float(
+                self.reference_data.set_index("ano").at[year, "p_Estoques"]
+            ),
+            "fonte": "Balancete",
+            "justificativa": "Inventário documentado.",
+        }
+        previous = executar_finscore(self.reference_data, executar_simulacoes=False)
+
+        changed = executar_finscore_incremental(previous, [correction])
+        confirmed = executar_finscore_incremental(changed, [dict(correction, confirmado=True)])
+        expected = executar_finscore(
+            self.reference_data,
+            correcoes_manuais=[dict(correction, confirmado=True)],
+            executar_simulacoes=False,
+        )
+
+        self.assertIn("scores", changed["execucao_incremental"]["secoes_recalculadas"])
+        marker = confirmed["execucao_incremental"]
+        self.assertEqual(
+            marker["secoes_reutilizadas"], ["dados_reportados", "scores", "cenarios"]
+        )
+        self.assertIs(confirmed["df_indices_observados"], changed["df_indices_observados"])
+        self.assertEqual(confirmed["finscore_observado"], expected["finscore_observado"])
+        self.assertEqual(confirmed["status_qualidade"], expected["status_qualidade"])
+        pd.testing.assert_frame_equal(
+            confirmed["df_correcoes_auditoria"].drop(columns="data_hora"),
+            expected["df_correcoes_auditoria"].drop(columns="data_hora"),
+        )
+
+    def test_incremental_removal_restores_original_base(self) -> None:
+        previous = executar_finscore(
+            self.reference_data,
+            correcoes_manuais=[
+                {
+                    "ano": int(self.reference_data["ano"].min()),
+                    "conta": "p_Caixa_Equivalentes",
+                    "valor": 1.0,
+                    "fonte": "Extrato",
+                    "justificativa": "Saldo conferido.",
+                }
+            ],
+            executar_simulacoes=False,
+        )
+
+        year = int(self.reference_data["ano"].min())
+
+        result = executar_finscore_incremental(
+            previous,
+            [{"ano": year, "conta": "p_Caixa_Equivalentes", "remover": True}],
+        )
+
+        original = executar_finscore(self.reference_data, executar_simulacoes=False)
+        self.assertEqual(result["hash_dados_utilizados"], original["hash_dados_utilizados"])
+        self.assertEqual(result["execucao_incremental"]["correcoes_manuais"], 0)
+        self.assertAlmostEqual(
+            result["finscore_observado"]["finscore_prudencial"], 412.2311278076248
+        )
+
+    def test_fast_hash_matches_frozen_hash_for_every_output_table(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+
+        for key, value in result.items():
+            if isinstance(value, pd.DataFrame):
+                with self.subTest(tabela=key):
+                    self.assertEqual(
+                        dataframe_sha256(value, usar_cache=False),
+                        core.dataframe_sha256(value),
+                    )
+        self.assertEqual(
+            result["hash_dados_utilizados"],
+            core.dataframe_sha256(result["df_contas_analise"]),
+        )
+
+    def test_fast_hash_is_memoized_until_the_frame_changes(self) -> None:
+        data = self.reference_data.copy()
+        first = dataframe_sha256(data)
+        self.assertEqual(dataframe_sha256(data), first)
+
+        data["p_Ativo_Total"] = data["p_Ativo_Total"] * 2
+
+        self.assertNotEqual(dataframe_sha256(data), first)
+        self.assertEqual(dataframe_sha256(data), core.dataframe_sha256(data))
+
+    def test_vectorized_scenarios_match_pandas_scenario_path(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+        analysis = result["df_contas_analise"]
+        profiles = result["pca_observado"]
+        base = preparar_base_cenarios(analysis, profiles)
+        definitions = [
+            core.SCENARIO_DEFINITIONS["ADVERSO"],
+            core.SCENARIO_DEFINITIONS["SEVERO"],
+            {"receita": 0.15, "juros": 0.8, "divida": -0.4, "pl": -1.5, "caixa": -0.9},
+        ]
+        shocks = pd.DataFrame(definitions).drop(columns="descricao", errors="ignore")
+
+        table = avaliar_cenarios(base, shocks)
+
+        for position, definition in enumerate(definitions):
+            expected, _ = core.score_prepared_base(
+                core.apply_deterministic_scenario(
+                    analysis, {key: 0.0 for key in shocks} | dict(definition)
+                ),
+                profiles,
+            )
+            for key in (
+                "finscore_estrutural",
+                "finscore_adaptativo",
+                "finscore_prudencial_pre_cap",
+                "cap_prudencial_aplicavel",
+                "finscore_prudencial",
+            ):
+                with self.subTest(cenario=position, chave=key):
+                    self.assertAlmostEqual(table.at[position, key], expected[key], places=9)
+
+    def test_other_excess_source_rule_uses_the_core_scenario_path(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+        analysis = result["df_contas_analise"]
+        profiles = result["pca_observado"]
+        # Sobra de fontes: a regra de amortização muda a dívida e o score.
+        definition = {key: 0.0 for key in CHOQUES_CENARIO} | {"pl": 0.8, "pc_total": -0.5}
+        base = preparar_base_cenarios(analysis, profiles)
+        residual = avaliar_cenarios(base, definition)
+
+        with patch.object(core, "EXCESS_SOURCE_RULE", "AMORTIZACAO_DIVIDA"):
+            table = avaliar_cenarios(base, definition)
+            expected, _ = core.score_prepared_base(
+                core.apply_deterministic_scenario(analysis, definition), profiles
+            )
+
+        self.assertNotAlmostEqual(table.at[0, "finscore_estrutural"], residual.at[0, "finscore_estrutural"])
+        for key in ("finscore_estrutural", "finscore_adaptativo", "finscore_prudencial"):
+            with self.subTest(chave=key):
+                self.assertAlmostEqual(table.at[0, key], expected[key], places=9)
+
+    def test_what_if_without_shocks_reproduces_observed_score(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+        base = preparar_base_cenarios(result["df_contas_analise"], result["pca_observado"])
+
+        neutral = simular_what_if(base)
+        stressed = simular_what_if(base, receita=-0.3, pl=-1.5)
+
+        self.assertAlmostEqual(neutral["finscore_prudencial"], 412.2311278076248)
+        self.assertEqual(neutral["status"], "VALIDO")
+        self.assertIn("CAP-PL-NEG", stressed["caps_acionados"])
+        self.assertLess(stressed["finscore_prudencial"], neutral["finscore_prudencial"])
+        with self.assertRaises(ValueError):
+            simular_what_if(base, faturamento=-0.1)
+
+    def test_reverse_stress_finds_minimal_breaking_shock(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+        table = result["df_estresse_reverso"]
+        analysis = result["df_contas_analise"]
+        profiles = result["pca_observado"]
+
+        self.assertEqual(
+            set(table["criterio"]),
+            {"FINSCORE_ABAIXO_250", "FINSCORE_ABAIXO_500", "CAP_PRUDENCIAL"},
+        )
+        # O observado (412,23) já está abaixo de 500.
+        below_500 = table.loc[table["criterio"].eq("FINSCORE_ABAIXO_500")]
+        self.assertTrue(below_500["resultado"].eq("JA_ROMPIDO").all())
+
+        solved = table.loc[
+            table["criterio"].eq("FINSCORE_ABAIXO_250") & table["resultado"].eq("ROMPE")
+        ]
+        self.assertFalse(solved.empty)
+        for row in solved.itertuples(index=False):
+            definition = dict.fromkeys(CHOQUES_CENARIO, 0.0)
+            if row.tipo == "INDIVIDUAL":
+                definition[row.eixo] = row.choque_ruptura
+                before = dict(definition, **{row.eixo: row.choque_ruptura * 0.99})
+            else:
+                scenario = core.SCENARIO_DEFINITIONS[row.eixo]
+                definition = {key: scenario[key] * row.intensidade_ruptura for key in definition}
+                before = {key: value * 0.99 for key, value in definition.items()}
+            with self.subTest(eixo=row.eixo):
+                at_break, _ = core.score_prepared_base(
+                    core.apply_deterministic_scenario(analysis, definition), profiles
+                )
+                short, _ = core.score_prepared_base(
+                    core.apply_deterministic_scenario(analysis, before), profiles
+                )
+                self.assertLess(at_break["finscore_prudencial"], 250.0)
+                self.assertGreaterEqual(short["finscore_prudencial"], 250.0)
+
+    def test_grid_sweep_is_chunk_independent_and_matches_single_scenarios(self) -> None:
+        result = executar_finscore(self.reference_data, executar_simulacoes=False)
+        base = preparar_base_cenarios(result["df_contas_analise"], result["pca_observado"])
+        grid = {
+            "receita": [-0.3, 0.0],
+            "margem_ebit": [-0.5, 0.0],
+            "juros": [0.0, 0.6],
+            "divida": [0.0, 0.3, 0.6],
+        }
+
+        whole = varrer_grade_cenarios(base, grid, tamanho_bloco=1000)
+        chunked = varrer_grade_cenarios(base, grid, tamanho_bloco=5)
+
+        self.assertEqual(len(whole), 24)
+        pd.testing.assert_frame_equal(whole, chunked)
+        point = whole.iloc[17]
+        single = simular_what_if(base, **{key: point[key] for key in grid})
+        self.assertAlmostEqual(point["finscore_prudencial"], single["finscore_prudencial"])
+        pivot = pivotar_grade(whole, "receita", "divida")
+        self.assertEqual(pivot.shape, (2, 3))
+        self.assertAlmostEqual(
+            pivot.loc[-0.3, 0.6],
+            whole.loc[whole["receita"].eq(-0.3) & whole["divida"].eq(0.6), "finscore_prudencial"].min(),
+        )
+        with self.assertRaises(ValueError):
+            varrer_grade_cenarios(base, {"faturamento": [0.0]})
+
     def test_methodological_self_tests_pass(self) -> None:
         tests = executar_autotestes()
         self.assertEqual(len(tests), 39)
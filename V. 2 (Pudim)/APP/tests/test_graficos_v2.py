@@ -2,18 +2,27 @@ from __future__ import annotations
 
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import pandas as pd
 
-from app_front.finscore_v2 import executar_finscore
+from app_front.finscore_v2 import (
+    executar_finscore,
+    pivotar_grade,
+    preparar_base_cenarios,
+    varrer_grade_cenarios,
+)
+from app_front.views import graficos, graficos_pudim
 from app_front.views.graficos_pudim import (
     construir_figura_cenarios,
+    construir_figura_grade_cenarios,
     construir_figura_monte_carlo,
     construir_figura_notas,
     construir_figura_nucleos,
     construir_figura_pesos_pca,
     construir_figura_temporal,
     construir_figuras_contabeis,
+    obter_figuras_pudim,
 )
 
 
@@ -62,6 +71,20 @@ class GraficosV2Test(unittest.TestCase):
         self.assertEqual(list(scenarios.data[0].x), ["BASE", "ADVERSO", "SEVERO"])
         self.assertEqual(len(monte_carlo.data), 0)
 
+    def test_scenario_grid_heatmap_uses_pivot_axes(self) -> None:
+        base = preparar_base_cenarios(
+            self.output["df_contas_analise"], self.output["pca_observado"]
+        )
+        grid = varrer_grade_cenarios(base, {"receita": [-0.2, 0.0], "juros": [0.0, 0.5, 1.0]})
+
+        figure = construir_figura_grade_cenarios(pivotar_grade(grid, "receita", "juros"))
+
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(list(figure.data[0].y), ["-20%", "+0%"])
+        self.assertEqual(list(figure.data[0].x), ["+0%", "+50%", "+100%"])
+        self.assertEqual(figure.layout.xaxis.title.text, "Choque de juros")
+        self.assertEqual(len(construir_figura_grade_cenarios(pd.DataFrame()).data), 0)
+
     def test_monte_carlo_figure_accepts_both_simulation_models(self) -> None:
         synthetic = dict(self.output)
         synthetic["df_simulacoes_independentes"] = pd.DataFrame(
@@ -85,6 +108,64 @@ class GraficosV2Test(unittest.TestCase):
 
         pd.testing.assert_frame_equal(source, original)
 
+    def test_figures_are_built_once_per_result(self) -> None:
+        graficos_pudim._FIGURAS.limpar()
+        self.addCleanup(graficos_pudim._FIGURAS.limpar)
+        reprocessed = {**self.output, "modelo": {**self.output["modelo"], "semente": -1}}
+        latest = {**self.output, "modelo": {**self.output["modelo"], "semente": -2}}
+
+        with patch.object(
+            graficos_pudim, "construir_figuras_pudim", wraps=graficos_pudim.construir_figuras_pudim
+        ) as build:
+            first = obter_figuras_pudim(self.output)
+            again = obter_figuras_pudim(dict(self.output))
+            other = obter_figuras_pudim(reprocessed)
+            with patch.object(graficos_pudim._FIGURAS, "limite", 1):
+                obter_figuras_pudim(latest)
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertEqual(build.call_count, 3)
+        self.assertEqual(graficos_pudim._FIGURAS.chaves(), [graficos_pudim.chave_figuras(latest)])
+        self.assertEqual(
+            list(first),
+            ["estrutura", "liquidez", "resultado", "divida", "notas", "temporal",
+             "nucleos", "pesos_pca", "cenarios", "monte_carlo"],
+        )
+
+
+class GraficosMemorizadosV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        graficos._FIGURAS.limpar()
+        self.addCleanup(graficos._FIGURAS.limpar)
+        self.df = pd.DataFrame({"ano_label": ["2023", "2024"], "p_Patrimonio_Liquido": [1.0e6, 1.5e6]})
+
+    def test_same_data_reuses_the_figure_and_changed_data_rebuilds(self) -> None:
+        with patch.object(graficos.st, "plotly_chart") as chart, patch.object(
+            graficos, "_plotar", wraps=graficos._plotar
+        ) as build:
+            self.assertTrue(graficos.render_pl(self.df))
+            self.assertTrue(graficos.render_pl(self.df.copy()))
+            changed = self.df.assign(p_Patrimonio_Liquido=[1.0e6, 0.5e6])
+            self.assertTrue(graficos.render_pl(changed))
+
+        self.assertEqual(build.call_count, 2)
+        self.assertEqual(chart.call_count, 3)
+        self.assertIs(chart.call_args_list[1].args[0], chart.call_args_list[0].args[0])
+        self.assertEqual(graficos._hash_dados(self.df), graficos._hash_dados(self.df.copy()))
+        self.assertNotEqual(graficos._hash_dados(self.df), graficos._hash_dados(changed))
+        self.assertNotEqual(
+            graficos._hash_dados(self.df), graficos._hash_dados(self.df.astype({"p_Patrimonio_Liquido": "float32"}))
+        )
+
+    def test_missing_columns_warning_is_not_memorized(self) -> None:
+        with patch.object(graficos.st, "warning") as warning, patch.object(graficos.st, "plotly_chart"):
+            self.assertFalse(graficos.render_pl(self.df[["ano_label"]]))
+            self.assertFalse(graficos.render_pl(self.df[["ano_label"]]))
+
+        self.assertEqual(warning.call_count, 2)
+        self.assertEqual(len(graficos._FIGURAS), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+# Antes das importações adiadas o pacote levava ~1,6 s; hoje ~0,45 s, quase
+# tudo numpy e pandas.
+IMPORT_BUDGET_SECONDS = 1.0
+LAZY_MODULES = ("matplotlib", "sklearn", "scipy", "plotly", "streamlit")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Tempo cumulativo (µs) de cada módulo em ``python -X importtime``."""
+    env = {**os.environ, "PYTHONPATH": str(APP_DIR)}
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    # A primeira execução só aquece o cache de arquivos do sistema e grava os
+    # .pyc; medir nela cobraria a leitura do disco, não as importações.
+    subprocess.run(command, cwd=APP_DIR, env=env, check=True, capture_output=True)
+    completed = subprocess.run(
+        command, cwd=APP_DIR, env=env, check=True, capture_output=True, text=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportacaoV2Test(unittest.TestCase):
+    def test_finscore_v2_import_stays_within_budget(self) -> None:
+        times = _import_times("app_front.finscore_v2")
+
+        loaded = sorted({name.split(".")[0] for name in times} & set(LAZY_MODULES))
+        self.assertEqual(loaded, [], "bibliotecas pesadas importadas no topo")
+        self.assertLess(times["app_front.finscore_v2"] / 1e6, IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
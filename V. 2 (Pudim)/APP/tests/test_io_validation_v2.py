@@ -8,11 +8,15 @@ import pandas as pd
 
 from app_front.finscore_v2 import executar_finscore
 from app_front.finscore_v2.core import PRIMARY
+from app_front.finscore_v2.core import QUALITY_COLUMNS
 from app_front.services.io_validation import (
     EXPECTED_COLUMNS,
     IMPORT_REPORT_DISPLAY_COLUMNS,
     gerar_modelo_planilha,
+    ler_aba_lancamentos,
+    ler_csv_lancamentos,
     ler_planilha,
+    ler_planilha_lote,
     obter_colunas_extras,
     obter_relatorio_importacao,
     preparar_relatorio_importacao_para_exibicao,
@@ -99,6 +103,95 @@ class IOValidationV2Test(unittest.TestCase):
         self.assertIsNone(sheet)
         self.assertIn("deve conter a aba 'lancamentos'", error)
 
+    def test_streaming_reader_matches_read_excel(self) -> None:
+        data, sheet = ler_aba_lancamentos(self.reference_path)
+
+        self.assertEqual(sheet, "lancamentos")
+        pd.testing.assert_frame_equal(data, self.reference_data)
+
+    def test_streaming_reader_finds_sheet_case_insensitively_and_limits_rows(self) -> None:
+        source = workbook_bytes(self.reference_data, sheet_name=" Lancamentos ")
+
+        data, sheet = ler_aba_lancamentos(source, max_linhas=2)
+
+        self.assertEqual(sheet, " Lancamentos ")
+        self.assertEqual(len(data), 2)
+        self.assertEqual(list(data.columns), list(self.reference_data.columns))
+
+    def test_batch_reads_long_format_and_reports_per_company(self) -> None:
+        valid = self.reference_data.assign(empresa="ALFA")
+        partial = self.reference_data.iloc[:2].assign(empresa="BETA")
+        other = self.reference_data.assign(empresa="GAMA")
+        long_format = pd.concat([valid, partial, other], ignore_index=True)
+
+        bases, report = ler_planilha_lote(workbook_bytes(long_format, "consolidado"))
+
+        self.assertEqual(list(bases), ["ALFA", "GAMA"])
+        self.assertEqual(list(bases["ALFA"].columns), list(EXPECTED_COLUMNS))
+        self.assertEqual(list(report.columns), ["empresa", *QUALITY_COLUMNS])
+        failure = report[report["tipo"].eq("erro_importacao")]
+        self.assertEqual(failure["empresa"].tolist(), ["BETA"])
+        self.assertIn("3 exercícios", failure.iloc[0]["detalhe"])
+        self.assertTrue((report["empresa"].eq("ALFA") & report["tipo"].eq("ausencia")).any())
+
+    def test_batch_reads_one_sheet_per_company(self) -> None:
+        buffer = BytesIO()
+        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+            self.reference_data.to_excel(writer, sheet_name="ALFA", index=False)
+            self.reference_data.to_excel(writer, sheet_name="BETA", index=False)
+            pd.DataFrame({"instrucoes": ["texto"]}).to_excel(
+                writer, sheet_name="notas", index=False
+            )
+        buffer.seek(0)
+
+        bases, report = ler_planilha_lote(buffer)
+
+        self.assertEqual(list(bases), ["ALFA", "BETA"])
+        ignored = report[report["tipo"].eq("aba_ignorada")]
+        self.assertEqual(ignored["empresa"].tolist(), ["notas"])
+        self.assertFalse(bool(ignored.iloc[0]["bloqueia_calculo"]))
+
+    def test_brazilian_csv_matches_workbook_import(self) -> None:
+        expected, _, _ = ler_planilha(self.reference_path)
+        source = BytesIO(
+            self.reference_data.to_csv(sep=";", decimal=",", index=False).encode("cp1252")
+        )
+        source.name = "lancamentos.csv"
+
+        data, sheet, error = ler_planilha(source)
+
+        self.assertIsNone(error)
+        self.assertEqual(sheet, "lancamentos (csv)")
+        pd.testing.assert_frame_equal(data, expected)
+        pd.testing.assert_frame_equal(
+            obter_relatorio_importacao(data), obter_relatorio_importacao(expected)
+        )
+
+    def test_semicolon_csv_with_dot_decimals_is_not_read_as_thousands(self) -> None:
+        dot = ler_csv_lancamentos(BytesIO(b"ano;p_Caixa;p_Estoques\n2023;1234.56;10.5\n"))
+        brazilian = ler_csv_lancamentos(BytesIO(b"ano;p_Caixa\n2023;1.234,56\n2024;1.234\n"))
+
+        self.assertEqual(dot["p_Caixa"].tolist(), [1234.56])
+        self.assertEqual(dot["p_Estoques"].tolist(), [10.5])
+        self.assertEqual(brazilian["p_Caixa"].tolist(), [1234.56, 1234.0])
+        with self.assertRaisesRegex(ValueError, "mistura vírgula e ponto"):
+            ler_csv_lancamentos(BytesIO(b"ano;p_Caixa\n2023;1234.56\n2024;1.234,56\n"))
+
+    def test_parquet_projects_expected_columns_and_reports_extras(self) -> None:
+        expected, _, _ = ler_planilha(self.reference_path)
+        source = BytesIO()
+        self.reference_data.assign(observacao_livre=["a", "b", "c"]).to_parquet(
+            source, index=False
+        )
+        source.name = "lancamentos.parquet"
+
+        data, sheet, error = ler_planilha(source)
+
+        self.assertIsNone(error)
+        self.assertEqual(sheet, "lancamentos (parquet)")
+        pd.testing.assert_frame_equal(data, expected)
+        self.assertEqual(obter_colunas_extras(data), ["observacao_livre"])
+
     def test_extra_columns_are_ignored_and_reported(self) -> None:
         raw = self.reference_data.copy()
         raw["observacao_livre"] = ["a", "b", "c"]
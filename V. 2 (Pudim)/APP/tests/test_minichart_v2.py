@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import base64
+import io
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from app_front.services import chart_renderer
+
+
+class MinichartV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        chart_renderer._MINICHARTS.limpar()
+        self.addCleanup(chart_renderer._MINICHARTS.limpar)
+
+    def test_same_scores_reuse_the_image_and_background(self) -> None:
+        chart_renderer._fundo_minichart.cache_clear()
+        first = chart_renderer.gerar_minichart_serasa_finscore(700, 612, return_base64=True)
+        higher = chart_renderer.gerar_minichart_serasa_finscore(980, 1200, return_base64=True)
+        with patch.object(chart_renderer._FundoMinichart, "renderizar") as renderizar:
+            again = chart_renderer.gerar_minichart_serasa_finscore(700.0, 612, return_base64=True)
+        chart_renderer._MINICHARTS.limpar()
+        redrawn = chart_renderer.gerar_minichart_serasa_finscore(700, 612, return_base64=True)
+
+        self.assertEqual(first, again)
+        renderizar.assert_not_called()
+        # O fundo foi reaproveitado depois de um score fora das faixas.
+        self.assertEqual(redrawn, first)
+        self.assertNotEqual(higher, first)
+        self.assertEqual(chart_renderer._fundo_minichart.cache_info().currsize, 1)
+        image = Image.open(io.BytesIO(base64.b64decode(first)))
+        self.assertEqual((image.format, image.mode), ("PNG", "RGB"))
+
+    def test_svg_mode_and_bounded_memo(self) -> None:
+        svg = base64.b64decode(
+            chart_renderer.gerar_minichart_serasa_finscore(550, 905, return_base64=True, formato="svg")
+        )
+        self.assertIn(b"<svg", svg)
+        self.assertNotIn(b"<dc:date>", svg)
+
+        with patch.object(chart_renderer._MINICHARTS, "limite", 2):
+            for score in (100, 200, 300):
+                chart_renderer.gerar_minichart_serasa_finscore(score, 500, formato="svg")
+        self.assertEqual(len(chart_renderer._MINICHARTS), 2)
+        self.assertEqual([key[0] for key in chart_renderer._MINICHARTS.chaves()], [200.0, 300.0])
+        with self.assertRaisesRegex(ValueError, "Formato de minichart"):
+            chart_renderer.gerar_minichart_serasa_finscore(550, 905, formato="jpg")
+
+    def test_missing_logo_falls_back_to_text_labels(self) -> None:
+        chart_renderer._fundo_minichart.cache_clear()
+        self.addCleanup(chart_renderer._fundo_minichart.cache_clear)
+        with patch.object(chart_renderer, "LOGO_SERASA", "/nonexistent.png"):
+            image = chart_renderer.gerar_minichart_serasa_finscore(700, 612, return_base64=True)
+            background = chart_renderer._fundo_minichart((300, 500, 700, 1000), (125, 250, 750, 875, 1000))
+
+        self.assertEqual(Image.open(io.BytesIO(base64.b64decode(image))).format, "PNG")
+        self.assertEqual([text.get_text() for text in background.fig.texts], ["Serasa", "FinScore"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app_front.pdf import export_pdf
+from app_front.pdf.parecer_cache import ParecerCache
+
+
+META = {
+    "empresa": "Callamarys Comércio",
+    "cnpj": "00.000.000/0000-00",
+    "finscore_ajustado": "612.40",
+    "decisao": "aprovar",
+    "ano_inicial": 2023,
+    "ano_final": 2025,
+}
+PARECER = "# Parecer\n\nA empresa apresenta **liquidez adequada**.\n"
+
+
+class ParecerCacheV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        cache = patch.object(export_pdf, "_PARECER_CACHE", ParecerCache())
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def test_repeated_download_reuses_rendered_pdf(self) -> None:
+        with patch.object(export_pdf, "html_to_pdf_bytes", return_value=b"%PDF-parecer") as printer:
+            first = export_pdf.gerar_pdf_parecer(PARECER, META, engine="xhtml2pdf")
+            again = export_pdf.gerar_pdf_parecer(PARECER, {**META, "usuario": "analista"}, engine="xhtml2pdf")
+            export_pdf.gerar_pdf_parecer(PARECER, {**META, "decisao": "nao_aprovar"}, engine="xhtml2pdf")
+            export_pdf.gerar_pdf_parecer(PARECER + "Ressalva.\n", META, engine="xhtml2pdf")
+            export_pdf.gerar_pdf_parecer(PARECER, META, engine="xhtml2pdf", use_cache=False)
+
+        self.assertEqual(first, again)
+        self.assertEqual(printer.call_count, 4)
+        self.assertIn("NÃO APROVAR", printer.call_args_list[1].args[0])
+        self.assertNotEqual(
+            export_pdf.parecer_cache_key(PARECER, META, engine="xhtml2pdf"),
+            export_pdf.parecer_cache_key(PARECER, META, engine="playwright"),
+        )
+
+    def test_memory_is_lru_and_disk_survives_a_new_cache(self) -> None:
+        a, b, c = ("a" * 64, "b" * 64, "c" * 64)
+        with tempfile.TemporaryDirectory() as folder:
+            foreign = Path(folder) / "relatorio.pdf"
+            foreign.write_bytes(b"%PDF-relatorio")
+            cache = ParecerCache(memory_entries=2, directory=folder, disk_entries=2)
+            # Pausas acima da resolução da data de modificação do sistema de arquivos.
+            cache.put("pdf", a, b"A")
+            time.sleep(0.02)
+            cache.put("pdf", b, b"B")
+            time.sleep(0.02)
+            cache.get("pdf", a)
+            time.sleep(0.02)
+            cache.put("pdf", c, b"C")
+            cache.put("pdf", "fora-do-padrao", b"D")
+
+            self.assertEqual(cache.stats()["entries"], 2)
+            self.assertEqual(
+                sorted(path.name for path in cache.directory.iterdir()),
+                [f"{a}.pdf", f"{c}.pdf", "relatorio.pdf"],
+            )
+            self.assertEqual(foreign.read_bytes(), b"%PDF-relatorio")
+            reopened = ParecerCache(directory=folder)
+            self.assertEqual(reopened.get("pdf", a), b"A")
+            self.assertIsNone(reopened.get("pdf", b))
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+            with self.assertRaisesRegex(ValueError, "Tipo de entrada"):
+                reopened.get("docx", a)
+
+    def test_precompiled_template_only_fills_parecer_fields(self) -> None:
+        corpo = PARECER + "\nLimite sugerido de R$ 150.000 ($limite).\n"
+        xhtml = export_pdf.render_parecer_html(corpo, META, engine="xhtml2pdf")
+        chromium = export_pdf.render_parecer_html(corpo, META, engine="playwright")
+
+        self.assertIs(
+            export_pdf._compiled_parecer_template("playwright"),
+            export_pdf._compiled_parecer_template("playwright"),
+        )
+        self.assertIn("R$ 150.000 ($limite)", xhtml)
+        self.assertIn("Callamarys Comércio", xhtml)
+        self.assertNotIn("$empresa", xhtml)
+        self.assertNotIn("$page_css", chromium)
+        self.assertNotIn("fonts.googleapis.com", xhtml)
+        self.assertIn("fonts.googleapis.com", chromium)
+        self.assertIn("JetBrains Mono", chromium)
+
+    def test_svg_data_uri_is_only_kept_in_images(self) -> None:
+        uri = "data:image/svg+xml;base64,PHN2Zy8+"
+        html = export_pdf._convert_markdown_to_html(
+            f"![minichart]({uri})\n\n[abrir]({uri}) e <{uri}>\n"
+        )
+
+        self.assertIn(f'<img src="{uri}" alt="minichart"', html)
+        self.assertNotIn("href=", html)
+        self.assertIn("<a>abrir</a>", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
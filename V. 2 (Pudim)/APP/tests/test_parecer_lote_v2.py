@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app_front.pdf import export_pdf
+from app_front.pdf.batch import REPORT_NAME, render_pareceres_batch
+from app_front.pdf.parecer_cache import ParecerCache
+
+
+META = {"empresa": "Callamarys Comércio", "cnpj": "00.000.000/0001-00", "decisao": "aprovar"}
+PARECER = "# Parecer\n\nA empresa apresenta **liquidez adequada**.\n"
+
+
+def _fake_pdf(html: str) -> bytes:
+    return b"%PDF-" + html.encode("utf-8")[-16:]
+
+
+class ParecerLoteV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = Path(folder.name)
+        for patcher in (
+            patch.object(export_pdf, "_PARECER_CACHE", ParecerCache()),
+            patch.object(export_pdf, "get_available_engines", return_value=["xhtml2pdf"]),
+            patch.object(export_pdf, "_html_to_pdf_xhtml2pdf", side_effect=_fake_pdf),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_batch_isolates_failures_reports_progress_and_reuses_cache(self) -> None:
+        items = [
+            (PARECER, META),
+            (None, {"empresa": "Sem texto"}),
+            (PARECER + "Ressalva.\n", META),
+        ]
+        progress = []
+
+        results = render_pareceres_batch(
+            items,
+            self.folder,
+            engine="xhtml2pdf",
+            processes=1,
+            progress=lambda done, total, result: progress.append((done, total, result["status"])),
+        )
+
+        self.assertEqual([result["status"] for result in results], ["OK", "FALHOU", "OK"])
+        self.assertIsNone(results[1]["arquivo"])
+        self.assertIn("NoneType", results[1]["erro"])
+        self.assertEqual(sorted(done for done, _, _ in progress), [1, 2, 3])
+        self.assertEqual(
+            [results[0]["arquivo"], results[2]["arquivo"]],
+            ["Parecer_Callamarys_Comércio_00000000000100.pdf", "Parecer_Callamarys_Comércio_00000000000100_2.pdf"],
+        )
+        self.assertTrue((self.folder / results[2]["arquivo"]).read_bytes().startswith(b"%PDF"))
+        report = json.loads((self.folder / REPORT_NAME).read_text(encoding="utf-8"))
+        self.assertEqual((report["ok"], report["falhas"]), (2, 1))
+
+        again = render_pareceres_batch(items[:1], self.folder / "novo", engine="xhtml2pdf", processes=1)
+        self.assertEqual(again[0]["origem"], "cache")
+        with self.assertRaisesRegex(ValueError, "não disponível"):
+            render_pareceres_batch(items, self.folder, engine="playwright", processes=1)
+
+
+@unittest.skipUnless(export_pdf.XHTML2PDF_AVAILABLE, "xhtml2pdf não instalado")
+class ParecerLoteProcessosV2Test(unittest.TestCase):
+    def test_worker_processes_render_and_print(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            results = render_pareceres_batch(
+                [(PARECER, META), (PARECER, {**META, "empresa": "Outra"})],
+                folder,
+                engine="xhtml2pdf",
+                processes=2,
+                use_cache=False,
+            )
+
+            self.assertEqual([result["status"] for result in results], ["OK", "OK"])
+            self.assertTrue((Path(folder) / results[1]["arquivo"]).read_bytes().startswith(b"%PDF"))
+
+
+if __name__ == "__main__":
+    unittest.main()
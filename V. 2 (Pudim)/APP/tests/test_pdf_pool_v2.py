@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app_front.pdf import export_pdf
+from app_front.pdf.browser_pool import BrowserPool
+
+
+FIXTURE_HTML = (Path(__file__).resolve().parent / "fixtures" / "parecer_simples.html").read_text(encoding="utf-8")
+PDF_OPTIONS = export_pdf._playwright_pdf_options("<div style='font-size:0;'></div>")
+
+
+@unittest.skipUnless(export_pdf.PLAYWRIGHT_AVAILABLE, "playwright não instalado")
+class BrowserPoolV2Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pool = BrowserPool(max_pages=2)
+        self.addCleanup(self.pool.close)
+        try:
+            self.pool.start()
+        except Exception as error:  # Pacote instalado sem o Chromium.
+            self.skipTest(f"Chromium indisponível: {error}")
+
+    def test_concurrent_renders_share_one_browser_with_bounded_pages(self) -> None:
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            documents = list(executor.map(lambda _: self.pool.render(FIXTURE_HTML, PDF_OPTIONS), range(5)))
+
+        self.assertTrue(all(document.startswith(b"%PDF") for document in documents))
+        stats = self.pool.stats()
+        self.assertEqual(stats["launches"], 1)
+        self.assertEqual(stats["renders"], 5)
+        self.assertLessEqual(stats["peak_pages"], 2)
+
+    def test_crashed_browser_is_relaunched(self) -> None:
+        self.pool.render(FIXTURE_HTML, PDF_OPTIONS)
+        self.pool._submit(self.pool._browser.close())  # Simula a queda do Chromium.
+
+        self.assertTrue(self.pool.render(FIXTURE_HTML, PDF_OPTIONS).startswith(b"%PDF"))
+        self.assertEqual(self.pool.stats()["launches"], 2)
+
+    def test_close_stops_thread_and_rejects_new_renders(self) -> None:
+        thread = self.pool._thread
+        self.pool.close()
+
+        self.assertFalse(thread.is_alive())
+        with self.assertRaisesRegex(RuntimeError, "encerrado"):
+            self.pool.render(FIXTURE_HTML, PDF_OPTIONS)
+
+
+class BrowserPoolCancelamentoV2Test(unittest.TestCase):
+    def test_cancelled_render_closes_the_page(self) -> None:
+        class SlowPage:
+            closed = False
+
+            async def set_content(self, html, wait_until):
+                await asyncio.sleep(60)
+
+            async def close(self):
+                self.closed = True
+
+        page = SlowPage()
+        pool = BrowserPool(max_pages=1)
+
+        async def acquire():
+            return page
+
+        async def cancel_render():
+            pool._slots = asyncio.Semaphore(1)
+            pool._acquire_page = acquire
+            task = asyncio.ensure_future(pool._render(FIXTURE_HTML, PDF_OPTIONS))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_render())
+
+        self.assertTrue(page.closed)
+        self.assertEqual(pool._idle, [])
+        self.assertEqual(pool._open_pages, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from app_front.finscore_v2 import CONTRACT_VERSION, executar_finscore
+from app_front.finscore_v2.serializacao import _CABECALHO, FORMATO_VERSAO, MAGIC
+from app_front.services.finscore_service import run_finscore
+from app_front.services.result_store import ResultStore
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+
+
+class ResultStoreV2Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.data = pd.read_excel(REFERENCE_XLSX, sheet_name="lancamentos")
+        cls.output = executar_finscore(cls.data, executar_simulacoes=False)
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.meta = {"empresa": "Callamarys", "ano_inicial": 2023, "ano_final": 2025}
+
+    def test_round_trip_preserves_every_table_and_key_order(self) -> None:
+        store = ResultStore(self.directory.name)
+        store.gravar("chave", self.output)
+
+        loaded = store.obter("chave")
+
+        self.assertEqual(list(loaded), list(self.output))
+        for key, value in self.output.items():
+            if isinstance(value, pd.DataFrame):
+                with self.subTest(tabela=key):
+                    pd.testing.assert_frame_equal(loaded[key], value)
+        self.assertEqual(loaded["finscore_observado"], self.output["finscore_observado"])
+        self.assertIsNone(store.obter("inexistente"))
+
+    def test_unreadable_manifest_is_a_miss_and_drops_the_entry(self) -> None:
+        store = ResultStore(self.directory.name)
+        store.gravar("chave", self.output)
+        (path,) = Path(self.directory.name).glob("*/saida.fsz")
+        # Cabeçalho válido e manifesto do contrato certo, mas sem "valores".
+        manifest = json.dumps({"contrato_versao": CONTRACT_VERSION}).encode("utf-8")
+        path.write_bytes(_CABECALHO.pack(MAGIC, FORMATO_VERSAO, len(manifest)) + manifest)
+
+        self.assertIsNone(store.obter("chave"))
+        self.assertEqual(store.estatisticas()["resultados"], 0)
+        self.assertFalse(path.exists())
+
+    def test_run_finscore_returns_stored_result_without_recalculating(self) -> None:
+        store = ResultStore(self.directory.name)
+        first = run_finscore(
+            self.data, dict(self.meta), executar_simulacoes=False, armazenamento=store
+        )
+
+        with patch(
+            "app_front.services.finscore_service.executar_finscore",
+            side_effect=AssertionError("não deveria recalcular"),
+        ):
+            second = run_finscore(
+                self.data, dict(self.meta), executar_simulacoes=False, armazenamento=store
+            )
+
+        self.assertEqual(second["modelo"]["processado_em"], first["modelo"]["processado_em"])
+        self.assertEqual(second["empresa"], "Callamarys")
+        self.assertEqual(store.estatisticas()["resultados"], 1)
+
+        changed = run_finscore(
+            self.data,
+            {**self.meta, "serasa": 700},
+            executar_simulacoes=False,
+            armazenamento=store,
+        )
+        self.assertNotEqual(
+            changed["modelo"]["processado_em"], first["modelo"]["processado_em"]
+        )
+        self.assertEqual(store.estatisticas()["resultados"], 2)
+
+    def test_size_limit_evicts_least_recently_used_and_purge_clears(self) -> None:
+        probe = ResultStore(Path(self.directory.name) / "medida")
+        probe.gravar("a", self.output)
+        size = probe.estatisticas()["tamanho_bytes"]
+
+        store = ResultStore(self.directory.name, max_bytes=int(size * 2.5))
+        store.gravar("a", self.output)
+        store.gravar("b", self.output)
+        store.obter("a")
+        store.gravar("c", self.output)
+
+        self.assertIsNotNone(store.obter("a"))
+        self.assertIsNone(store.obter("b"))
+        self.assertIsNotNone(store.obter("c"))
+        orphan = Path(self.directory.name) / ".tmp-0123456789abcdef-0badf00d"
+        orphan.mkdir()
+        self.assertEqual(store.purgar(apenas_obsoletos=True), 0)
+        self.assertEqual(store.purgar(), 2)
+        self.assertEqual(store.estatisticas()["resultados"], 0)
+        self.assertFalse(orphan.exists())
+        # A pasta de outro armazenamento no mesmo diretório não é apagada.
+        self.assertIsNotNone(probe.obter("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
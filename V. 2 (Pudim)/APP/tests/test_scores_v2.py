@@ -6,7 +6,11 @@ from pathlib import Path
 import pandas as pd
 
 from app_front.finscore_v2 import executar_finscore
-from app_front.services.finscore_service import run_finscore
+from app_front.services.finscore_service import (
+    preparar_what_if,
+    run_finscore,
+    simular_what_if,
+)
 from app_front.views.scores import (
     formatar_percentual,
     formatar_pontos,
@@ -84,6 +88,20 @@ class ScoresV2Test(unittest.TestCase):
         self.assertIsNone(summary["estrutural"])
         self.assertGreater(summary["ocorrencias_criticas"], 0)
 
+    def test_what_if_state_comes_from_service_output_only_when_calculable(self) -> None:
+        base = preparar_what_if(self.output)
+        neutral = simular_what_if(base)
+
+        self.assertAlmostEqual(
+            neutral["finscore_prudencial"],
+            resumir_scores(self.output)["finscore_prudencial"],
+        )
+
+        invalid = self.data.astype(object)
+        invalid.loc[0, "p_Ativo_Total"] = "valor inválido"
+        blocked = executar_finscore(invalid, executar_simulacoes=False)
+        self.assertIsNone(preparar_what_if(blocked))
+
     def test_formatters_distinguish_missing_zero_and_percentage(self) -> None:
         self.assertEqual(formatar_pontos(None), "—")
         self.assertEqual(formatar_pontos(float("nan")), "—")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from app_front.finscore_v2 import (
+    ContractError,
+    carregar_saida,
+    desserializar_saida,
+    executar_finscore,
+    gravar_saida,
+    serializar_saida,
+)
+from app_front.finscore_v2.serializacao import MAGIC
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+
+
+class SerializacaoV2Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        data = pd.read_excel(REFERENCE_XLSX, sheet_name="lancamentos")
+        cls.output = executar_finscore(data, numero_simulacoes=100)
+
+    def test_file_round_trip_is_lossless_and_validated(self) -> None:
+        for compression in ("zstd", None):
+            with self.subTest(compressao=compression), tempfile.TemporaryDirectory() as folder:
+                path = Path(folder) / "saida.fsz"
+                size = gravar_saida(self.output, path, compressao=compression)
+                self.assertEqual(size, path.stat().st_size)
+
+                loaded = carregar_saida(path)
+
+                self.assertEqual(list(loaded), list(self.output))
+                for key, value in self.output.items():
+                    if isinstance(value, pd.DataFrame):
+                        pd.testing.assert_frame_equal(loaded[key], value)
+                self.assertEqual(loaded["modelo"], self.output["modelo"])
+                self.assertEqual(loaded["finscore_observado"], self.output["finscore_observado"])
+                for name, profile in self.output["pca_observado"].items():
+                    pd.testing.assert_series_equal(
+                        loaded["pca_observado"][name].weights, profile.weights
+                    )
+                self.assertIs(loaded["df_simulacoes"], loaded["df_simulacoes_independentes"])
+
+    def test_rejects_other_contract_and_format_versions(self) -> None:
+        payload = serializar_saida({**self.output, "contrato_versao": "0.9"})
+        with self.assertRaisesRegex(ContractError, "contrato_versao"):
+            desserializar_saida(payload)
+
+        payload = serializar_saida(self.output)
+        header = struct.pack("<8sH", MAGIC, 99)
+        with self.assertRaisesRegex(ContractError, "Versão de formato 99"):
+            desserializar_saida(header + payload[len(header):])
+        with self.assertRaises(ContractError):
+            desserializar_saida(b"PK\x03\x04" + payload[4:])
+
+    def test_load_fails_contract_validation_when_keys_are_missing(self) -> None:
+        partial = {key: value for key, value in self.output.items() if key != "df_indices_observados"}
+        payload = serializar_saida(partial)
+
+        self.assertNotIn("df_indices_observados", desserializar_saida(payload, validar=False))
+        with self.assertRaisesRegex(ContractError, "df_indices_observados"):
+            desserializar_saida(payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from app_front.services import tarefas
+from app_front.services.tarefas import (
+    TarefaCancelada,
+    aguardar_tarefa,
+    obter_tarefa,
+    submeter_pontuacao,
+)
+
+
+APP_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_XLSX = APP_DIR.parent / "MODELO" / "dados_teste" / "1Callamarys.xlsx"
+META = {"empresa": "Callamarys", "ano_inicial": 2023, "ano_final": 2025}
+
+
+class TarefasV2Test(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.data = pd.read_excel(REFERENCE_XLSX, sheet_name="lancamentos")
+
+    def test_background_scoring_reports_stages_and_result(self) -> None:
+        meta = dict(META)
+        stages: list[str] = []
+        original = tarefas.TarefaFinScore._atualizar
+
+        def record(task, stage, fraction):
+            stages.append(stage)
+            original(task, stage, fraction)
+
+        with patch.object(tarefas.TarefaFinScore, "_atualizar", record):
+            task = submeter_pontuacao(self.data, meta, segredo="navegador-a", executar_simulacoes=False)
+            meta["empresa"] = "Outra"  # A sessão muda; a tarefa não.
+            aguardar_tarefa(task, timeout=120)
+
+        self.assertIs(obter_tarefa(task.id), task)
+        self.assertEqual(task.estado, "concluida")
+        self.assertEqual(task.progresso, 1.0)
+        self.assertEqual(task.empresa, "Callamarys")
+        self.assertEqual(task.resultado()["empresa"], "Callamarys")
+        self.assertEqual(stages[0], "executando o motor")
+        self.assertIn("scores observados", stages)
+        self.assertEqual(stages[-1], "concluído")
+        # O id da URL sozinho não reabre a tarefa, e os dados enviados são liberados.
+        self.assertTrue(task.pertence("navegador-a"))
+        self.assertFalse(task.pertence("navegador-b"))
+        self.assertFalse(task.pertence(None))
+        self.assertIsNone(task.dados)
+
+    def test_cancel_queued_and_running_tasks(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_run(dados, meta, progresso, **opcoes):
+            started.set()
+            release.wait(30)
+            return {"empresa": meta["empresa"]}
+
+        with patch.object(tarefas, "run_finscore", side_effect=slow_run):
+            running = submeter_pontuacao(self.data, META)
+            self.assertTrue(started.wait(30))
+            queued = submeter_pontuacao(self.data, META)
+            self.assertEqual(queued.posicao_fila, 1)
+
+            queued.cancelar()
+            running.cancelar()
+            self.assertEqual(queued.estado, "cancelada")
+            self.assertIsNone(queued.dados)
+            self.assertFalse(queued.pertence(None))
+            self.assertEqual(running.estado, "executando")
+            release.set()
+            aguardar_tarefa(running, timeout=30)
+
+        self.assertEqual(running.estado, "cancelada")
+        with self.assertRaises(TarefaCancelada):
+            running.resultado()
+
+    def test_failure_keeps_error_and_traceback(self) -> None:
+        with patch.object(tarefas, "run_finscore", side_effect=ValueError("Serasa inválido")):
+            task = submeter_pontuacao(self.data, META)
+            aguardar_tarefa(task, timeout=30)
+
+        self.assertEqual(task.estado, "falhou")
+        self.assertEqual(task.erro, "ValueError: Serasa inválido")
+        self.assertIn("Traceback", task.rastreamento)
+        with self.assertRaisesRegex(ValueError, "Serasa inválido"):
+            task.resultado()
+
+
+if __name__ == "__main__":
+    unittest.main()